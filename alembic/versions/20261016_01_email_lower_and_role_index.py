@@ -0,0 +1,62 @@
+"""新增 lower(email) 唯一索引与 user_roles.role_id 反向索引。
+
+PostgreSQL 上使用 `CREATE INDEX CONCURRENTLY`（需在事务外执行），建索引期间不阻塞读写；
+若已有仅大小写不同的重复邮箱，唯一索引会失败并留下 INVALID 索引，因此先行检查并中止。
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261016_01"
+down_revision = "20251114_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """创建 uq_users_email_lower 与 ix_user_roles_role_id。"""
+
+    migration_context = op.get_context()
+    if not migration_context.as_sql:  # 离线生成 SQL 时无法查询数据
+        duplicates = (
+            op.get_bind()
+            .execute(sa.text("SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"))
+            .scalars()
+            .all()
+        )
+        if duplicates:
+            raise RuntimeError(f"存在仅大小写不同的重复邮箱，需先人工合并: {', '.join(duplicates)}")
+
+    if migration_context.dialect.name != "postgresql":
+        op.create_index("uq_users_email_lower", "users", [sa.text("lower(email)")], unique=True)
+        op.create_index("ix_user_roles_role_id", "user_roles", ["role_id"])
+        return
+
+    with migration_context.autocommit_block():
+        # 上次 CONCURRENTLY 中断可能残留 INVALID 索引，先清理再重建
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_users_email_lower")
+        op.create_index(
+            "uq_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_roles_role_id")
+        op.create_index("ix_user_roles_role_id", "user_roles", ["role_id"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """删除新增的两个索引。"""
+
+    migration_context = op.get_context()
+    if migration_context.dialect.name != "postgresql":
+        op.drop_index("ix_user_roles_role_id", table_name="user_roles")
+        op.drop_index("uq_users_email_lower", table_name="users")
+        return
+
+    with migration_context.autocommit_block():
+        op.drop_index("ix_user_roles_role_id", table_name="user_roles", postgresql_concurrently=True)
+        op.drop_index("uq_users_email_lower", table_name="users", postgresql_concurrently=True)
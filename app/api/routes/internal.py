@@ -0,0 +1,105 @@
+"""内部运维路由，暴露运行时统计用于容量规划，仅管理员可访问。"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response
+
+from app.apps.auth.cache import get_principal_cache
+from app.apps.auth.revocation import get_revocation_list
+from app.core.cache import cache_stats
+from app.core.dependencies import require_roles
+from app.core.hashing import get_password_executor
+from app.core.logging import logging_queue_stats
+from app.db.pool import pool_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"], dependencies=[Depends(require_roles("admin"))])
+
+
+@router.get("/password-executor", summary="密码哈希执行器统计", response_model=dict)
+def read_password_executor_stats(response: Response) -> dict[str, float | int]:
+    """返回密码哈希执行器的队列深度与等待耗时。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, float | int]: 执行器统计快照。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return get_password_executor().stats()
+
+
+@router.get("/principal-cache", summary="主体缓存统计", response_model=dict)
+def read_principal_cache_stats(response: Response) -> dict[str, float | int]:
+    """返回主体缓存（`principal` 命名空间）的命中、未命中与加载次数。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, float | int]: 缓存统计快照。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return get_principal_cache().stats()
+
+
+@router.get("/token-revocation", summary="Token 吊销过滤器统计", response_model=dict)
+def read_token_revocation_stats(response: Response) -> dict[str, int]:
+    """返回吊销检查中本地过滤器直接放行、查询存储与误报的次数。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, int]: 过滤器统计快照。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return get_revocation_list().stats()
+
+
+@router.get("/cache", summary="通用缓存统计", response_model=dict)
+def read_cache_stats(response: Response) -> dict[str, dict[str, float | int]]:
+    """返回各缓存命名空间的命中、未命中与加载次数。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, dict[str, float | int]]: 按命名空间组织的统计。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return cache_stats()
+
+
+@router.get("/logging", summary="日志队列统计", response_model=dict)
+def read_logging_stats(response: Response) -> dict[str, int]:
+    """返回队列模式日志的积压与丢弃计数。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, int]: 日志队列统计。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return logging_queue_stats()
+
+
+@router.get("/db-pool", summary="数据库连接池统计", response_model=dict)
+def read_db_pool_stats(response: Response) -> dict[str, dict[str, float | int | str | None]]:
+    """返回当前 worker 内各 Engine 的连接池占用、溢出与 checkout 等待耗时。
+
+    Args:
+        response (Response): FastAPI 响应对象，用于设置缓存头。
+
+    Returns:
+        dict[str, dict[str, float | int | str | None]]: 按 Engine 名称组织的连接池统计。
+    """
+
+    response.headers["Cache-Control"] = "no-store"
+    return pool_stats()
@@ -0,0 +1,30 @@
+"""Prometheus 指标导出路由。"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import CONTENT_TYPE, render_latest
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", summary="Prometheus 指标", include_in_schema=False)
+def read_metrics(settings: Settings = Depends(get_settings)) -> Response:
+    """以 Prometheus 文本格式返回请求、连接池与密码哈希执行器指标。
+
+    配置 `metrics_multiproc_dir` 时合并全部 worker 的快照。
+
+    Args:
+        settings (Settings): 配置实例，提供多进程快照目录。
+
+    Returns:
+        Response: 指标文本响应。
+    """
+
+    return Response(
+        content=render_latest(directory=settings.metrics_multiproc_dir),
+        media_type=CONTENT_TYPE,
+        headers={"Cache-Control": "no-store"},
+    )
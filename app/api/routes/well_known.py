@@ -0,0 +1,31 @@
+"""`/.well-known` 下的公开元数据路由。"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.core.config import Settings, get_settings
+from app.core.keyring import get_keyring
+from app.core.responses import FastJSONResponse
+
+router = APIRouter(prefix="/.well-known", tags=["well-known"])
+
+
+@router.get("/jwks.json", summary="JWT 验签公钥集合")
+def read_jwks(settings: Settings = Depends(get_settings)) -> FastJSONResponse:
+    """返回当前签名公钥与轮换期内仍接受的旧公钥，供下游服务本地验签。
+
+    响应可被缓存 `jwks_max_age_seconds` 秒；轮换时新密钥应先加入验证集合，
+    待超过该时长后再切换为签名密钥，避免下游持有的缓存不含新 `kid`。
+
+    Args:
+        settings (Settings): 应用配置，提供密钥与缓存时长。
+
+    Returns:
+        FastJSONResponse: JWKS 文档，HS256 模式下 `keys` 为空。
+    """
+
+    return FastJSONResponse(
+        get_keyring(settings).jwks(),
+        headers={"Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}"},
+    )
@@ -0,0 +1,66 @@
+"""用户管理相关的后台 API 路由。"""
+
+from __future__ import annotations
+
+import csv
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.apps.auth.bulk_import import BulkUserImporter, ImportFormat, detect_format, get_import_hasher, iter_rows
+from app.core.config import Settings, get_settings
+from app.core.dependencies import require_roles
+from app.db.session import get_db
+
+router = APIRouter(prefix="/admin/users", tags=["admin"], dependencies=[Depends(require_roles("admin"))])
+
+
+@router.post("/import", summary="批量导入用户", response_model=dict)
+def import_users_from_file(
+    file: UploadFile = File(...),
+    fmt: ImportFormat | None = Query(default=None, alias="format"),
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+) -> dict[str, object]:
+    """从上传的 CSV/NDJSON 文件批量创建用户并分配角色。
+
+    已存在的邮箱会被跳过。上传文件在写库前整体读入并校验编码与行数，超过
+    `bulk_import_max_bytes` / `bulk_import_max_rows` 时返回 413，大文件请使用 `scripts/import_users.py`。
+
+    Args:
+        file (UploadFile): 上传的 CSV 或 NDJSON 文件。
+        fmt (ImportFormat | None): 输入格式，缺省时按文件扩展名推断。
+        db (Session): 数据库会话。
+        settings (Settings): 应用配置，提供批大小与上传上限。
+
+    Returns:
+        dict[str, object]: 导入报告，包含新建、跳过、无效行数与吞吐。
+
+    Raises:
+        HTTPException: 格式无法识别或文件不是有效的 UTF-8 文本时返回 400，超过上限时返回 413。
+    """
+
+    try:
+        resolved_format = fmt or detect_format(file.filename or "")
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    data = file.file.read(settings.bulk_import_max_bytes + 1)
+    if len(data) > settings.bulk_import_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"文件超过 {settings.bulk_import_max_bytes} 字节上限，请使用 scripts/import_users.py 导入",
+        )
+    try:
+        rows = list(iter_rows(io.StringIO(data.decode("utf-8-sig"), newline=""), resolved_format))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"无法解析上传文件: {exc}") from exc
+    if len(rows) > settings.bulk_import_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"文件超过 {settings.bulk_import_max_rows} 行上限，请使用 scripts/import_users.py 导入",
+        )
+
+    importer = BulkUserImporter(db, hasher=get_import_hasher(), batch_size=settings.bulk_import_batch_size)
+    return importer.run(rows).as_dict()
@@ -0,0 +1,331 @@
+"""批量导入用户。
+
+流式读取 CSV / NDJSON，按批次处理：
+1. 逐行校验（`UserImportRow`），无效行记入报告而不中断导入；
+2. 一条 SELECT 过滤已存在的邮箱，避免为其计算 bcrypt；
+3. 密码哈希分发到进程池并行计算；
+4. `bulk_insert` 批量写入用户与角色关联（PostgreSQL 走 COPY），冲突行跳过；
+5. 每批提交一次事务。
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.apps.auth.models import Role, User, UserRole
+from app.apps.auth.schemas import UserImportRow
+from app.core.config import get_settings
+from app.core.security import get_password_hash
+from app.db.bulk import bulk_insert
+from app.db.routing import pin_primary
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# 报告中最多保留的错误明细条数
+MAX_REPORTED_ERRORS = 100
+
+_FORMAT_BY_SUFFIX: dict[str, ImportFormat] = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """导入结果统计。"""
+
+    total: int = 0
+    created: int = 0
+    existing: int = 0
+    invalid: int = 0
+    role_assignments: int = 0
+    unknown_roles: set[str] = field(default_factory=set)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        """按新建用户数计算的吞吐。"""
+
+        return self.created / self.seconds if self.seconds else 0.0
+
+    def add_error(self, line: int, message: str) -> None:
+        """记录一条无效行，超过上限后只计数。
+
+        Args:
+            line (int): 输入中的行号。
+            message (str): 错误说明。
+        """
+
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "message": message})
+
+    def as_dict(self) -> dict[str, Any]:
+        """转换为可 JSON 序列化的字典。
+
+        Returns:
+            dict[str, Any]: 报告内容。
+        """
+
+        return {
+            "total": self.total,
+            "created": self.created,
+            "existing": self.existing,
+            "invalid": self.invalid,
+            "role_assignments": self.role_assignments,
+            "unknown_roles": sorted(self.unknown_roles),
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "users_per_second": round(self.users_per_second, 1),
+        }
+
+
+class ProcessPoolHasher:
+    """在进程池中并行计算 bcrypt 哈希，可作为上下文管理器使用。
+
+    使用 spawn 启动子进程，避免在多线程的 Web 进程中 fork。
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        """创建进程池。
+
+        Args:
+            workers (int | None): 进程数，默认等于 CPU 核数。
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def __call__(self, passwords: Sequence[str]) -> list[str]:
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._executor.map(get_password_hash, passwords, chunksize=chunksize))
+
+    def close(self) -> None:
+        """关闭进程池。"""
+
+        self._executor.shutdown()
+
+    def __enter__(self) -> ProcessPoolHasher:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=1)
+def get_import_hasher() -> ProcessPoolHasher:
+    """返回进程级共享的哈希进程池，供管理接口复用，进程数取自 Settings。
+
+    Returns:
+        ProcessPoolHasher: 缓存的进程池，子进程在首次使用时启动。
+    """
+
+    return ProcessPoolHasher(get_settings().bulk_import_workers)
+
+
+def reset_import_hasher() -> None:
+    """关闭共享进程池并丢弃实例。供关闭事件与测试调用。"""
+
+    if get_import_hasher.cache_info().currsize:
+        get_import_hasher().close()
+    get_import_hasher.cache_clear()
+
+
+def detect_format(filename: str) -> ImportFormat:
+    """根据文件扩展名推断导入格式。
+
+    Args:
+        filename (str): 文件名或路径。
+
+    Returns:
+        ImportFormat: csv 或 ndjson。
+    """
+
+    suffix = Path(filename).suffix.lower()
+    if suffix not in _FORMAT_BY_SUFFIX:
+        raise ValueError(f"无法识别的导入格式: {filename}，请使用 .csv、.ndjson 或 .jsonl")
+    return _FORMAT_BY_SUFFIX[suffix]
+
+
+def iter_rows(lines: Iterable[str], fmt: ImportFormat) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """流式解析输入，逐行产出原始字段。
+
+    Args:
+        lines (Iterable[str]): 文本行，如打开的文件对象。
+        fmt (ImportFormat): 输入格式。
+
+    Returns:
+        Iterator[tuple[int, dict[str, Any] | None]]: (行号, 字段)；无法解析的行字段为 None。
+    """
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {key: value for key, value in record.items() if key and value not in ("", None)}
+        return
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_no, None
+            continue
+        yield line_no, record if isinstance(record, dict) else None
+
+
+class BulkUserImporter:
+    """按批次导入用户并分配角色。"""
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        hasher: Callable[[Sequence[str]], list[str]],
+        batch_size: int = 1000,
+    ) -> None:
+        """初始化导入器。
+
+        Args:
+            db (Session): 数据库会话，导入期间固定走主库。
+            hasher (Callable[[Sequence[str]], list[str]]): 批量计算密码哈希的函数，如 `ProcessPoolHasher`。
+            batch_size (int): 每批处理并提交的行数。
+        """
+
+        self.db = db
+        self.hasher = hasher
+        self.batch_size = batch_size
+
+    def run(self, rows: Iterable[tuple[int, dict[str, Any] | None]]) -> ImportReport:
+        """执行导入。
+
+        Args:
+            rows (Iterable[tuple[int, dict[str, Any] | None]]): `iter_rows` 的输出。
+
+        Returns:
+            ImportReport: 导入统计。
+        """
+
+        started = time.perf_counter()
+        report = ImportReport()
+        pin_primary(self.db)
+        role_ids = dict(self.db.execute(select(Role.name, Role.id)).tuples().all())
+
+        batch: list[tuple[int, dict[str, Any] | None]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch, role_ids, report)
+                batch = []
+        if batch:
+            self._import_batch(batch, role_ids, report)
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _import_batch(
+        self,
+        batch: list[tuple[int, dict[str, Any] | None]],
+        role_ids: dict[str, int],
+        report: ImportReport,
+    ) -> None:
+        report.total += len(batch)
+        valid: dict[str, UserImportRow] = {}
+        for line_no, record in batch:
+            if record is None:
+                report.add_error(line_no, "无法解析的行")
+                continue
+            try:
+                parsed = UserImportRow.model_validate(record)
+            except ValidationError as exc:
+                report.add_error(line_no, "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+                continue
+            key = parsed.email.lower()
+            if key in valid:
+                report.existing += 1  # 同一批次内重复（忽略大小写）的邮箱只导入第一条
+                continue
+            valid[key] = parsed
+
+        # 由数据库对两侧执行 lower()，与 lower(email) 唯一索引的判定规则一致
+        candidates = [func.lower(literal(row.email, String)) for row in valid.values()]
+        matched = self.db.execute(select(User.email).where(func.lower(User.email).in_(candidates))).scalars()
+        existing = {email.lower() for email in matched}
+        pending = [row for key, row in valid.items() if key not in existing]
+        report.existing += len(valid) - len(pending)
+        if not pending:
+            return
+
+        hashes = self.hasher([row.password for row in pending])
+        conn = self.db.connection()
+        inserted = bulk_insert(
+            conn,
+            User.__table__,
+            [
+                {
+                    "email": row.email,
+                    "password_hash": password_hash,
+                    "full_name": row.full_name,
+                    "is_active": row.is_active,
+                }
+                for row, password_hash in zip(pending, hashes)
+            ],
+            returning=(User.__table__.c.id, User.__table__.c.email),
+        )
+        report.created += len(inserted)
+        report.existing += len(pending) - len(inserted)  # 与并发写入竞争时由冲突处理兜底
+
+        user_ids = {row.email: row.id for row in inserted}
+        assignments = []
+        for row in pending:
+            if row.email not in user_ids:
+                continue
+            for name in dict.fromkeys(row.roles):
+                if name in role_ids:
+                    assignments.append({"user_id": user_ids[row.email], "role_id": role_ids[name]})
+                else:
+                    report.unknown_roles.add(name)
+        assigned = bulk_insert(conn, UserRole.__table__, assignments, returning=(UserRole.__table__.c.user_id,))
+        report.role_assignments += len(assigned)
+        self.db.commit()
+
+
+def import_users(
+    db: Session,
+    lines: Iterable[str],
+    fmt: ImportFormat,
+    *,
+    batch_size: int = 1000,
+    workers: int | None = None,
+) -> ImportReport:
+    """使用进程池哈希导入用户，CLI 与管理接口共用的入口。
+
+    Args:
+        db (Session): 数据库会话。
+        lines (Iterable[str]): 输入文本行。
+        fmt (ImportFormat): 输入格式。
+        batch_size (int): 每批行数。
+        workers (int | None): 哈希进程数，默认 CPU 核数。
+
+    Returns:
+        ImportReport: 导入统计。
+    """
+
+    with ProcessPoolHasher(workers) as hasher:
+        return BulkUserImporter(db, hasher=hasher, batch_size=batch_size).run(iter_rows(lines, fmt))
@@ -0,0 +1,63 @@
+"""认证主体缓存：通用缓存 `app.core.cache` 中的 `principal` 命名空间。
+
+鉴权依赖每个请求都要按 token 中的用户 ID 确认账号仍然有效。
+`UserRepository.get_principal`（及异步版本）以 `cached` 装饰，命中时跳过数据库查询；
+角色变更、停用、资料修改等写操作提交后通过 `invalidate_principal` 主动失效。
+`CACHE_BACKEND=redis` 时失效对所有 worker 立即可见，进程内后端下其他 worker 依赖 TTL 兜底。
+"""
+
+from __future__ import annotations
+
+from app.core.cache import Cache, get_cache
+from app.core.config import get_settings
+
+PRINCIPAL_NAMESPACE = "principal"
+
+
+def principal_key(user_id: int) -> str:
+    """返回用户在主体命名空间内的缓存键。
+
+    Args:
+        user_id (int): 用户 ID。
+
+    Returns:
+        str: 缓存键。
+    """
+
+    return str(user_id)
+
+
+def principal_ttl() -> float:
+    """返回主体条目的存活秒数，取 `principal_cache_ttl_seconds`。"""
+
+    return get_settings().principal_cache_ttl_seconds
+
+
+def get_principal_cache() -> Cache:
+    """返回主体缓存命名空间。
+
+    Returns:
+        Cache: `principal` 命名空间缓存。
+    """
+
+    return get_cache(PRINCIPAL_NAMESPACE, ttl=principal_ttl())
+
+
+def invalidate_principal(user_id: int) -> None:
+    """使指定用户的缓存主体失效。
+
+    Args:
+        user_id (int): 用户 ID。
+    """
+
+    get_principal_cache().delete(principal_key(user_id))
+
+
+async def invalidate_principal_async(user_id: int) -> None:
+    """`invalidate_principal` 的异步版本，供异步仓储在 Redis 后端下非阻塞地失效。
+
+    Args:
+        user_id (int): 用户 ID。
+    """
+
+    await get_principal_cache().delete_async(principal_key(user_id))
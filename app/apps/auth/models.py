@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -41,10 +42,11 @@ class User(Base):
         nullable=False,
     )
 
+    # 默认不预加载，需要角色时由仓储的加载配置（如 "with_roles"）显式指定
     roles: Mapped[List["Role"]] = relationship(
         secondary="user_roles",
         back_populates="users",
-        lazy="selectin",
+        lazy="select",
     )
 
 
@@ -68,18 +70,27 @@ class Role(Base):
         nullable=False,
     )
 
+    # 热门角色可能关联全量用户，默认不随角色一起加载
     users: Mapped[List["User"]] = relationship(
         secondary="user_roles",
         back_populates="roles",
-        lazy="selectin",
+        lazy="select",
     )
 
 
+# 邮箱按小写唯一，按邮箱检索时使用 lower(email) 以命中该函数索引
+Index("uq_users_email_lower", func.lower(User.email), unique=True)
+
+
 class UserRole(Base):
     """用户与角色的关联表。"""
 
     __tablename__ = "user_roles"
-    __table_args__ = (UniqueConstraint("user_id", "role_id", name="uq_user_role"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id", name="uq_user_role"),
+        # 主键 (user_id, role_id) 只覆盖按用户查角色，按角色查用户需要反向索引
+        Index("ix_user_roles_role_id", "role_id"),
+    )
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -0,0 +1,64 @@
+"""鉴权路径使用的轻量主体类型。"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """通过单条投影查询或 access token 声明得到的不可变认证主体。
+
+    只包含鉴权与 `/me` 所需的字段，避免为每个请求水合完整的 `User` ORM 实体
+    及其角色关系；实例可安全地在请求与线程之间共享（如放入主体缓存）。
+    """
+
+    id: int
+    email: str
+    full_name: str | None
+    is_active: bool
+    roles: frozenset[str] = frozenset()
+
+    def has_role(self, *names: str) -> bool:
+        """判断主体是否拥有任一指定角色。
+
+        Args:
+            *names (str): 候选角色名。
+
+        Returns:
+            bool: 拥有任一角色时返回 True。
+        """
+
+        return not self.roles.isdisjoint(names)
+
+    def to_claims(self) -> dict[str, Any]:
+        """转换为写入 access token 的紧凑声明（不含 `sub`）。
+
+        Returns:
+            dict[str, Any]: `email`、`name`、`active` 与排序后的 `roles`。
+        """
+
+        return {"email": self.email, "name": self.full_name, "active": self.is_active, "roles": sorted(self.roles)}
+
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> Principal | None:
+        """由 access token 声明构造主体。
+
+        Args:
+            claims (Mapping[str, Any]): 已验签的 token payload。
+
+        Returns:
+            Principal | None: 不含主体声明的普通 token 返回 None。
+        """
+
+        if "email" not in claims:
+            return None
+        return cls(
+            id=int(claims["sub"]),
+            email=claims["email"],
+            full_name=claims.get("name"),
+            is_active=bool(claims.get("active")),
+            roles=frozenset(claims.get("roles", ())),
+        )
@@ -2,16 +2,132 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Sequence
-
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
+from typing import Any, Iterable, Literal, Sequence
+
+from sqlalchemy import Dialect, Insert, Row, String, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.apps.auth.cache import (
+    PRINCIPAL_NAMESPACE,
+    invalidate_principal,
+    invalidate_principal_async,
+    principal_key,
+    principal_ttl,
+)
 from app.apps.auth.models import Role, User, UserRole
+from app.apps.auth.principal import Principal
+from app.core.cache import cached
+from app.db.bulk import insert_ignoring_conflicts
+from app.db.routing import READ_REPLICA
+
+# 允许通过 update 修改的用户资料字段
+UPDATABLE_USER_FIELDS = frozenset({"email", "full_name"})
+
+# 关系默认不预加载，调用方按场景显式选择加载配置
+UserLoadProfile = Literal["bare", "with_roles"]
+RoleLoadProfile = Literal["bare", "with_users"]
+
+USER_LOAD_PROFILES: dict[str, tuple[ExecutableOption, ...]] = {
+    "bare": (),
+    "with_roles": (selectinload(User.roles),),
+}
+ROLE_LOAD_PROFILES: dict[str, tuple[ExecutableOption, ...]] = {
+    "bare": (),
+    "with_users": (selectinload(Role.users),),
+}
+
+# 聚合角色名时使用的分隔符，创建角色时拒绝包含该字符的名称，拆分结果才无歧义
+_ROLE_SEPARATOR = ","
+
+
+# 热点查询在模块加载时构造一次，参数通过 bindparam 在执行时传入：
+# 语句对象与缓存键保持不变，每次调用跳过构造与缓存键计算，直接命中编译缓存，
+# 发送给驱动的 SQL 文本也保持一致，便于 psycopg 服务端预处理语句复用
+_USER_BY_EMAIL = {
+    load: select(User).where(func.lower(User.email) == func.lower(bindparam("email", type_=String))).options(*options)
+    for load, options in USER_LOAD_PROFILES.items()
+}
+_USER_BY_ID = {
+    load: select(User).where(User.id == bindparam("user_id")).options(*options)
+    for load, options in USER_LOAD_PROFILES.items()
+}
+_ROLE_BY_NAME = {
+    load: select(Role).where(Role.name == bindparam("name")).options(*options)
+    for load, options in ROLE_LOAD_PROFILES.items()
+}
+_ROLES_BY_USER_ID = (
+    select(Role)
+    .join(UserRole, Role.id == UserRole.role_id)
+    .where(UserRole.user_id == bindparam("user_id"))
+)
+# users ⟕ user_roles ⟕ roles 的单条投影聚合查询
+_PRINCIPAL_BY_USER_ID = (
+    select(
+        User.id,
+        User.email,
+        User.full_name,
+        User.is_active,
+        func.aggregate_strings(Role.name, _ROLE_SEPARATOR).label("role_names"),
+    )
+    .select_from(User)
+    .outerjoin(UserRole, UserRole.user_id == User.id)
+    .outerjoin(Role, Role.id == UserRole.role_id)
+    .where(User.id == bindparam("user_id"))
+    .group_by(User.id, User.email, User.full_name, User.is_active)
+)
+
+
+def _user_insert(
+    dialect: Dialect, email: str, password_hash: str, full_name: str | None, is_active: bool
+) -> Insert:
+    """构造写入用户并经 RETURNING 返回完整实体的 INSERT，唯一冲突时不返回行。"""
+
+    values = {"email": email, "password_hash": password_hash, "full_name": full_name, "is_active": is_active}
+    return insert_ignoring_conflicts(dialect, User).values(values).returning(User)
+
+
+def _role_insert(dialect: Dialect, name: str, description: str | None) -> Insert:
+    """构造写入角色并经 RETURNING 返回完整实体的 INSERT，名称冲突时不返回行。"""
+
+    if _ROLE_SEPARATOR in name:
+        raise ValueError(f"角色名不能包含 {_ROLE_SEPARATOR!r}")
+    return insert_ignoring_conflicts(dialect, Role).values(name=name, description=description).returning(Role)
+
+
+def _principal_from_row(row: Row | None) -> Principal | None:
+    """将投影查询结果行转换为 Principal。"""
+
+    if row is None:
+        return None
+    role_names = frozenset(row.role_names.split(_ROLE_SEPARATOR)) if row.role_names else frozenset()
+    return Principal(
+        id=row.id,
+        email=row.email,
+        full_name=row.full_name,
+        is_active=row.is_active,
+        roles=role_names,
+    )
+
+
+def _apply_user_fields(user: User, fields: dict[str, Any]) -> None:
+    """校验并写入资料字段，拒绝白名单以外的属性。"""
+
+    unknown = set(fields) - UPDATABLE_USER_FIELDS
+    if unknown:
+        raise ValueError(f"不支持更新的字段: {', '.join(sorted(unknown))}")
+    for name, value in fields.items():
+        setattr(user, name, value)
 
 
 class UserRepository:
-    """提供用户 CRUD 及角色绑定相关的数据库操作。"""
+    """提供用户 CRUD 及角色绑定相关的数据库操作。
+
+    只读方法通过 `READ_REPLICA` 绑定参数路由到从库（已配置时），写操作始终走主库；
+    鉴权依赖的 `get_by_email` 与 `get_principal` 例外，始终读主库，避免从库延迟导致
+    注册后立即登录失败，或在缓存失效后把停用前的主体重新写回缓存。
+    """
 
     def create(
         self,
@@ -21,62 +137,76 @@ class UserRepository:
         password_hash: str,
         full_name: str | None = None,
         is_active: bool = True,
-    ) -> User:
-        """创建用户记录并返回实体。
+    ) -> User | None:
+        """创建用户记录并返回实体，邮箱已存在（忽略大小写）时返回 None。
 
-        该方法供注册或后台创建账号时使用，确保所有必要字段写入数据库。
+        单条 `INSERT ... ON CONFLICT DO NOTHING RETURNING` 完成查重与写入：
+        并发注册同一邮箱时由唯一索引裁决，提交后无需再 SELECT 刷新。
 
         Args:
             db (Session): 当前数据库会话，负责事务提交。
-            email (str): 用户邮箱，需确保唯一。
+            email (str): 用户邮箱。
             password_hash (str): 已加密的密码摘要。
             full_name (str | None): 展示用姓名，可为空。
             is_active (bool): 是否激活，默认 True。
 
         Returns:
-            User: 新建并刷新后的用户 ORM 实体。
+            User | None: 新建的用户 ORM 实体，邮箱冲突时为 None。
         """
 
-        user = User(
-            email=email,
-            password_hash=password_hash,
-            full_name=full_name,
-            is_active=is_active,
-        )
-        db.add(user)
+        stmt = _user_insert(db.get_bind().dialect, email, password_hash, full_name, is_active)
+        user = db.execute(stmt).scalar_one_or_none()
         db.commit()
-        db.refresh(user)
         return user
 
-    def get_by_email(self, db: Session, email: str) -> User | None:
-        """按邮箱检索单个用户。
+    def get_by_email(self, db: Session, email: str, *, load: UserLoadProfile = "bare") -> User | None:
+        """按邮箱检索单个用户，忽略大小写。
 
-        主要用于登录或后台查验账号是否存在。
+        主要用于登录或后台查验账号是否存在，始终读主库。
 
         Args:
             db (Session): 数据库会话对象。
             email (str): 目标邮箱。
+            load (UserLoadProfile): 关系加载配置，默认不加载角色。
 
         Returns:
             User | None: 匹配的用户对象，未找到返回 None。
         """
 
-        stmt = select(User).where(User.email == email)
-        return db.execute(stmt).scalar_one_or_none()
+        params = {"email": email}  # 两侧均由数据库 lower()，与 lower(email) 唯一索引的规则一致
+        return db.execute(_USER_BY_EMAIL[load], params).scalar_one_or_none()
 
-    def get_by_id(self, db: Session, user_id: int) -> User | None:
+    def get_by_id(self, db: Session, user_id: int, *, load: UserLoadProfile = "bare") -> User | None:
         """通过主键 ID 查询用户。
 
         Args:
             db (Session): 数据库会话。
             user_id (int): 用户主键。
+            load (UserLoadProfile): 关系加载配置，默认不加载角色。
 
         Returns:
             User | None: 查询到的用户实体，否则 None。
         """
 
-        stmt = select(User).where(User.id == user_id)
-        return db.execute(stmt).scalar_one_or_none()
+        params = {"user_id": user_id}
+        return db.execute(_USER_BY_ID[load], params, bind_arguments=READ_REPLICA).scalar_one_or_none()
+
+    @cached(PRINCIPAL_NAMESPACE, key=lambda _repo, _db, user_id: principal_key(user_id), ttl=principal_ttl)
+    def get_principal(self, db: Session, user_id: int) -> Principal | None:
+        """以单条投影查询加载鉴权主体，不水合 ORM 实体；始终读主库。
+
+        结果（包括 None）按用户 ID 缓存在 `principal` 命名空间，写操作提交后主动失效。
+
+        Args:
+            db (Session): 数据库会话。
+            user_id (int): 用户主键。
+
+        Returns:
+            Principal | None: 用户基础字段与角色名集合，用户不存在时返回 None。
+        """
+
+        params = {"user_id": user_id}
+        return _principal_from_row(db.execute(_PRINCIPAL_BY_USER_ID, params).one_or_none())
 
     def list_roles(self, db: Session, user_id: int) -> Sequence[Role]:
         """列出指定用户所拥有的角色。
@@ -89,12 +219,8 @@ class UserRepository:
             Sequence[Role]: 用户当前绑定的角色列表。
         """
 
-        stmt = (
-            select(Role)
-            .join(UserRole, Role.id == UserRole.role_id)
-            .where(UserRole.user_id == user_id)
-        )
-        return db.execute(stmt).scalars().all()
+        params = {"user_id": user_id}
+        return db.execute(_ROLES_BY_USER_ID, params, bind_arguments=READ_REPLICA).scalars().all()
 
     def set_roles(self, db: Session, *, user: User, role_ids: Iterable[int]) -> None:
         """为用户重新绑定角色集合。
@@ -113,25 +239,275 @@ class UserRepository:
         db.add(user)
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.id)
+
+    def update(self, db: Session, *, user: User, **fields: Any) -> User:
+        """更新用户资料并失效主体缓存。
+
+        Args:
+            db (Session): 数据库会话。
+            user (User): 目标用户实体。
+            **fields (Any): 需更新的字段，仅支持 `UPDATABLE_USER_FIELDS`。
+
+        Returns:
+            User: 更新并刷新后的用户实体。
+        """
+
+        _apply_user_fields(user, fields)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        invalidate_principal(user.id)
+        return user
+
+    def deactivate(self, db: Session, *, user: User) -> User:
+        """停用用户，已签发的 token 随缓存失效立即无法通过鉴权。
+
+        Args:
+            db (Session): 数据库会话。
+            user (User): 目标用户实体。
+
+        Returns:
+            User: 停用后的用户实体。
+        """
+
+        user.is_active = False
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        invalidate_principal(user.id)
+        return user
 
 
 class RoleRepository:
     """封装角色增删改查逻辑。"""
 
-    def create(self, db: Session, *, name: str, description: str | None = None) -> Role:
-        """创建新角色并返回实体。
+    def create(self, db: Session, *, name: str, description: str | None = None) -> Role | None:
+        """以单条 INSERT ... RETURNING 创建角色，名称已存在时返回 None。
 
         Args:
             db (Session): 数据库会话。
-            name (str): 角色名，需唯一。
+            name (str): 角色名。
             description (str | None): 角色说明，可选。
 
         Returns:
-            Role: 新建并刷新后的角色实体。
+            Role | None: 新建的角色实体，名称冲突时为 None。
+
+        Raises:
+            ValueError: 角色名包含聚合角色时使用的分隔符。
         """
 
-        role = Role(name=name, description=description)
-        db.add(role)
+        role = db.execute(_role_insert(db.get_bind().dialect, name, description)).scalar_one_or_none()
         db.commit()
-        db.refresh(role)
         return role
+
+    def get_by_name(self, db: Session, name: str, *, load: RoleLoadProfile = "bare") -> Role | None:
+        """按名称查询角色。
+
+        默认不加载 `Role.users`，热门角色关联的用户可能是整张用户表。
+
+        Args:
+            db (Session): 数据库会话。
+            name (str): 角色名。
+            load (RoleLoadProfile): 关系加载配置，默认不加载用户。
+
+        Returns:
+            Role | None: 匹配的角色，未找到返回 None。
+        """
+
+        params = {"name": name}
+        return db.execute(_ROLE_BY_NAME[load], params, bind_arguments=READ_REPLICA).scalar_one_or_none()
+
+
+class AsyncUserRepository:
+    """`UserRepository` 的异步版本，供 `async def` 路由配合 AsyncSession 使用。"""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        email: str,
+        password_hash: str,
+        full_name: str | None = None,
+        is_active: bool = True,
+    ) -> User | None:
+        """创建用户记录并返回实体，邮箱已存在（忽略大小写）时返回 None。
+
+        Args:
+            db (AsyncSession): 当前异步数据库会话，负责事务提交。
+            email (str): 用户邮箱。
+            password_hash (str): 已加密的密码摘要。
+            full_name (str | None): 展示用姓名，可为空。
+            is_active (bool): 是否激活，默认 True。
+
+        Returns:
+            User | None: 新建的用户 ORM 实体，邮箱冲突时为 None。
+        """
+
+        stmt = _user_insert(db.get_bind().dialect, email, password_hash, full_name, is_active)
+        user = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
+        return user
+
+    async def get_by_email(
+        self, db: AsyncSession, email: str, *, load: UserLoadProfile = "bare"
+    ) -> User | None:
+        """按邮箱检索单个用户，忽略大小写，始终读主库。
+
+        异步 Session 不支持隐式懒加载，需要角色时必须选择 "with_roles"。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            email (str): 目标邮箱。
+            load (UserLoadProfile): 关系加载配置，默认不加载角色。
+
+        Returns:
+            User | None: 匹配的用户对象，未找到返回 None。
+        """
+
+        params = {"email": email}  # 两侧均由数据库 lower()，与 lower(email) 唯一索引的规则一致
+        return (await db.execute(_USER_BY_EMAIL[load], params)).scalar_one_or_none()
+
+    async def get_by_id(
+        self, db: AsyncSession, user_id: int, *, load: UserLoadProfile = "bare"
+    ) -> User | None:
+        """通过主键 ID 查询用户。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user_id (int): 用户主键。
+            load (UserLoadProfile): 关系加载配置，默认不加载角色。
+
+        Returns:
+            User | None: 查询到的用户实体，否则 None。
+        """
+
+        params = {"user_id": user_id}
+        return (await db.execute(_USER_BY_ID[load], params, bind_arguments=READ_REPLICA)).scalar_one_or_none()
+
+    @cached(PRINCIPAL_NAMESPACE, key=lambda _repo, _db, user_id: principal_key(user_id), ttl=principal_ttl)
+    async def get_principal(self, db: AsyncSession, user_id: int) -> Principal | None:
+        """以单条投影查询加载鉴权主体，不水合 ORM 实体；始终读主库。
+
+        结果（包括 None）按用户 ID 缓存在 `principal` 命名空间，写操作提交后主动失效。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user_id (int): 用户主键。
+
+        Returns:
+            Principal | None: 用户基础字段与角色名集合，用户不存在时返回 None。
+        """
+
+        params = {"user_id": user_id}
+        row = (await db.execute(_PRINCIPAL_BY_USER_ID, params)).one_or_none()
+        return _principal_from_row(row)
+
+    async def list_roles(self, db: AsyncSession, user_id: int) -> Sequence[Role]:
+        """列出指定用户所拥有的角色。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user_id (int): 目标用户 ID。
+
+        Returns:
+            Sequence[Role]: 用户当前绑定的角色列表。
+        """
+
+        params = {"user_id": user_id}
+        return (await db.execute(_ROLES_BY_USER_ID, params, bind_arguments=READ_REPLICA)).scalars().all()
+
+    async def set_roles(self, db: AsyncSession, *, user: User, role_ids: Iterable[int]) -> None:
+        """为用户重新绑定角色集合，会覆盖用户现有角色。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user (User): 目标用户实体。
+            role_ids (Iterable[int]): 应绑定的角色 ID 集合。
+        """
+
+        stmt = select(Role).where(Role.id.in_(tuple(role_ids) or (-1,)))
+        roles = (await db.execute(stmt)).scalars().all()
+        await db.refresh(user, attribute_names=["roles"])  # 替换集合前需显式加载现有角色
+        user.roles = list(roles)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        await invalidate_principal_async(user.id)
+
+    async def update(self, db: AsyncSession, *, user: User, **fields: Any) -> User:
+        """更新用户资料并失效主体缓存。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user (User): 目标用户实体。
+            **fields (Any): 需更新的字段，仅支持 `UPDATABLE_USER_FIELDS`。
+
+        Returns:
+            User: 更新并刷新后的用户实体。
+        """
+
+        _apply_user_fields(user, fields)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        await invalidate_principal_async(user.id)
+        return user
+
+    async def deactivate(self, db: AsyncSession, *, user: User) -> User:
+        """停用用户并失效主体缓存。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user (User): 目标用户实体。
+
+        Returns:
+            User: 停用后的用户实体。
+        """
+
+        user.is_active = False
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        await invalidate_principal_async(user.id)
+        return user
+
+
+class AsyncRoleRepository:
+    """`RoleRepository` 的异步版本。"""
+
+    async def create(self, db: AsyncSession, *, name: str, description: str | None = None) -> Role | None:
+        """以单条 INSERT ... RETURNING 创建角色，名称已存在时返回 None。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            name (str): 角色名。
+            description (str | None): 角色说明，可选。
+
+        Returns:
+            Role | None: 新建的角色实体，名称冲突时为 None。
+
+        Raises:
+            ValueError: 角色名包含聚合角色时使用的分隔符。
+        """
+
+        role = (await db.execute(_role_insert(db.get_bind().dialect, name, description))).scalar_one_or_none()
+        await db.commit()
+        return role
+
+    async def get_by_name(
+        self, db: AsyncSession, name: str, *, load: RoleLoadProfile = "bare"
+    ) -> Role | None:
+        """按名称查询角色，默认不加载 `Role.users`。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            name (str): 角色名。
+            load (RoleLoadProfile): 关系加载配置，默认不加载用户。
+
+        Returns:
+            Role | None: 匹配的角色，未找到返回 None。
+        """
+
+        params = {"name": name}
+        return (await db.execute(_ROLE_BY_NAME[load], params, bind_arguments=READ_REPLICA)).scalar_one_or_none()
@@ -0,0 +1,433 @@
+"""Token 吊销：按 `jti` 记录已注销或已轮换的 token，并在每个 worker 内以布隆过滤器预判。
+
+- `MemoryRevocationStore`：进程内实现，适用于单进程部署与测试；
+- `RedisRevocationStore`：每个 jti 一个带 TTL 的键（TTL 即 token 剩余有效期），
+  另以 sorted set（score 为过期时间）索引全部吊销记录，供各 worker 同步过滤器；
+- `RevocationList`：本地布隆过滤器 + 权威存储。过滤器判定"未吊销"时直接返回，
+  绝大多数请求不产生网络 I/O；判定"可能已吊销"时再查询存储确认。
+
+过滤器由后台线程按 `token_revocation_sync_seconds` 从存储重建，本进程内的吊销立即生效，
+其他 worker 上的吊销最迟在一个同步周期后生效。refresh token 轮换不经过过滤器，
+直接依赖存储的原子写入，保证同一 refresh token 只能使用一次。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import get_settings
+
+LOGGER = logging.getLogger("app.auth.revocation")
+
+
+class BloomFilter:
+    """固定容量的布隆过滤器，只会误报不会漏报。"""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """按预期元素数与误报率计算位数组长度与哈希次数。
+
+        Args:
+            capacity (int): 预期元素数，超出后误报率上升。
+            error_rate (float): 目标误报率，如 0.001。
+        """
+
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def add(self, item: str) -> None:
+        """加入元素。"""
+
+        positions = self._positions(item)
+        with self._lock:  # 按字节读改写，需避免并发写入互相覆盖
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def _positions(self, item: str) -> list[int]:
+        # 双重哈希：一次 blake2b 派生 k 个位置
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+
+class MemoryRevocationStore:
+    """进程内吊销存储，多 worker 部署时应改用 Redis。"""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """记录吊销。
+
+        Args:
+            jti (str): token 唯一标识。
+            expires_at (float): token 过期时间（Unix 秒），之后记录自动失效。
+
+        Returns:
+            bool: 本次调用新吊销时为 True，已吊销过为 False。
+        """
+
+        now = time.time()
+        with self._lock:
+            current = self._entries.get(jti)
+            if current is not None and current > now:
+                return False
+            self._entries[jti] = expires_at
+            return True
+
+    def is_revoked(self, jti: str) -> bool:
+        """查询是否已吊销。"""
+
+        with self._lock:
+            expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    async def revoke_async(self, jti: str, expires_at: float) -> bool:
+        """`revoke` 的异步版本；内存操作不阻塞，直接调用同步实现。"""
+
+        return self.revoke(jti, expires_at)
+
+    async def is_revoked_async(self, jti: str) -> bool:
+        """`is_revoked` 的异步版本。"""
+
+        return self.is_revoked(jti)
+
+    def active(self) -> list[str]:
+        """清理过期记录并返回仍有效的 jti，供重建过滤器。"""
+
+        now = time.time()
+        with self._lock:
+            self._entries = {jti: expires_at for jti, expires_at in self._entries.items() if expires_at > now}
+            return list(self._entries)
+
+    def close(self) -> None:
+        """内存存储无需释放资源。"""
+
+    async def close_async(self) -> None:
+        """`close` 的异步版本。"""
+
+
+class RedisRevocationStore:
+    """Redis 吊销存储，同步与异步客户端各自持有连接池。"""
+
+    def __init__(self, client: Any, async_client: Any, prefix: str = "revoked_token") -> None:
+        """使用已构建的客户端初始化，测试可传入 fakeredis。
+
+        Args:
+            client (Any): `redis.Redis` 兼容的同步客户端。
+            async_client (Any): `redis.asyncio.Redis` 兼容的异步客户端。
+            prefix (str): 键前缀，索引键为 `{prefix}s`。
+        """
+
+        self.client = client
+        self.async_client = async_client
+        self.prefix = prefix
+        self.index_key = f"{prefix}s"
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisRevocationStore:
+        """根据连接串创建同步与异步客户端。
+
+        Args:
+            url (str): Redis 连接串。
+
+        Returns:
+            RedisRevocationStore: 存储实例。
+        """
+
+        import redis
+        import redis.asyncio
+
+        return cls(redis.Redis.from_url(url), redis.asyncio.Redis.from_url(url))
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """以 `SET NX` 原子记录吊销，并写入同步索引。
+
+        Args:
+            jti (str): token 唯一标识。
+            expires_at (float): token 过期时间（Unix 秒）。
+
+        Returns:
+            bool: 本次调用新吊销时为 True，已吊销过为 False。
+        """
+
+        ttl_ms = _remaining_ms(expires_at)
+        if ttl_ms is None:
+            return True  # token 已过期，无需记录
+        pipe = self.client.pipeline()
+        pipe.set(self._key(jti), 1, nx=True, px=ttl_ms)
+        pipe.zadd(self.index_key, {jti: expires_at})
+        created, _ = pipe.execute()
+        return bool(created)
+
+    def is_revoked(self, jti: str) -> bool:
+        """查询是否已吊销。"""
+
+        return bool(self.client.exists(self._key(jti)))
+
+    async def revoke_async(self, jti: str, expires_at: float) -> bool:
+        """`revoke` 的异步版本。"""
+
+        ttl_ms = _remaining_ms(expires_at)
+        if ttl_ms is None:
+            return True
+        pipe = self.async_client.pipeline()
+        pipe.set(self._key(jti), 1, nx=True, px=ttl_ms)
+        pipe.zadd(self.index_key, {jti: expires_at})
+        created, _ = await pipe.execute()
+        return bool(created)
+
+    async def is_revoked_async(self, jti: str) -> bool:
+        """`is_revoked` 的异步版本。"""
+
+        return bool(await self.async_client.exists(self._key(jti)))
+
+    def active(self) -> list[str]:
+        """清理索引中的过期记录并返回仍有效的 jti。"""
+
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(self.index_key, "-inf", time.time())
+        pipe.zrange(self.index_key, 0, -1)
+        _, members = pipe.execute()
+        return [member.decode("utf-8") if isinstance(member, bytes) else member for member in members]
+
+    def close(self) -> None:
+        """断开同步连接池；异步连接池绑定事件循环，需在循环内调用 `close_async` 断开。"""
+
+        self.client.close()
+
+    async def close_async(self) -> None:
+        """断开同步与异步连接池。"""
+
+        self.client.close()
+        await self.async_client.aclose()
+
+    def _key(self, jti: str) -> str:
+        return f"{self.prefix}:{jti}"
+
+
+RevocationStore = MemoryRevocationStore | RedisRevocationStore
+
+
+class RevocationList:
+    """本地布隆过滤器前置的吊销名单。"""
+
+    def __init__(self, store: RevocationStore, capacity: int, error_rate: float) -> None:
+        """初始化过滤器并从存储加载现有记录。
+
+        Args:
+            store (RevocationStore): 权威吊销存储。
+            capacity (int): 过滤器预期容量，实际记录更多时按 2 倍记录数重建。
+            error_rate (float): 过滤器目标误报率。
+        """
+
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._since_sync: list[str] = []
+        self._filter_negatives = 0
+        self._store_lookups = 0
+        self._false_positives = 0
+        self._syncer: _Syncer | None = None
+
+    def revoke(self, jti: str, expires_at: float) -> bool:
+        """吊销 token，本进程的过滤器立即生效。
+
+        Args:
+            jti (str): token 唯一标识。
+            expires_at (float): token 过期时间（Unix 秒）。
+
+        Returns:
+            bool: 新吊销时为 True；已吊销过为 False，refresh 轮换据此拒绝重放。
+        """
+
+        created = self.store.revoke(jti, expires_at)
+        self._remember(jti)
+        return created
+
+    async def revoke_async(self, jti: str, expires_at: float) -> bool:
+        """`revoke` 的异步版本。"""
+
+        created = await self.store.revoke_async(jti, expires_at)
+        self._remember(jti)
+        return created
+
+    def is_revoked(self, jti: str | None) -> bool:
+        """判断 token 是否已吊销，过滤器未命中时不访问存储。
+
+        Args:
+            jti (str | None): token 唯一标识，缺失（旧版 token）视为未吊销。
+
+        Returns:
+            bool: 已吊销时为 True。
+        """
+
+        if not self._may_contain(jti):
+            return False
+        return self._confirm(self.store.is_revoked(jti))
+
+    async def is_revoked_async(self, jti: str | None) -> bool:
+        """`is_revoked` 的异步版本。"""
+
+        if not self._may_contain(jti):
+            return False
+        return self._confirm(await self.store.is_revoked_async(jti))
+
+    def sync(self) -> None:
+        """从存储重建过滤器，同时去掉已过期的记录。"""
+
+        with self._lock:
+            self._since_sync = []
+        active = self.store.active()
+        rebuilt = BloomFilter(max(self.capacity, 2 * len(active)), self.error_rate)
+        for jti in active:
+            rebuilt.add(jti)
+        with self._lock:
+            for jti in self._since_sync:  # 读取存储期间本进程新增的吊销
+                rebuilt.add(jti)
+            self._filter = rebuilt
+
+    def start_sync(self, interval: float) -> None:
+        """启动后台同步线程，重复调用会替换旧线程。
+
+        Args:
+            interval (float): 同步间隔（秒），小于等于 0 表示不启动。
+        """
+
+        self.stop_sync()
+        if interval > 0:
+            self._syncer = _Syncer(self, interval)
+            self._syncer.start()
+
+    def stop_sync(self) -> None:
+        """停止后台同步线程（若存在）。"""
+
+        if self._syncer is not None:
+            self._syncer.stop()
+            self._syncer = None
+
+    def stats(self) -> dict[str, int]:
+        """返回过滤器效果统计，`false_positives` 偏高时应增大容量。
+
+        Returns:
+            dict[str, int]: 过滤器直接放行、查询存储与误报的次数。
+        """
+
+        with self._lock:
+            return {
+                "filter_negatives": self._filter_negatives,
+                "store_lookups": self._store_lookups,
+                "false_positives": self._false_positives,
+            }
+
+    def _remember(self, jti: str) -> None:
+        with self._lock:
+            self._filter.add(jti)
+            self._since_sync.append(jti)
+
+    def _may_contain(self, jti: str | None) -> bool:
+        contained = jti is not None and jti in self._filter
+        with self._lock:
+            if contained:
+                self._store_lookups += 1
+            else:
+                self._filter_negatives += 1
+        return contained
+
+    def _confirm(self, revoked: bool) -> bool:
+        if not revoked:
+            with self._lock:
+                self._false_positives += 1
+        return revoked
+
+
+class _Syncer:
+    """后台线程，按固定间隔重建吊销过滤器。"""
+
+    def __init__(self, revocations: RevocationList, interval: float) -> None:
+        self.revocations = revocations
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.revocations.sync()
+            except Exception:  # noqa: BLE001 存储暂不可用时保留旧过滤器，下个周期重试
+                LOGGER.exception("Failed to sync token revocations")
+
+
+@lru_cache(maxsize=1)
+def get_revocation_list() -> RevocationList:
+    """返回按 Settings 创建的进程级吊销名单。
+
+    Returns:
+        RevocationList: `token_revocation_backend` 为 redis 时使用 `redis_url`，否则为进程内存储。
+    """
+
+    settings = get_settings()
+    if settings.token_revocation_backend == "redis":
+        store: RevocationStore = RedisRevocationStore.from_url(settings.redis_url)
+    else:
+        store = MemoryRevocationStore()
+    revocations = RevocationList(
+        store,
+        capacity=settings.token_revocation_filter_capacity,
+        error_rate=settings.token_revocation_filter_error_rate,
+    )
+    revocations.sync()
+    return revocations
+
+
+def start_revocation_sync() -> None:
+    """按配置启动吊销过滤器的后台同步，由应用启动事件调用。"""
+
+    get_revocation_list().start_sync(get_settings().token_revocation_sync_seconds)
+
+
+def reset_revocation_list() -> None:
+    """停止同步线程、关闭存储并丢弃实例，下次使用时按配置重建。供关闭事件与测试调用。"""
+
+    if get_revocation_list.cache_info().currsize:
+        revocations = get_revocation_list()
+        revocations.stop_sync()
+        revocations.store.close()
+    get_revocation_list.cache_clear()
+
+
+async def reset_revocation_list_async() -> None:
+    """`reset_revocation_list` 的异步版本，同时断开异步连接池，供应用关闭事件调用。"""
+
+    if get_revocation_list.cache_info().currsize:
+        revocations = get_revocation_list()
+        revocations.stop_sync()
+        await revocations.store.close_async()
+    get_revocation_list.cache_clear()
+
+
+def _remaining_ms(expires_at: float) -> int | None:
+    remaining = expires_at - time.time()
+    return max(1, int(remaining * 1000)) if remaining > 0 else None
@@ -2,98 +2,133 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Any
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.apps.auth.models import User
+from app.apps.auth.principal import Principal
 from app.apps.auth.schemas import (
     LoginRequest,
+    LogoutRequest,
     RefreshRequest,
     TokenPair,
     UserCreate,
     UserRead,
 )
-from app.apps.auth.service import AuthService
+from app.apps.auth.service import AsyncAuthService, AuthService
 from app.core.config import Settings, get_settings
-from app.core.dependencies import get_current_user
-from app.db.session import get_db
+from app.core.dependencies import get_access_claims_async, get_claims_principal_async, get_client_ip
+from app.core.responses import FastJSONResponse
+from app.db.session import get_async_db, get_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# 以下路由直接返回 `FastJSONResponse(<已校验模型>)`：`response_model` 仅用于生成 OpenAPI 文档，
+# FastAPI 对 Response 实例不再重复校验与序列化。
+
 
 @router.post("/register", response_model=UserRead, status_code=201)
-def register_user(
+async def register_user(
     payload: UserCreate,
-    db: Session = Depends(get_db),
-    service: AuthService = Depends(AuthService),
-) -> UserRead:
+    db: AsyncSession = Depends(get_async_db),
+    service: AsyncAuthService = Depends(AsyncAuthService),
+) -> FastJSONResponse:
     """注册新用户并返回基础信息。
 
     Args:
         payload (UserCreate): 注册表单，包含邮箱、密码、姓名。
-        db (Session): 注入的数据库会话。
-        service (AuthService): 认证业务服务。
+        db (AsyncSession): 注入的异步数据库会话。
+        service (AsyncAuthService): 异步认证业务服务。
 
     Returns:
-        UserRead: 新建用户的对外数据。
+        FastJSONResponse: 新建用户的对外数据（`UserRead`）。
     """
 
-    user = service.register(db, payload)
-    return UserRead.model_validate(user, from_attributes=True)
+    user = await service.register(db, payload)
+    return FastJSONResponse(UserRead.model_validate(user, from_attributes=True), status_code=201)
 
 
 @router.post("/login", response_model=TokenPair)
-def login(
+async def login(
     credentials: LoginRequest,
-    db: Session = Depends(get_db),
-    service: AuthService = Depends(AuthService),
+    client_ip: str | None = Depends(get_client_ip),
+    db: AsyncSession = Depends(get_async_db),
+    service: AsyncAuthService = Depends(AsyncAuthService),
     settings: Settings = Depends(get_settings),
-) -> TokenPair:
-    """校验凭证并返回 token 对。
+) -> FastJSONResponse:
+    """校验凭证并返回 token 对，失败次数过多时返回 429。
 
     Args:
         credentials (LoginRequest): 登录邮箱与密码。
-        db (Session): 数据库会话。
-        service (AuthService): 认证服务实例。
+        client_ip (str | None): 客户端 IP，经可信代理配置解析。
+        db (AsyncSession): 异步数据库会话。
+        service (AsyncAuthService): 异步认证服务实例。
         settings (Settings): 应用配置。
 
     Returns:
-        TokenPair: 包含 access/refresh token 的响应。
+        FastJSONResponse: 包含 access/refresh token 的响应（`TokenPair`）。
     """
 
-    user = service.authenticate(db, credentials)
-    return service.build_token_pair(user.id, settings)
+    user = await service.authenticate(db, credentials, client_ip)
+    return FastJSONResponse(await service.issue_tokens(db, user.id, settings))
 
 
 @router.post("/refresh", response_model=TokenPair)
 def refresh_token(
     payload: RefreshRequest,
+    db: Session = Depends(get_db),
     service: AuthService = Depends(AuthService),
     settings: Settings = Depends(get_settings),
-) -> TokenPair:
+) -> FastJSONResponse:
     """使用 refresh token 获取新的 token 对。
 
     Args:
         payload (RefreshRequest): 携带 refresh token 的请求体。
+        db (Session): 数据库会话，仅 rich claims 模式下用于重新加载主体。
         service (AuthService): 认证服务。
         settings (Settings): 应用配置。
 
     Returns:
-        TokenPair: 新生成的 token 对。
+        FastJSONResponse: 新生成的 token 对（`TokenPair`）。
+    """
+
+    return FastJSONResponse(service.refresh(payload, settings, db))
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    payload: LogoutRequest | None = None,
+    claims: dict[str, Any] = Depends(get_access_claims_async),
+    service: AsyncAuthService = Depends(AsyncAuthService),
+    settings: Settings = Depends(get_settings),
+) -> Response:
+    """吊销当前 access token，请求体携带 refresh token 时一并吊销。
+
+    Args:
+        payload (LogoutRequest | None): 可选的请求体。
+        claims (dict[str, Any]): 已校验的 access token payload。
+        service (AsyncAuthService): 异步认证服务。
+        settings (Settings): 应用配置。
+
+    Returns:
+        Response: 204 空响应。
     """
 
-    return service.refresh(payload, settings)
+    await service.logout(claims, payload, settings)
+    return Response(status_code=204)
 
 
 @router.get("/me", response_model=UserRead)
-def read_current_user(current_user: User = Depends(get_current_user)) -> UserRead:
-    """返回当前登录用户的信息。
+async def read_current_user(current_user: Principal = Depends(get_claims_principal_async)) -> FastJSONResponse:
+    """返回当前登录用户的信息，rich claims token 不访问数据库。
 
     Args:
-        current_user (User): 通过依赖注入得到的用户实体。
+        current_user (Principal): 通过依赖注入得到的认证主体。
 
     Returns:
-        UserRead: 当前用户的基本资料。
+        FastJSONResponse: 当前用户的基本资料（`UserRead`）。
     """
 
-    return UserRead.model_validate(current_user, from_attributes=True)
+    return FastJSONResponse(UserRead.model_validate(current_user, from_attributes=True))
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
 class UserCreate(BaseModel):
@@ -28,6 +28,12 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    """注销请求体，可携带需一并吊销的 refresh token。"""
+
+    refresh_token: str | None = None
+
+
 class UserRead(BaseModel):
     """返回给前端的用户信息。"""
 
@@ -46,3 +52,20 @@ class TokenPair(BaseModel):
     refresh_token: str
     token_type: Literal["bearer"]
     expires_in: int
+
+
+class UserImportRow(BaseModel):
+    """批量导入中的单行用户数据，`roles` 可为列表或以分号分隔的字符串。"""
+
+    email: EmailStr
+    password: str = Field(min_length=8)
+    full_name: str | None = None
+    is_active: bool = True
+    roles: list[str] = Field(default_factory=list)
+
+    @field_validator("roles", mode="before")
+    @classmethod
+    def _split_roles(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [name.strip() for name in value.split(";") if name.strip()]
+        return value
@@ -2,23 +2,114 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.apps.auth.models import User
-from app.apps.auth.repository import UserRepository
-from app.apps.auth.schemas import LoginRequest, RefreshRequest, TokenPair, UserCreate
+from app.apps.auth.principal import Principal
+from app.apps.auth.repository import AsyncUserRepository, UserRepository
+from app.apps.auth.revocation import get_revocation_list
+from app.apps.auth.schemas import LoginRequest, LogoutRequest, RefreshRequest, TokenPair, UserCreate
+from app.apps.auth.throttle import get_login_throttle
 from app.core.config import Settings, get_settings
-from app.core.security import (
-    create_access_token,
-    create_refresh_token,
-    decode_token,
-    get_password_hash,
-    verify_password,
-)
+from app.core.hashing import get_password_executor
+from app.core.security import create_access_token, create_refresh_token, decode_token
+
+
+class _TokenService:
+    """同步与异步认证服务共享的 token 签发与刷新逻辑。"""
+
+    def build_token_pair(
+        self, user_id: int, settings: Settings | None = None, principal: Principal | None = None
+    ) -> TokenPair:
+        """基于用户 ID 生成 access/refresh token 对。
+
+        Args:
+            user_id (int): 目标用户 ID。
+            settings (Settings | None): 应用配置，可覆盖默认值。
+            principal (Principal | None): 传入时写入 access token 的 rich claims。
+
+        Returns:
+            TokenPair: 包含 access/refresh token 的对象。
+        """
+
+        config = settings or get_settings()
+        access_token = create_access_token(user_id, config, principal)
+        refresh_token = create_refresh_token(user_id, config)
+        return TokenPair(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+            expires_in=config.access_token_expire_minutes * 60,
+        )
+
+    def refresh(self, refresh_request: RefreshRequest, settings: Settings | None = None) -> TokenPair:
+        """验证 refresh token 并生成新的 token 对，旧 refresh token 随即吊销（轮换）。
+
+        吊销写入是原子的，同一 refresh token 并发或重复使用时只有一次成功。
+
+        Args:
+            refresh_request (RefreshRequest): 携带 refresh token 的请求体。
+            settings (Settings | None): 应用配置，可选。
+
+        Returns:
+            TokenPair: 新生成的 access/refresh token。
+        """
+
+        config = settings or get_settings()
+        return self.build_token_pair(self._rotate(refresh_request.refresh_token, config), config)
 
+    def _rotate(self, token: str, settings: Settings) -> int:
+        """校验并吊销 refresh token，返回其用户 ID；已被使用过的 token 抛出 401。"""
 
-class AuthService:
+        payload = self._refresh_claims(token, settings)
+        if not get_revocation_list().revoke(payload["jti"], payload["exp"]):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+        return int(payload["sub"])
+
+    def _refresh_claims(self, token: str, settings: Settings) -> dict[str, Any]:
+        """校验 refresh token 的签名、类型、用户 ID 与 jti。
+
+        Args:
+            token (str): refresh token。
+            settings (Settings): 应用配置。
+
+        Returns:
+            dict[str, Any]: token payload，校验失败抛出 401。
+        """
+
+        try:
+            payload = decode_token(token, settings)
+        except Exception as exc:  # noqa: BLE001 捕获 JWT 解码异常
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
+
+        if payload.get("type") != "refresh":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+
+        # 不含 jti 的旧 token 无法轮换，要求重新登录
+        if payload.get("sub") is None or payload.get("jti") is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+
+        return payload
+
+    def _logout_claims(
+        self, access_claims: dict[str, Any], data: LogoutRequest | None, settings: Settings
+    ) -> list[dict[str, Any]]:
+        """返回注销时需吊销的 token payload，refresh token 必须属于同一用户。"""
+
+        claims = [access_claims] if access_claims.get("jti") else []
+        if data is not None and data.refresh_token:
+            refresh_claims = self._refresh_claims(data.refresh_token, settings)
+            if refresh_claims["sub"] != access_claims["sub"]:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+            claims.append(refresh_claims)
+        return claims
+
+
+class AuthService(_TokenService):
     """处理用户认证相关的业务逻辑。
 
     主要提供注册、登录、token 生成与刷新等能力。
@@ -32,9 +123,10 @@ class AuthService:
         """
 
         self.user_repo = user_repo or UserRepository()
+        self.password_executor = get_password_executor()
 
     def register(self, db: Session, data: UserCreate) -> User:
-        """根据提交的信息创建新用户。
+        """根据提交的信息创建新用户，查重与写入在同一条 INSERT 中完成。
 
         Args:
             db (Session): 数据库会话。
@@ -44,77 +136,200 @@ class AuthService:
             User: 刚创建的用户实体。
         """
 
-        existing = self.user_repo.get_by_email(db, data.email)
-        if existing:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-
-        hashed = get_password_hash(data.password)
-        return self.user_repo.create(
+        hashed = self.password_executor.hash(data.password)
+        user = self.user_repo.create(
             db=db,
             email=data.email,
             password_hash=hashed,
             full_name=data.full_name,
         )
+        if user is None:  # 冲突由唯一索引在同一条 INSERT 中裁决，并发重复注册同样生效
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
+        return user
 
-    def authenticate(self, db: Session, credentials: LoginRequest) -> User:
-        """校验登录凭证并返回用户。
+    def authenticate(self, db: Session, credentials: LoginRequest, client_ip: str | None = None) -> User:
+        """校验登录凭证并返回用户，邮箱或 IP 处于锁定期时在查库与校验密码前拒绝。
 
         Args:
             db (Session): 数据库会话。
             credentials (LoginRequest): 用户提交的邮箱与密码。
+            client_ip (str | None): 客户端 IP，用于按 IP 限流。
 
         Returns:
             User: 验证通过的用户实体。
         """
 
+        throttle = get_login_throttle()
+        throttle.check(credentials.email, client_ip)
         user = self.user_repo.get_by_email(db, credentials.email)
-        if not user or not verify_password(credentials.password, user.password_hash):
+        if not user or not self.password_executor.verify(credentials.password, user.password_hash):
+            throttle.record_failure(credentials.email, client_ip)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        throttle.record_success(credentials.email)
 
         if not user.is_active:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
 
         return user
 
-    def build_token_pair(self, user_id: int, settings: Settings | None = None) -> TokenPair:
-        """基于用户 ID 生成 access/refresh token 对。
+    def issue_tokens(self, db: Session, user_id: int, settings: Settings | None = None) -> TokenPair:
+        """签发 token 对；启用 `access_token_rich_claims` 时先加载主体写入 access token。
 
         Args:
+            db (Session): 数据库会话。
             user_id (int): 目标用户 ID。
-            settings (Settings | None): 应用配置，可覆盖默认值。
+            settings (Settings | None): 应用配置，可选。
 
         Returns:
-            TokenPair: 包含 access/refresh token 的对象。
+            TokenPair: 新生成的 access/refresh token。
         """
 
         config = settings or get_settings()
-        access_token = create_access_token(user_id, config)
-        refresh_token = create_refresh_token(user_id, config)
-        return TokenPair(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_type="bearer",
-            expires_in=config.access_token_expire_minutes * 60,
-        )
+        principal = None
+        if config.access_token_rich_claims:
+            principal = _require_active(self.user_repo.get_principal(db, user_id))
+        return self.build_token_pair(user_id, config, principal)
 
-    def refresh(self, refresh_request: RefreshRequest, settings: Settings | None = None) -> TokenPair:
-        """验证 refresh token 并生成新的 token 对。
+    def refresh(
+        self, refresh_request: RefreshRequest, settings: Settings | None = None, db: Session | None = None
+    ) -> TokenPair:
+        """轮换 refresh token 并签发新的 token 对。
+
+        传入会话且启用 rich claims 时重新加载主体，角色变更与停用在刷新时生效。
 
         Args:
             refresh_request (RefreshRequest): 携带 refresh token 的请求体。
             settings (Settings | None): 应用配置，可选。
+            db (Session | None): 数据库会话，仅 rich claims 模式需要。
 
         Returns:
             TokenPair: 新生成的 access/refresh token。
         """
 
         config = settings or get_settings()
-        payload = decode_token(refresh_request.refresh_token, config)
-        if payload.get("type") != "refresh":
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+        user_id = self._rotate(refresh_request.refresh_token, config)
+        if db is None:
+            return self.build_token_pair(user_id, config)
+        return self.issue_tokens(db, user_id, config)
 
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    def logout(
+        self, access_claims: dict[str, Any], data: LogoutRequest | None = None, settings: Settings | None = None
+    ) -> None:
+        """吊销当前 access token 与可选的 refresh token，重复注销幂等。
+
+        Args:
+            access_claims (dict[str, Any]): 已校验的 access token payload。
+            data (LogoutRequest | None): 可选的请求体，携带需一并吊销的 refresh token。
+            settings (Settings | None): 应用配置，可选。
+        """
+
+        revocations = get_revocation_list()
+        for claims in self._logout_claims(access_claims, data, settings or get_settings()):
+            revocations.revoke(claims["jti"], claims["exp"])
+
+
+class AsyncAuthService(_TokenService):
+    """`AuthService` 的异步版本，基于 AsyncSession 访问数据库。
+
+    bcrypt 交由专用的密码哈希执行器运行，等待期间不阻塞事件循环。
+    """
+
+    def __init__(self, user_repo: AsyncUserRepository | None = None) -> None:
+        """初始化服务并注入异步仓储依赖。
+
+        Args:
+            user_repo (AsyncUserRepository | None): 可选的异步用户仓储，便于测试替换。
+        """
+
+        self.user_repo = user_repo or AsyncUserRepository()
+        self.password_executor = get_password_executor()
+
+    async def register(self, db: AsyncSession, data: UserCreate) -> User:
+        """根据提交的信息创建新用户，查重与写入在同一条 INSERT 中完成。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            data (UserCreate): 包含邮箱、密码、姓名的请求体。
+
+        Returns:
+            User: 刚创建的用户实体。
+        """
+
+        hashed = await self.password_executor.hash_async(data.password)
+        user = await self.user_repo.create(
+            db=db,
+            email=data.email,
+            password_hash=hashed,
+            full_name=data.full_name,
+        )
+        if user is None:  # 冲突由唯一索引在同一条 INSERT 中裁决，并发重复注册同样生效
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
+        return user
+
+    async def authenticate(
+        self, db: AsyncSession, credentials: LoginRequest, client_ip: str | None = None
+    ) -> User:
+        """校验登录凭证并返回用户，邮箱或 IP 处于锁定期时在查库与校验密码前拒绝。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            credentials (LoginRequest): 用户提交的邮箱与密码。
+            client_ip (str | None): 客户端 IP，用于按 IP 限流。
+
+        Returns:
+            User: 验证通过的用户实体。
+        """
+
+        throttle = get_login_throttle()
+        await throttle.check_async(credentials.email, client_ip)
+        user = await self.user_repo.get_by_email(db, credentials.email)
+        if not user or not await self.password_executor.verify_async(credentials.password, user.password_hash):
+            await throttle.record_failure_async(credentials.email, client_ip)
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+        await throttle.record_success_async(credentials.email)
+
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+
+        return user
+
+    async def issue_tokens(self, db: AsyncSession, user_id: int, settings: Settings | None = None) -> TokenPair:
+        """`AuthService.issue_tokens` 的异步版本。
+
+        Args:
+            db (AsyncSession): 异步数据库会话。
+            user_id (int): 目标用户 ID。
+            settings (Settings | None): 应用配置，可选。
+
+        Returns:
+            TokenPair: 新生成的 access/refresh token。
+        """
+
+        config = settings or get_settings()
+        principal = None
+        if config.access_token_rich_claims:
+            principal = _require_active(await self.user_repo.get_principal(db, user_id))
+        return self.build_token_pair(user_id, config, principal)
+
+    async def logout(
+        self, access_claims: dict[str, Any], data: LogoutRequest | None = None, settings: Settings | None = None
+    ) -> None:
+        """吊销当前 access token 与可选的 refresh token，重复注销幂等。
+
+        Args:
+            access_claims (dict[str, Any]): 已校验的 access token payload。
+            data (LogoutRequest | None): 可选的请求体，携带需一并吊销的 refresh token。
+            settings (Settings | None): 应用配置，可选。
+        """
+
+        revocations = get_revocation_list()
+        for claims in self._logout_claims(access_claims, data, settings or get_settings()):
+            await revocations.revoke_async(claims["jti"], claims["exp"])
+
+
+def _require_active(principal: Principal | None) -> Principal:
+    """用户不存在或已停用时抛出 401，不为其签发 token。"""
 
-        return self.build_token_pair(int(user_id), config)
+    if principal is None or not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return principal
@@ -0,0 +1,429 @@
+"""登录限流：按邮箱与客户端 IP 统计失败次数，超限后在校验密码前直接拒绝。
+
+每次失败登录写入滑动窗口；窗口内失败次数达到上限即进入锁定，锁定时长随
+`login_lockout_reset_seconds` 内的累计锁定次数翻倍（上限 `login_lockout_max_seconds`）。
+锁定期间的登录只需一次本地字典查询或一次 Redis 往返即被拒绝，不查询数据库、
+不进入 bcrypt 线程池，撞库洪峰因此不会耗尽 worker CPU。
+
+- `MemoryThrottleBackend`：进程内实现，单进程部署与测试使用；
+- `RedisThrottleBackend`：以 Lua 脚本原子完成"清理窗口、记录失败、判断并加锁"，多 worker 共享计数。
+
+成功登录会清空该邮箱的失败记录与累计锁定次数；按 IP 的计数不受影响。
+
+按 IP 限流默认关闭（`login_max_failures_per_ip` 为 0）：部署在反向代理之后时，需先配置
+`trusted_proxies` 以从 `X-Forwarded-For` 解析真实客户端 IP，否则全部请求共享代理地址，
+少量失败即会锁定所有用户的登录。
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.metrics import LOGIN_FAILURES, LOGIN_THROTTLE_LOCKOUTS, LOGIN_THROTTLE_REJECTIONS
+
+LOGGER = logging.getLogger("app.auth.throttle")
+
+# KEYS: 窗口 zset、锁定键、累计锁定次数键
+# ARGV: 当前毫秒时间、窗口毫秒、失败上限、基础锁定毫秒、最长锁定毫秒、累计次数保留毫秒、成员
+_RECORD_FAILURE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+redis.call('ZADD', KEYS[1], now, ARGV[7])
+redis.call('PEXPIRE', KEYS[1], window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+  return 0
+end
+local strikes = redis.call('INCR', KEYS[3])
+redis.call('PEXPIRE', KEYS[3], ARGV[6])
+local lockout = math.floor(math.min(tonumber(ARGV[4]) * 2 ^ (strikes - 1), tonumber(ARGV[5])))
+redis.call('SET', KEYS[2], 1, 'PX', lockout)
+redis.call('DEL', KEYS[1])
+return lockout
+"""
+
+
+class LoginThrottledError(Exception):
+    """登录因失败次数过多被暂时拒绝。"""
+
+    def __init__(self, scope: str, retry_after: float) -> None:
+        """记录触发限流的维度与剩余锁定时间。
+
+        Args:
+            scope (str): 触发限流的维度，`email` 或 `ip`。
+            retry_after (float): 距离解锁的秒数。
+        """
+
+        super().__init__(f"Too many failed logins ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class ThrottleRule:
+    """单个维度的失败次数上限与窗口。"""
+
+    scope: str
+    max_failures: int
+    window_seconds: float
+
+    @property
+    def enabled(self) -> bool:
+        """上限与窗口均为正数时启用。"""
+
+        return self.max_failures > 0 and self.window_seconds > 0
+
+
+@dataclass(frozen=True, slots=True)
+class LockoutPolicy:
+    """锁定时长的递增策略。"""
+
+    base_seconds: float
+    max_seconds: float
+    reset_seconds: float
+
+    def duration(self, strikes: int) -> float:
+        """第 `strikes` 次锁定的时长：每次翻倍，不超过上限。"""
+
+        return min(self.base_seconds * 2 ** (strikes - 1), self.max_seconds)
+
+
+class MemoryThrottleBackend:
+    """线程安全的进程内失败计数。"""
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        """初始化存储。
+
+        Args:
+            max_keys (int): 窗口键数量超过该值时清理已过期的键，防止被随机邮箱撑大。
+        """
+
+        self.max_keys = max_keys
+        self._windows: dict[str, deque[float]] = {}
+        self._locked_until: dict[str, float] = {}
+        self._strikes: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def retry_after(self, keys: list[str]) -> list[float]:
+        """返回各键剩余的锁定秒数，未锁定为 0。"""
+
+        now = time.monotonic()
+        with self._lock:
+            return [max(0.0, self._locked_until.get(key, now) - now) for key in keys]
+
+    def record_failure(self, key: str, rule: ThrottleRule, policy: LockoutPolicy) -> float:
+        """记录一次失败，达到上限时加锁。
+
+        Args:
+            key (str): 计数键。
+            rule (ThrottleRule): 该维度的上限与窗口。
+            policy (LockoutPolicy): 锁定策略。
+
+        Returns:
+            float: 本次触发的锁定秒数，未触发为 0。
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(key, deque())
+            while window and window[0] <= now - rule.window_seconds:
+                window.popleft()
+            window.append(now)
+            if len(window) < rule.max_failures:
+                if len(self._windows) > self.max_keys:
+                    self._prune(now, rule.window_seconds)
+                return 0.0
+            strikes, expires_at = self._strikes.get(key, (0, now))
+            strikes = strikes + 1 if expires_at > now else 1
+            self._strikes[key] = (strikes, now + policy.reset_seconds)
+            lockout = policy.duration(strikes)
+            self._locked_until[key] = now + lockout
+            del self._windows[key]
+            return lockout
+
+    def reset(self, key: str) -> None:
+        """清空失败记录与累计锁定次数。"""
+
+        with self._lock:
+            self._windows.pop(key, None)
+            self._strikes.pop(key, None)
+
+    async def retry_after_async(self, keys: list[str]) -> list[float]:
+        """`retry_after` 的异步版本；内存操作不阻塞，直接调用同步实现。"""
+
+        return self.retry_after(keys)
+
+    async def record_failure_async(self, key: str, rule: ThrottleRule, policy: LockoutPolicy) -> float:
+        """`record_failure` 的异步版本。"""
+
+        return self.record_failure(key, rule, policy)
+
+    async def reset_async(self, key: str) -> None:
+        """`reset` 的异步版本。"""
+
+        self.reset(key)
+
+    def close(self) -> None:
+        """内存存储无需释放资源。"""
+
+    async def close_async(self) -> None:
+        """`close` 的异步版本。"""
+
+    def _prune(self, now: float, window_seconds: float) -> None:
+        self._windows = {key: w for key, w in self._windows.items() if w and w[-1] > now - window_seconds}
+        self._locked_until = {key: until for key, until in self._locked_until.items() if until > now}
+        self._strikes = {key: entry for key, entry in self._strikes.items() if entry[1] > now}
+
+
+class RedisThrottleBackend:
+    """Redis 失败计数，同步与异步客户端各自持有连接池。"""
+
+    def __init__(self, client: Any, async_client: Any) -> None:
+        """使用已构建的客户端初始化，测试可传入 fakeredis。
+
+        Args:
+            client (Any): `redis.Redis` 兼容的同步客户端。
+            async_client (Any): `redis.asyncio.Redis` 兼容的异步客户端。
+        """
+
+        self.client = client
+        self.async_client = async_client
+        self._record = client.register_script(_RECORD_FAILURE_SCRIPT)
+        self._record_async = async_client.register_script(_RECORD_FAILURE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisThrottleBackend:
+        """根据连接串创建同步与异步客户端。
+
+        Args:
+            url (str): Redis 连接串。
+
+        Returns:
+            RedisThrottleBackend: 后端实例。
+        """
+
+        import redis
+        import redis.asyncio
+
+        return cls(redis.Redis.from_url(url), redis.asyncio.Redis.from_url(url))
+
+    def retry_after(self, keys: list[str]) -> list[float]:
+        """以一次往返读取各键剩余的锁定秒数。"""
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.pttl(_lock_key(key))
+        return [max(0, ttl) / 1000 for ttl in pipe.execute()]
+
+    def record_failure(self, key: str, rule: ThrottleRule, policy: LockoutPolicy) -> float:
+        """原子记录一次失败，达到上限时加锁，返回锁定秒数。"""
+
+        return self._record(keys=_script_keys(key), args=_script_args(rule, policy)) / 1000
+
+    def reset(self, key: str) -> None:
+        """清空失败记录与累计锁定次数。"""
+
+        self.client.delete(_window_key(key), _strikes_key(key))
+
+    async def retry_after_async(self, keys: list[str]) -> list[float]:
+        """`retry_after` 的异步版本。"""
+
+        pipe = self.async_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.pttl(_lock_key(key))
+        return [max(0, ttl) / 1000 for ttl in await pipe.execute()]
+
+    async def record_failure_async(self, key: str, rule: ThrottleRule, policy: LockoutPolicy) -> float:
+        """`record_failure` 的异步版本。"""
+
+        return await self._record_async(keys=_script_keys(key), args=_script_args(rule, policy)) / 1000
+
+    async def reset_async(self, key: str) -> None:
+        """`reset` 的异步版本。"""
+
+        await self.async_client.delete(_window_key(key), _strikes_key(key))
+
+    def close(self) -> None:
+        """断开同步连接池；异步连接池绑定事件循环，需在循环内调用 `close_async` 断开。"""
+
+        self.client.close()
+
+    async def close_async(self) -> None:
+        """断开同步与异步连接池。"""
+
+        self.client.close()
+        await self.async_client.aclose()
+
+
+ThrottleBackend = MemoryThrottleBackend | RedisThrottleBackend
+
+
+class LoginThrottle:
+    """组合邮箱与 IP 两个维度的登录限流。"""
+
+    def __init__(self, backend: ThrottleBackend, rules: tuple[ThrottleRule, ...], policy: LockoutPolicy) -> None:
+        """初始化后端与规则。
+
+        Args:
+            backend (ThrottleBackend): 计数后端。
+            rules (tuple[ThrottleRule, ...]): 各维度规则，scope 为 `email` 或 `ip`。
+            policy (LockoutPolicy): 锁定策略。
+        """
+
+        self.backend = backend
+        self.rules = {rule.scope: rule for rule in rules if rule.enabled}
+        self.policy = policy
+
+    def check(self, email: str, client_ip: str | None) -> None:
+        """校验密码前调用，任一维度处于锁定期即抛出 `LoginThrottledError`。
+
+        Args:
+            email (str): 登录邮箱。
+            client_ip (str | None): 客户端 IP，未知时只按邮箱限流。
+        """
+
+        keys = self._keys(email, client_ip)
+        if keys:
+            self._raise_if_locked(keys, self.backend.retry_after([key for _, key in keys]))
+
+    def record_failure(self, email: str, client_ip: str | None) -> None:
+        """记录一次失败登录。
+
+        Args:
+            email (str): 登录邮箱。
+            client_ip (str | None): 客户端 IP。
+        """
+
+        LOGIN_FAILURES.inc()
+        for rule, key in self._keys(email, client_ip):
+            self._on_lockout(rule, self.backend.record_failure(key, rule, self.policy))
+
+    def record_success(self, email: str) -> None:
+        """登录成功后清空该邮箱的失败记录。
+
+        Args:
+            email (str): 登录邮箱。
+        """
+
+        if "email" in self.rules:
+            self.backend.reset(_key("email", email.lower()))
+
+    async def check_async(self, email: str, client_ip: str | None) -> None:
+        """`check` 的异步版本。"""
+
+        keys = self._keys(email, client_ip)
+        if keys:
+            self._raise_if_locked(keys, await self.backend.retry_after_async([key for _, key in keys]))
+
+    async def record_failure_async(self, email: str, client_ip: str | None) -> None:
+        """`record_failure` 的异步版本。"""
+
+        LOGIN_FAILURES.inc()
+        for rule, key in self._keys(email, client_ip):
+            self._on_lockout(rule, await self.backend.record_failure_async(key, rule, self.policy))
+
+    async def record_success_async(self, email: str) -> None:
+        """`record_success` 的异步版本。"""
+
+        if "email" in self.rules:
+            await self.backend.reset_async(_key("email", email.lower()))
+
+    def _keys(self, email: str, client_ip: str | None) -> list[tuple[ThrottleRule, str]]:
+        values = {"email": email.lower(), "ip": client_ip}
+        return [(rule, _key(scope, values[scope])) for scope, rule in self.rules.items() if values[scope]]
+
+    def _raise_if_locked(self, keys: list[tuple[ThrottleRule, str]], retry_after: list[float]) -> None:
+        for (rule, _), remaining in zip(keys, retry_after):
+            if remaining > 0:
+                LOGIN_THROTTLE_REJECTIONS.inc((rule.scope,))
+                raise LoginThrottledError(rule.scope, remaining)
+
+    def _on_lockout(self, rule: ThrottleRule, lockout: float) -> None:
+        if lockout > 0:
+            LOGIN_THROTTLE_LOCKOUTS.inc((rule.scope,))
+            LOGGER.warning("Login lockout", extra={"detail": f"{rule.scope} locked for {math.ceil(lockout)}s"})
+
+
+@lru_cache(maxsize=1)
+def get_login_throttle() -> LoginThrottle:
+    """返回按 Settings 创建的进程级登录限流器。
+
+    Returns:
+        LoginThrottle: `login_throttle_backend` 为 redis 时使用 `redis_url`，否则为进程内计数。
+    """
+
+    settings = get_settings()
+    if settings.login_throttle_backend == "redis":
+        backend: ThrottleBackend = RedisThrottleBackend.from_url(settings.redis_url)
+    else:
+        backend = MemoryThrottleBackend()
+    return LoginThrottle(
+        backend,
+        rules=(
+            ThrottleRule("email", settings.login_max_failures_per_email, settings.login_email_window_seconds),
+            ThrottleRule("ip", settings.login_max_failures_per_ip, settings.login_ip_window_seconds),
+        ),
+        policy=LockoutPolicy(
+            base_seconds=settings.login_lockout_seconds,
+            max_seconds=settings.login_lockout_max_seconds,
+            reset_seconds=settings.login_lockout_reset_seconds,
+        ),
+    )
+
+
+def reset_login_throttle() -> None:
+    """关闭存储并丢弃实例，下次使用时按配置重建。供关闭事件与测试调用。"""
+
+    if get_login_throttle.cache_info().currsize:
+        get_login_throttle().backend.close()
+    get_login_throttle.cache_clear()
+
+
+async def reset_login_throttle_async() -> None:
+    """`reset_login_throttle` 的异步版本，同时断开异步连接池，供应用关闭事件调用。"""
+
+    if get_login_throttle.cache_info().currsize:
+        await get_login_throttle().backend.close_async()
+    get_login_throttle.cache_clear()
+
+
+def _key(scope: str, value: str) -> str:
+    # 花括号为 Redis Cluster 哈希标签，保证同一主体的窗口、锁定与计数键落在同一槽位
+    return f"login_throttle:{{{scope}:{value}}}"
+
+
+def _window_key(key: str) -> str:
+    return f"{key}:window"
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def _strikes_key(key: str) -> str:
+    return f"{key}:strikes"
+
+
+def _script_keys(key: str) -> list[str]:
+    return [_window_key(key), _lock_key(key), _strikes_key(key)]
+
+
+def _script_args(rule: ThrottleRule, policy: LockoutPolicy) -> list[Any]:
+    return [
+        int(time.time() * 1000),
+        int(rule.window_seconds * 1000),
+        rule.max_failures,
+        int(policy.base_seconds * 1000),
+        int(policy.max_seconds * 1000),
+        int(policy.reset_seconds * 1000),
+        uuid.uuid4().hex,  # 同一毫秒内的多次失败需作为不同成员计数
+    ]
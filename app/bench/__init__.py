@@ -0,0 +1 @@
+"""性能基准工具集合，通过 `python -m app.bench.<name>` 运行。"""
@@ -0,0 +1,55 @@
+"""基准脚本共享的数据准备与统计工具。"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "BenchPass123"
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """按最近秩法计算百分位数。
+
+    Args:
+        samples (Sequence[float]): 样本，无需预先排序。
+        pct (float): 百分位，取值 0~100。
+
+    Returns:
+        float: 对应百分位的样本值，样本为空时返回 0。
+    """
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def use_temporary_database(directory: str | None = None) -> Path:
+    """将 DATABASE_URL 指向临时 SQLite 文件并建表。
+
+    基准默认不触碰开发数据库；如需压测 PostgreSQL，请直接设置 DATABASE_URL
+    并跳过该函数。
+
+    Args:
+        directory (str | None): 数据库文件目录，默认新建临时目录。
+
+    Returns:
+        Path: SQLite 文件路径。
+    """
+
+    from app.db.init_db import init_db
+    from app.db.session import reset_session_factory
+
+    db_file = Path(directory or tempfile.mkdtemp(prefix="bench-")) / "bench.sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    reset_session_factory()
+    init_db()
+    return db_file
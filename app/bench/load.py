@@ -0,0 +1,248 @@
+"""HTTP 压测工具：按场景驱动应用并统计每个路由的吞吐与延迟分位数。
+
+用法::
+
+    python -m app.bench.load --scenario me --requests 2000 --concurrency 32 --json run.json
+    python -m app.bench.load --base-url http://127.0.0.1:8000 --scenario login_storm
+    python -m app.bench.load --baseline baseline.json --threshold 0.2
+
+默认在进程内通过 httpx.ASGITransport 驱动 `create_app()`，使用临时 SQLite 数据库；
+指定 `--base-url` 时改为请求已启动的服务（如本地 uvicorn）。
+指定 `--baseline` 时与历史结果比较，RPS 下降或 p95/p99 上升超过阈值则以退出码 1 结束。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import uuid4
+
+import httpx
+
+from app.bench.common import BENCH_EMAIL, BENCH_PASSWORD, percentile, use_temporary_database
+
+API = "/api/v1"
+LOGIN = f"{API}/auth/login"
+REGISTER = f"{API}/auth/register"
+REFRESH = f"{API}/auth/refresh"
+ME = f"{API}/auth/me"
+
+
+class Recorder:
+    """按路由收集单次请求的延迟与错误数。"""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """发送请求并记录耗时，状态码 >= 400 计为错误。
+
+        Args:
+            method (str): HTTP 方法。
+            path (str): 请求路径。
+            **kwargs (Any): 透传给 httpx 的参数。
+
+        Returns:
+            httpx.Response: 响应对象。
+        """
+
+        started = time.perf_counter()
+        response = await self.client.request(method, path, **kwargs)
+        route = f"{method} {path}"
+        self.latencies[route].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+
+# 场景的单次迭代：(记录器, 共享上下文, worker 私有状态, 迭代序号)
+Step = Callable[[Recorder, dict[str, Any], dict[str, Any], int], Awaitable[None]]
+
+
+async def _login_storm(recorder: Recorder, context: dict[str, Any], state: dict[str, Any], index: int) -> None:
+    await recorder.request("POST", LOGIN, json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+
+
+async def _me(recorder: Recorder, context: dict[str, Any], state: dict[str, Any], index: int) -> None:
+    await recorder.request("GET", ME, headers={"Authorization": f"Bearer {context['access_token']}"})
+
+
+async def _mixed(recorder: Recorder, context: dict[str, Any], state: dict[str, Any], index: int) -> None:
+    """注册新用户与 refresh 交替进行；每个 worker 维护自己的 refresh token 链。"""
+
+    if index % 2 == 0:
+        email = f"bench-{uuid4().hex}@example.com"
+        await recorder.request("POST", REGISTER, json={"email": email, "password": BENCH_PASSWORD})
+        return
+
+    if "refresh_token" not in state:
+        response = await recorder.request("POST", LOGIN, json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        state["refresh_token"] = response.json()["refresh_token"]
+    response = await recorder.request("POST", REFRESH, json={"refresh_token": state["refresh_token"]})
+    if response.status_code == 200:
+        state["refresh_token"] = response.json()["refresh_token"]
+
+
+SCENARIOS: dict[str, Step] = {
+    "login_storm": _login_storm,
+    "me": _me,
+    "mixed": _mixed,
+}
+
+
+async def _prepare(client: httpx.AsyncClient) -> dict[str, Any]:
+    """确保基准用户存在并登录，返回场景共享的上下文。"""
+
+    await client.post(REGISTER, json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD, "full_name": "Bench"})
+    response = await client.post(LOGIN, json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return {"access_token": response.json()["access_token"]}
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient, step: Step, context: dict[str, Any], requests: int, concurrency: int
+) -> dict[str, Any]:
+    """以固定并发执行场景迭代，汇总整体与各路由统计。"""
+
+    recorder = Recorder(client)
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        state: dict[str, Any] = {}
+        for index in remaining:
+            await step(recorder, context, state, index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    routes = {
+        route: {
+            "count": len(samples),
+            "errors": recorder.errors[route],
+            "rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+        for route, samples in sorted(recorder.latencies.items())
+    }
+    total = sum(stats["count"] for stats in routes.values())
+    return {"seconds": elapsed, "rps": total / elapsed, "routes": routes}
+
+
+async def run(
+    scenarios: list[str], requests: int, concurrency: int, base_url: str | None = None
+) -> dict[str, Any]:
+    """依次执行场景并返回结果。
+
+    Args:
+        scenarios (list[str]): 场景名，见 `SCENARIOS`。
+        requests (int): 每个场景的迭代次数。
+        concurrency (int): 并发 worker 数。
+        base_url (str | None): 外部服务地址，缺省时在进程内驱动应用。
+
+    Returns:
+        dict[str, Any]: 包含运行参数与各场景统计的结果。
+    """
+
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=60)
+    else:
+        use_temporary_database()
+        from app.main import create_app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()), base_url="http://bench")
+
+    async with client:
+        context = await _prepare(client)
+        results = {
+            name: await _run_scenario(client, SCENARIOS[name], context, requests, concurrency) for name in scenarios
+        }
+    return {
+        "meta": {
+            "mode": "http" if base_url else "asgi",
+            "requests": requests,
+            "concurrency": concurrency,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """对比两次结果，返回超过阈值的退化项。
+
+    仅比较两边都存在的场景与路由：RPS 低于基线 `1 - threshold` 倍，
+    或 p95/p99 高于基线 `1 + threshold` 倍视为退化。
+
+    Args:
+        current (dict[str, Any]): 本次结果。
+        baseline (dict[str, Any]): 基线结果。
+        threshold (float): 允许的相对变化，如 0.2 表示 20%。
+
+    Returns:
+        list[str]: 退化描述，为空表示未退化。
+    """
+
+    regressions: list[str] = []
+    for scenario, result in current["scenarios"].items():
+        base_routes = baseline.get("scenarios", {}).get(scenario, {}).get("routes", {})
+        for route, stats in result["routes"].items():
+            base = base_routes.get(route)
+            if base is None:
+                continue
+            if stats["rps"] < base["rps"] * (1 - threshold):
+                regressions.append(f"{scenario} {route}: rps {base['rps']:.1f} -> {stats['rps']:.1f}")
+            for key in ("p95_ms", "p99_ms"):
+                if stats[key] > base[key] * (1 + threshold):
+                    regressions.append(f"{scenario} {route}: {key} {base[key]:.2f} -> {stats[key]:.2f}")
+    return regressions
+
+
+def main() -> None:
+    """CLI 入口：打印各路由统计，可选输出 JSON 并与基线比较。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="要执行的场景，可重复指定，默认全部"
+    )
+    parser.add_argument("--requests", type=int, default=500, help="每个场景的迭代次数")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发数")
+    parser.add_argument("--base-url", help="外部服务地址，如 http://127.0.0.1:8000")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="基线 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的相对退化比例")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.scenario or list(SCENARIOS), args.requests, args.concurrency, args.base_url))
+    print(f"{'scenario':<12} {'route':<28} {'count':>7} {'errors':>7} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for scenario, result in results["scenarios"].items():
+        for route, stats in result["routes"].items():
+            print(
+                f"{scenario:<12} {route:<28} {stats['count']:>7} {stats['errors']:>7} {stats['rps']:>9.1f} "
+                f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            regressions = compare(results, json.load(fp), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
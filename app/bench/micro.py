@@ -0,0 +1,196 @@
+"""请求热路径组件的微基准。
+
+用法::
+
+    python -m app.bench.micro --json micro.json
+    python -m app.bench.micro --filter token --baseline micro.json --threshold 0.1
+
+覆盖密码哈希/校验、登录限流拒绝、JWT 签发/解析（HS256 与 EdDSA）、JSON 日志格式化、错误响应构造与渲染、
+以及从 ORM 实体构建 `UserRead`。每项先用 `timeit.Timer.autorange` 预热并确定
+单轮调用次数（单轮 >= 0.2 秒），再重复多轮取中位数。
+指定 `--baseline` 时比较中位数耗时，超过阈值以退出码 1 结束。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+
+from app.apps.auth.models import User
+from app.apps.auth.schemas import UserRead
+from app.apps.auth.throttle import (
+    LockoutPolicy,
+    LoginThrottle,
+    LoginThrottledError,
+    MemoryThrottleBackend,
+    ThrottleRule,
+)
+from app.core.config import Settings
+from app.core.exception import _error_payload
+from app.core.keyring import generate_private_key_pem
+from app.core.logging import JsonLogFormatter
+from app.core.responses import FastJSONResponse
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    get_password_hash,
+    verify_password,
+)
+
+
+def _benchmarks() -> dict[str, Callable[[], object]]:
+    """构造各基准的无参调用，准备工作不计入耗时。"""
+
+    settings = Settings(_env_file=None, secret_key="bench-secret")
+    password_hash = get_password_hash("BenchPass123")
+    token = create_access_token(42, settings)
+    eddsa_settings = Settings(_env_file=None, jwt_signing_key=generate_private_key_pem("EdDSA"))
+    eddsa_token = create_access_token(42, eddsa_settings)
+    formatter = JsonLogFormatter()
+    record = logging.LogRecord("app.exceptions", logging.WARNING, __file__, 1, "HTTP exception", None, None)
+    record.status_code = 404
+    record.detail = "Not Found"
+    user = User(id=42, email="bench@example.com", full_name="Bench", is_active=True, password_hash=password_hash)
+    throttle = LoginThrottle(
+        MemoryThrottleBackend(),
+        rules=(ThrottleRule("email", 1, 300), ThrottleRule("ip", 50, 300)),
+        policy=LockoutPolicy(base_seconds=3600, max_seconds=3600, reset_seconds=3600),
+    )
+    throttle.record_failure("bench@example.com", "10.0.0.1")
+
+    def rejected_login() -> None:
+        try:
+            throttle.check("bench@example.com", "10.0.0.1")
+        except LoginThrottledError:
+            pass
+
+    return {
+        "security.get_password_hash": lambda: get_password_hash("BenchPass123"),
+        "security.verify_password": lambda: verify_password("BenchPass123", password_hash),
+        "security.create_access_token": lambda: create_access_token(42, settings),
+        "security.decode_token": lambda: decode_token(token, settings),
+        "security.create_access_token_eddsa": lambda: create_access_token(42, eddsa_settings),
+        "security.decode_token_eddsa": lambda: decode_token(eddsa_token, eddsa_settings),
+        "throttle.check_locked": rejected_login,
+        "logging.JsonLogFormatter.format": lambda: formatter.format(record),
+        "exception.error_response": lambda: FastJSONResponse(
+            status_code=404,
+            content=_error_payload(code="http_error", message="Not Found", details=None, trace_id="bench-trace"),
+        ),
+        "schemas.UserRead.model_validate": lambda: UserRead.model_validate(user, from_attributes=True),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 5) -> dict[str, float]:
+    """测量单个调用的耗时分布。
+
+    Args:
+        fn (Callable[[], object]): 被测函数。
+        repeat (int): 正式计时的轮数。
+
+    Returns:
+        dict[str, float]: 单次调用的中位数/最小/平均/标准差（微秒）与每秒次数。
+    """
+
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()  # 兼作预热
+    per_call = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    median = statistics.median(per_call)
+    return {
+        "number": number,
+        "median_us": median,
+        "min_us": min(per_call),
+        "mean_us": statistics.fmean(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "ops_per_sec": 1e6 / median,
+    }
+
+
+def run(name_filter: str | None = None, repeat: int = 5) -> dict[str, object]:
+    """执行全部（或过滤后的）基准。
+
+    Args:
+        name_filter (str | None): 只执行名称包含该子串的基准。
+        repeat (int): 每项基准的计时轮数。
+
+    Returns:
+        dict[str, object]: 包含运行环境与各基准统计的结果。
+    """
+
+    results = {
+        name: measure(fn, repeat)
+        for name, fn in _benchmarks().items()
+        if name_filter is None or name_filter in name
+    }
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "repeat": repeat},
+        "benchmarks": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """比较中位数耗时，返回超过阈值的退化项。
+
+    Args:
+        current (dict): 本次结果。
+        baseline (dict): 基线结果。
+        threshold (float): 允许的相对变慢比例，如 0.1 表示 10%。
+
+    Returns:
+        list[str]: 退化描述，为空表示未退化。
+    """
+
+    regressions = []
+    for name, stats in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base and stats["median_us"] > base["median_us"] * (1 + threshold):
+            regressions.append(f"{name}: {base['median_us']:.2f}us -> {stats['median_us']:.2f}us")
+    return regressions
+
+
+def main() -> None:
+    """CLI 入口：打印结果表，可选输出 JSON 并与基线比较。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", dest="name_filter", help="只执行名称包含该子串的基准")
+    parser.add_argument("--repeat", type=int, default=5, help="每项基准的计时轮数")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="基线 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=0.1, help="允许的相对变慢比例")
+    args = parser.parse_args()
+
+    results = run(args.name_filter, args.repeat)
+    baseline: dict = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+
+    print(f"{'benchmark':<36} {'median(us)':>12} {'stdev(us)':>10} {'ops/sec':>12} {'vs base':>8}")
+    for name, stats in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        ratio = f"{stats['median_us'] / base['median_us']:.2f}x" if base else "-"
+        print(
+            f"{name:<36} {stats['median_us']:>12.2f} {stats['stdev_us']:>10.2f} "
+            f"{stats['ops_per_sec']:>12.0f} {ratio:>8}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""TraceIdMiddleware 基准：对比 BaseHTTPMiddleware 旧实现与纯 ASGI 实现。
+
+用法::
+
+    python -m app.bench.middleware --requests 2000 --concurrency 32
+
+在进程内通过 httpx.ASGITransport 驱动应用，分别测量 /health 与 /auth/me 的
+吞吐（requests/sec）与 p50/p99 延迟。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp
+
+from app.bench.common import BENCH_EMAIL, BENCH_PASSWORD, percentile, use_temporary_database
+from app.core.logging import reset_trace_id, set_trace_id
+from app.core.middleware import TraceIdMiddleware
+
+
+class LegacyTraceIdMiddleware(BaseHTTPMiddleware):
+    """改造前基于 BaseHTTPMiddleware 的实现，仅作为基准对照。"""
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Trace-Id") -> None:
+        super().__init__(app)
+        self.header_name = header_name
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        trace_id = request.headers.get(self.header_name) or uuid4().hex
+        request.state.trace_id = trace_id
+        token = set_trace_id(trace_id)
+        try:
+            response = await call_next(request)
+        finally:
+            reset_trace_id(token)
+        response.headers[self.header_name] = trace_id
+        return response
+
+
+def _build_app(middleware_cls: type) -> FastAPI:
+    """创建应用并替换 trace_id 中间件实现。"""
+
+    from app.main import create_app
+
+    app = create_app()
+    app.user_middleware = [
+        Middleware(middleware_cls) if item.cls is TraceIdMiddleware else item for item in app.user_middleware
+    ]
+    return app
+
+
+async def _access_token(app: FastAPI) -> str:
+    """注册基准用户并登录，返回 access token。"""
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/api/v1/auth/register",
+            json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD, "full_name": "Bench"},
+        )
+        response = await client.post("/api/v1/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+async def _measure(
+    app: FastAPI, path: str, headers: dict[str, str], requests: int, concurrency: int
+) -> dict[str, float]:
+    """以固定并发发送请求并统计吞吐与延迟。"""
+
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path, headers=headers)  # 预热：构建中间件栈与连接池
+
+        async def worker() -> None:
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run(requests: int, concurrency: int) -> dict[str, dict[str, dict[str, float]]]:
+    """分别在新旧中间件下压测 /health 与 /auth/me。
+
+    Args:
+        requests (int): 每个场景的请求总数。
+        concurrency (int): 并发 worker 数。
+
+    Returns:
+        dict[str, dict[str, dict[str, float]]]: 按实现与路径组织的统计结果。
+    """
+
+    use_temporary_database()
+    variants = {"base_http": LegacyTraceIdMiddleware, "pure_asgi": TraceIdMiddleware}
+    token = await _access_token(_build_app(TraceIdMiddleware))
+    scenarios = {
+        "/api/v1/health": {},
+        "/api/v1/auth/me": {"Authorization": f"Bearer {token}"},
+    }
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name, middleware_cls in variants.items():
+        app = _build_app(middleware_cls)
+        results[name] = {
+            path: await _measure(app, path, headers, requests, concurrency) for path, headers in scenarios.items()
+        }
+    return results
+
+
+def main() -> None:
+    """CLI 入口：打印对比表，可选输出 JSON。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="每个场景的请求数")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发数")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.concurrency))
+    print(f"{'variant':<10} {'path':<18} {'rps':>10} {'p50(ms)':>10} {'p99(ms)':>10}")
+    for variant, paths in results.items():
+        for path, stats in paths.items():
+            print(f"{variant:<10} {path:<18} {stats['rps']:>10.1f} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
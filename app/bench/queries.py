@@ -0,0 +1,147 @@
+"""仓储热点查询的单次调用开销基准：每次构造语句（改造前）对比模块级固定语句（改造后）。
+
+用法::
+
+    python -m app.bench.queries --users 1000 --repeat 5
+    DATABASE_URL=postgresql+psycopg://... DB_PREPARE_THRESHOLD=0 python -m app.bench.queries --use-configured-db
+
+默认在临时 SQLite 上测量，结果主要反映 Python 侧语句构造与缓存键计算的开销；
+指定 `--use-configured-db` 时使用配置中的数据库，可分别以 `DB_PREPARE_THRESHOLD=-1`
+与 `DB_PREPARE_THRESHOLD=0` 运行，对比 psycopg 服务端预处理语句的收益。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Callable, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.apps.auth.models import Role, User, UserRole
+from app.apps.auth.repository import RoleRepository, UserRepository
+from app.bench.common import use_temporary_database
+from app.bench.micro import measure
+from app.db.routing import READ_REPLICA
+
+
+def _legacy_get_by_email(db: Session, email: str) -> User | None:
+    stmt = select(User).where(func.lower(User.email) == email.lower())
+    return db.execute(stmt, bind_arguments=READ_REPLICA).scalar_one_or_none()
+
+
+def _legacy_get_by_id(db: Session, user_id: int) -> User | None:
+    stmt = select(User).where(User.id == user_id)
+    return db.execute(stmt, bind_arguments=READ_REPLICA).scalar_one_or_none()
+
+
+def _legacy_list_roles(db: Session, user_id: int) -> Sequence[Role]:
+    stmt = select(Role).join(UserRole, Role.id == UserRole.role_id).where(UserRole.user_id == user_id)
+    return db.execute(stmt, bind_arguments=READ_REPLICA).scalars().all()
+
+
+def _legacy_get_principal(db: Session, user_id: int) -> object:
+    stmt = (
+        select(
+            User.id,
+            User.email,
+            User.full_name,
+            User.is_active,
+            func.aggregate_strings(Role.name, ",").label("role_names"),
+        )
+        .select_from(User)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .outerjoin(Role, Role.id == UserRole.role_id)
+        .where(User.id == user_id)
+        .group_by(User.id, User.email, User.full_name, User.is_active)
+    )
+    return db.execute(stmt, bind_arguments=READ_REPLICA).one_or_none()
+
+
+def _legacy_role_get_by_name(db: Session, name: str) -> Role | None:
+    stmt = select(Role).where(Role.name == name)
+    return db.execute(stmt, bind_arguments=READ_REPLICA).scalar_one_or_none()
+
+
+def _seed(db: Session, users: int) -> tuple[str, int]:
+    """写入基准用户与角色，返回用于查询的邮箱与用户 ID。"""
+
+    from scripts.seed_data import generate_synthetic_data
+
+    generate_synthetic_data(db, users=users, roles=10)
+    user = db.execute(select(User).order_by(User.id.desc()).limit(1)).scalar_one()
+    return user.email, user.id
+
+
+def _cases(db: Session, email: str, user_id: int) -> dict[str, tuple[Callable[[], object], Callable[[], object]]]:
+    """各查询的 (改造前, 改造后) 调用。"""
+
+    users = UserRepository()
+    roles = RoleRepository()
+    return {
+        "get_by_email": (lambda: _legacy_get_by_email(db, email), lambda: users.get_by_email(db, email)),
+        "get_by_id": (lambda: _legacy_get_by_id(db, user_id), lambda: users.get_by_id(db, user_id)),
+        "list_roles": (lambda: _legacy_list_roles(db, user_id), lambda: users.list_roles(db, user_id)),
+        "get_principal": (lambda: _legacy_get_principal(db, user_id), lambda: users.get_principal(db, user_id)),
+        "role_get_by_name": (lambda: _legacy_role_get_by_name(db, "admin"), lambda: roles.get_by_name(db, "admin")),
+    }
+
+
+def run(users: int = 1000, repeat: int = 5, use_configured_db: bool = False) -> dict[str, object]:
+    """准备数据并测量各查询改造前后的单次调用耗时。
+
+    Args:
+        users (int): 写入的合成用户数（仅临时数据库）。
+        repeat (int): 每项的计时轮数。
+        use_configured_db (bool): 使用配置中的数据库而非临时 SQLite。
+
+    Returns:
+        dict[str, object]: 各查询的 before/after 统计与加速比。
+    """
+
+    if not use_configured_db:
+        use_temporary_database()
+    from app.db.session import SessionLocal
+
+    results: dict[str, object] = {}
+    with SessionLocal() as db:
+        if use_configured_db:
+            user = db.execute(select(User).order_by(User.id).limit(1)).scalar_one()
+            email, user_id = user.email, user.id
+        else:
+            email, user_id = _seed(db, users)
+        for name, (before, after) in _cases(db, email, user_id).items():
+            stats_before = measure(before, repeat)
+            stats_after = measure(after, repeat)
+            results[name] = {
+                "before_us": stats_before["median_us"],
+                "after_us": stats_after["median_us"],
+                "speedup": stats_before["median_us"] / stats_after["median_us"],
+            }
+            db.expunge_all()  # 避免身份映射随迭代增长影响后续测量
+    return {"meta": {"users": users, "repeat": repeat}, "benchmarks": results}
+
+
+def main() -> None:
+    """CLI 入口：打印改造前后的单次调用耗时，可选输出 JSON。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="临时数据库中的合成用户数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项的计时轮数")
+    parser.add_argument("--use-configured-db", action="store_true", help="使用 DATABASE_URL 指向的已有数据")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run(args.users, args.repeat, args.use_configured_db)
+    print(f"{'query':<18} {'before(us)':>11} {'after(us)':>11} {'speedup':>8}")
+    for name, stats in results["benchmarks"].items():
+        print(f"{name:<18} {stats['before_us']:>11.1f} {stats['after_us']:>11.1f} {stats['speedup']:>7.2f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+"""可插拔缓存：进程内 LRU 与 Redis 两种后端，提供同步与异步两套 API。
+
+- `MemoryBackend`：TTL + LRU 的进程内缓存，直接保存对象引用（调用方应缓存不可变值）；
+- `RedisBackend`：基于 `redis_url` 构建同步/异步连接池，值经 pickle 序列化，
+  仅用于受信任的内网 Redis；
+- `Cache`：按命名空间隔离键并统计命中率，由 `get_cache(namespace)` 获取；
+- `cached`：缓存函数返回值的装饰器，同一进程内同一键的并发未命中只调用一次加载函数
+  （single-flight），避免缓存过期瞬间的击穿。
+
+ORM 实体与 Session 绑定，不应直接缓存；请缓存 `Principal` 这类不可变投影或基础类型。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator
+
+from app.core.config import get_settings
+
+MISSING: Any = object()  # 未命中标记，使缓存的 None 与未命中可区分
+
+
+class MemoryBackend:
+    """线程安全的 TTL + LRU 进程内缓存后端。"""
+
+    def __init__(self, max_size: int) -> None:
+        """初始化容量。
+
+        Args:
+            max_size (int): 最多保存的条目数，超出后淘汰最久未使用的条目。
+        """
+
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """读取条目，未命中或已过期返回 `MISSING`。"""
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """批量读取，只返回命中的条目。"""
+
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not MISSING:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, ttl: float | None) -> None:
+        """写入条目。
+
+        Args:
+            key (str): 完整键。
+            value (Any): 值。
+            ttl (float | None): 存活秒数，None 表示不过期。
+        """
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        """删除条目。"""
+
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    async def get_async(self, key: str) -> Any:
+        """`get` 的异步版本；内存操作不阻塞，直接调用同步实现。"""
+
+        return self.get(key)
+
+    async def get_many_async(self, keys: Iterable[str]) -> dict[str, Any]:
+        """`get_many` 的异步版本。"""
+
+        return self.get_many(keys)
+
+    async def set_async(self, key: str, value: Any, ttl: float | None) -> None:
+        """`set` 的异步版本。"""
+
+        self.set(key, value, ttl)
+
+    async def delete_async(self, *keys: str) -> None:
+        """`delete` 的异步版本。"""
+
+        self.delete(*keys)
+
+    def clear(self) -> None:
+        """清空全部条目，供测试使用。"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """内存后端无需释放资源。"""
+
+    async def close_async(self) -> None:
+        """`close` 的异步版本。"""
+
+
+class RedisBackend:
+    """Redis 缓存后端，同步与异步客户端各自持有连接池。"""
+
+    def __init__(self, client: Any, async_client: Any) -> None:
+        """使用已构建的客户端初始化，测试可传入 fakeredis。
+
+        Args:
+            client (Any): `redis.Redis` 兼容的同步客户端。
+            async_client (Any): `redis.asyncio.Redis` 兼容的异步客户端。
+        """
+
+        self.client = client
+        self.async_client = async_client
+
+    @classmethod
+    def from_url(cls, url: str, max_connections: int) -> RedisBackend:
+        """根据连接串创建同步与异步连接池。
+
+        Args:
+            url (str): Redis 连接串，如 `redis://localhost:6379/0`。
+            max_connections (int): 每个连接池的最大连接数。
+
+        Returns:
+            RedisBackend: 后端实例。
+        """
+
+        import redis
+        import redis.asyncio
+
+        return cls(
+            redis.Redis(connection_pool=redis.ConnectionPool.from_url(url, max_connections=max_connections)),
+            redis.asyncio.Redis(
+                connection_pool=redis.asyncio.ConnectionPool.from_url(url, max_connections=max_connections)
+            ),
+        )
+
+    def get(self, key: str) -> Any:
+        """读取条目，未命中返回 `MISSING`。"""
+
+        return _loads(self.client.get(key))
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """以单次 MGET 批量读取，只返回命中的条目。"""
+
+        keys = list(keys)
+        if not keys:
+            return {}
+        return _found(keys, self.client.mget(keys))
+
+    def set(self, key: str, value: Any, ttl: float | None) -> None:
+        """写入条目，TTL 以毫秒精度设置。"""
+
+        self.client.set(key, pickle.dumps(value), px=_ttl_ms(ttl))
+
+    def delete(self, *keys: str) -> None:
+        """删除条目。"""
+
+        if keys:
+            self.client.delete(*keys)
+
+    async def get_async(self, key: str) -> Any:
+        """`get` 的异步版本。"""
+
+        return _loads(await self.async_client.get(key))
+
+    async def get_many_async(self, keys: Iterable[str]) -> dict[str, Any]:
+        """`get_many` 的异步版本。"""
+
+        keys = list(keys)
+        if not keys:
+            return {}
+        return _found(keys, await self.async_client.mget(keys))
+
+    async def set_async(self, key: str, value: Any, ttl: float | None) -> None:
+        """`set` 的异步版本。"""
+
+        await self.async_client.set(key, pickle.dumps(value), px=_ttl_ms(ttl))
+
+    async def delete_async(self, *keys: str) -> None:
+        """`delete` 的异步版本。"""
+
+        if keys:
+            await self.async_client.delete(*keys)
+
+    def close(self) -> None:
+        """断开同步连接池；异步连接池绑定事件循环，需在循环内调用 `close_async` 断开。"""
+
+        self.client.close()
+
+    async def close_async(self) -> None:
+        """断开同步与异步连接池。"""
+
+        self.client.close()
+        await self.async_client.aclose()
+
+
+CacheBackend = MemoryBackend | RedisBackend
+
+
+class Cache:
+    """命名空间视图：为键加前缀、应用默认 TTL 并统计命中率。"""
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float | None) -> None:
+        """初始化命名空间。
+
+        Args:
+            backend (CacheBackend): 底层后端。
+            namespace (str): 命名空间，作为键前缀。
+            ttl (float | None): 默认存活秒数，None 表示不过期。
+        """
+
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+
+    def key(self, key: str) -> str:
+        """返回带命名空间前缀的完整键。"""
+
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取缓存值。
+
+        Args:
+            key (str): 命名空间内的键。
+            default (Any): 未命中时的返回值。
+
+        Returns:
+            Any: 缓存值或 `default`。
+        """
+
+        return self._count(self.backend.get(self.key(key)), default)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """批量读取，只返回命中的键（不含前缀）。"""
+
+        keys = list(keys)
+        found = self.backend.get_many([self.key(key) for key in keys])
+        result = {key: found[self.key(key)] for key in keys if self.key(key) in found}
+        self._record(hits=len(result), misses=len(keys) - len(result))
+        return result
+
+    def set(self, key: str, value: Any, ttl: float | None = MISSING) -> None:
+        """写入缓存值。
+
+        Args:
+            key (str): 命名空间内的键。
+            value (Any): 值。
+            ttl (float | None): 存活秒数，缺省使用命名空间默认值，None 表示不过期。
+        """
+
+        self.backend.set(self.key(key), value, self.ttl if ttl is MISSING else ttl)
+
+    def delete(self, *keys: str) -> None:
+        """删除缓存值。"""
+
+        self.backend.delete(*(self.key(key) for key in keys))
+
+    async def get_async(self, key: str, default: Any = None) -> Any:
+        """`get` 的异步版本。"""
+
+        return self._count(await self.backend.get_async(self.key(key)), default)
+
+    async def get_many_async(self, keys: Iterable[str]) -> dict[str, Any]:
+        """`get_many` 的异步版本。"""
+
+        keys = list(keys)
+        found = await self.backend.get_many_async([self.key(key) for key in keys])
+        result = {key: found[self.key(key)] for key in keys if self.key(key) in found}
+        self._record(hits=len(result), misses=len(keys) - len(result))
+        return result
+
+    async def set_async(self, key: str, value: Any, ttl: float | None = MISSING) -> None:
+        """`set` 的异步版本。"""
+
+        await self.backend.set_async(self.key(key), value, self.ttl if ttl is MISSING else ttl)
+
+    async def delete_async(self, *keys: str) -> None:
+        """`delete` 的异步版本。"""
+
+        await self.backend.delete_async(*(self.key(key) for key in keys))
+
+    def stats(self) -> dict[str, float | int]:
+        """返回命中、未命中与加载次数。
+
+        Returns:
+            dict[str, float | int]: 统计快照；`loads` 明显小于 `misses` 说明并发未命中被合并。
+        """
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "loads": self._loads,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def _count(self, value: Any, default: Any) -> Any:
+        if value is MISSING:
+            self._record(misses=1)
+            return default
+        self._record(hits=1)
+        return value
+
+    def _record(self, hits: int = 0, misses: int = 0, loads: int = 0) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._loads += loads
+
+
+class _KeyLocks:
+    """按键分配的互斥锁，无人持有时自动回收。"""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: dict[str, list[Any]] = {}
+        self._async_locks: dict[str, list[Any]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+    @asynccontextmanager
+    async def hold_async(self, key: str) -> AsyncIterator[None]:
+        entry = self._async_locks.setdefault(key, [asyncio.Lock(), 0])  # 仅在事件循环线程中访问
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._async_locks[key]
+
+
+def cached(
+    namespace: str,
+    *,
+    key: Callable[..., str],
+    ttl: float | None | Callable[[], float | None] = MISSING,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """缓存同步或异步函数的返回值（包括 None）。
+
+    同一进程内同一键的并发未命中由单个调用方执行加载，其余调用方等待后直接读取缓存。
+    被装饰函数额外提供 `invalidate(*args, **kwargs)`（异步函数为 `invalidate_async`）
+    用于写操作后主动失效。
+
+    Args:
+        namespace (str): 缓存命名空间。
+        key (Callable[..., str]): 以被装饰函数的参数生成键，如 `lambda self, db, user_id: str(user_id)`。
+        ttl (float | None | Callable[[], float | None]): 存活秒数，缺省使用命名空间默认值；
+            传入无参函数时在使用时求值，便于从 Settings 读取。由装饰器首次创建命名空间时
+            同时作为命名空间默认值。
+
+    Returns:
+        Callable[[Callable[..., Any]], Callable[..., Any]]: 装饰器。
+    """
+
+    locks = _KeyLocks()
+
+    def resolve_ttl() -> float | None:
+        return ttl() if callable(ttl) else ttl
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache = get_cache(namespace, resolve_ttl())
+                cache_key = key(*args, **kwargs)
+                value = await cache.get_async(cache_key, MISSING)
+                if value is not MISSING:
+                    return value
+                async with locks.hold_async(cache_key):
+                    value = await cache.backend.get_async(cache.key(cache_key))  # 等待期间可能已被加载
+                    if value is MISSING:
+                        cache._record(loads=1)
+                        value = await fn(*args, **kwargs)
+                        await cache.set_async(cache_key, value, resolve_ttl())
+                    return value
+
+            async def invalidate_async(*args: Any, **kwargs: Any) -> None:
+                await get_cache(namespace, resolve_ttl()).delete_async(key(*args, **kwargs))
+
+            async_wrapper.invalidate_async = invalidate_async  # type: ignore[attr-defined]
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache = get_cache(namespace, resolve_ttl())
+            cache_key = key(*args, **kwargs)
+            value = cache.get(cache_key, MISSING)
+            if value is not MISSING:
+                return value
+            with locks.hold(cache_key):
+                value = cache.backend.get(cache.key(cache_key))
+                if value is MISSING:
+                    cache._record(loads=1)
+                    value = fn(*args, **kwargs)
+                    cache.set(cache_key, value, resolve_ttl())
+                return value
+
+        def invalidate(*args: Any, **kwargs: Any) -> None:
+            get_cache(namespace, resolve_ttl()).delete(key(*args, **kwargs))
+
+        wrapper.invalidate = invalidate  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+_BACKEND: CacheBackend | None = None
+_CACHES: dict[str, Cache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache_backend() -> CacheBackend:
+    """返回按 Settings 创建的进程级缓存后端。
+
+    Returns:
+        CacheBackend: `cache_backend` 为 redis 时使用 `redis_url`，否则为进程内 LRU。
+    """
+
+    global _BACKEND
+    with _CACHES_LOCK:
+        if _BACKEND is None:
+            settings = get_settings()
+            if settings.cache_backend == "redis":
+                _BACKEND = RedisBackend.from_url(settings.redis_url, settings.cache_redis_max_connections)
+            else:
+                _BACKEND = MemoryBackend(settings.cache_max_size)
+        return _BACKEND
+
+
+def get_cache(namespace: str, ttl: float | None = MISSING) -> Cache:
+    """返回（必要时创建）命名空间缓存。
+
+    Args:
+        namespace (str): 命名空间。
+        ttl (float | None): 首次创建时的默认存活秒数，缺省取 `cache_default_ttl_seconds`。
+
+    Returns:
+        Cache: 命名空间缓存。
+    """
+
+    cache = _CACHES.get(namespace)
+    if cache is not None:
+        return cache
+    backend = get_cache_backend()
+    with _CACHES_LOCK:
+        if namespace not in _CACHES:
+            default_ttl = get_settings().cache_default_ttl_seconds if ttl is MISSING else ttl
+            _CACHES[namespace] = Cache(backend, namespace, default_ttl)
+        return _CACHES[namespace]
+
+
+def cache_stats() -> dict[str, dict[str, float | int]]:
+    """返回各命名空间的命中率统计。
+
+    Returns:
+        dict[str, dict[str, float | int]]: 按命名空间组织的统计。
+    """
+
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def reset_cache(backend: CacheBackend | None = None) -> None:
+    """关闭当前后端并清空命名空间，下次使用时按配置（或传入的后端）重建。
+
+    供测试与配置变更后调用。
+
+    Args:
+        backend (CacheBackend | None): 指定后端，如测试中的 fakeredis。
+    """
+
+    global _BACKEND
+    with _CACHES_LOCK:
+        if _BACKEND is not None and _BACKEND is not backend:
+            _BACKEND.close()
+        _BACKEND = backend
+        _CACHES.clear()
+
+
+async def reset_cache_async() -> None:
+    """`reset_cache` 的异步版本，同时断开异步连接池，供应用关闭事件调用。"""
+
+    global _BACKEND
+    with _CACHES_LOCK:
+        backend, _BACKEND = _BACKEND, None
+        _CACHES.clear()
+    if backend is not None:
+        await backend.close_async()
+
+
+def _loads(raw: bytes | None) -> Any:
+    return MISSING if raw is None else pickle.loads(raw)
+
+
+def _found(keys: list[str], raw_values: list[bytes | None]) -> dict[str, Any]:
+    return {key: pickle.loads(raw) for key, raw in zip(keys, raw_values) if raw is not None}
+
+
+def _ttl_ms(ttl: float | None) -> int | None:
+    return max(1, int(ttl * 1000)) if ttl is not None else None
@@ -2,39 +2,272 @@
 
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
+import ipaddress
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.apps.auth.repository import UserRepository
+from app.apps.auth.repository import AsyncUserRepository, UserRepository
 from app.apps.auth.models import User
+from app.apps.auth.principal import Principal
+from app.apps.auth.revocation import get_revocation_list
 from app.core.config import Settings, get_settings
 from app.core.security import decode_token
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
+def get_access_claims(
+    token: str = Depends(oauth2_scheme),
+    settings: Settings = Depends(get_settings),
+) -> dict[str, Any]:
+    """校验 Access Token 未过期、类型正确且未被吊销，返回其 payload。
+
+    吊销检查先经本进程布隆过滤器，未吊销的常见情况不产生网络 I/O。
+
+    Args:
+        token (str): OAuth2PasswordBearer 注入的 Bearer Token。
+        settings (Settings): 应用配置，提供 JWT 秘钥等信息。
+
+    Returns:
+        dict[str, Any]: token payload，校验失败抛出 401。
+    """
+
+    claims = _access_claims(token, settings)
+    if get_revocation_list().is_revoked(claims.get("jti")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return claims
+
+
+async def get_access_claims_async(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
     settings: Settings = Depends(get_settings),
+) -> dict[str, Any]:
+    """`get_access_claims` 的异步版本，供 `async def` 路由使用。
+
+    Args:
+        token (str): OAuth2PasswordBearer 注入的 Bearer Token。
+        settings (Settings): 应用配置，提供 JWT 秘钥等信息。
+
+    Returns:
+        dict[str, Any]: token payload，校验失败抛出 401。
+    """
+
+    claims = _access_claims(token, settings)
+    if await get_revocation_list().is_revoked_async(claims.get("jti")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return claims
+
+
+def get_current_principal(
+    claims: dict[str, Any] = Depends(get_access_claims),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """解析 Access Token 并注入当前认证主体。
+
+    主体缓存命中时不访问数据库，未命中时只执行一条投影查询；
+    不需要 ORM 实体的路由应优先使用该依赖。
+
+    Args:
+        claims (dict[str, Any]): 已校验的 Access Token payload。
+        db (Session): 数据库会话，用于查询用户。
+
+    Returns:
+        Principal: 验证通过的认证主体，如失败会抛出 HTTPException。
+    """
+
+    principal = UserRepository().get_principal(db, int(claims["sub"]))
+    return _ensure_active(principal)
+
+
+async def get_current_principal_async(
+    claims: dict[str, Any] = Depends(get_access_claims_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """`get_current_principal` 的异步版本，供 `async def` 路由使用。
+
+    Args:
+        claims (dict[str, Any]): 已校验的 Access Token payload。
+        db (AsyncSession): 异步数据库会话，用于查询用户。
+
+    Returns:
+        Principal: 验证通过的认证主体，如失败会抛出 HTTPException。
+    """
+
+    principal = await AsyncUserRepository().get_principal(db, int(claims["sub"]))
+    return _ensure_active(principal)
+
+
+def get_claims_principal(
+    claims: dict[str, Any] = Depends(get_access_claims),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """优先由 access token 的 rich claims 构造认证主体，不访问数据库。
+
+    主体信息的时效以 access token 有效期为界：角色变更与停用在下次刷新时生效，
+    注销的 token 由吊销名单拦截。不含主体声明的 token 回退到 `get_current_principal`。
+
+    Args:
+        claims (dict[str, Any]): 已校验且未吊销的 Access Token payload。
+        db (Session): 数据库会话，仅回退路径使用。
+
+    Returns:
+        Principal: 验证通过的认证主体，如失败会抛出 HTTPException。
+    """
+
+    principal = Principal.from_claims(claims)
+    if principal is not None:
+        return _ensure_active(principal)
+    return get_current_principal(claims, db)
+
+
+async def get_claims_principal_async(
+    claims: dict[str, Any] = Depends(get_access_claims_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """`get_claims_principal` 的异步版本，供 `async def` 路由使用。
+
+    Args:
+        claims (dict[str, Any]): 已校验且未吊销的 Access Token payload。
+        db (AsyncSession): 异步数据库会话，仅回退路径使用。
+
+    Returns:
+        Principal: 验证通过的认证主体，如失败会抛出 HTTPException。
+    """
+
+    principal = Principal.from_claims(claims)
+    if principal is not None:
+        return _ensure_active(principal)
+    return await get_current_principal_async(claims, db)
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
 ) -> User:
     """解析 Access Token 并注入当前用户。
 
     所有受保护的 API 通过该依赖验证身份，并加载用户实体供路由使用。
+    实体由认证主体构造后 merge 进当前 Session，不额外查询；
+    其余属性与角色关系在访问时按需懒加载。
 
     Args:
-        token (str): OAuth2PasswordBearer 注入的 Bearer Token。
-        db (Session): 数据库会话，用于查询用户。
-        settings (Settings): 应用配置，提供 JWT 秘钥等信息。
+        principal (Principal): 已验证的认证主体。
+        db (Session): 数据库会话，与路由共享同一个 Session。
+
+    Returns:
+        User: 验证通过的用户实体，如失败会抛出 HTTPException。
+    """
+
+    return db.merge(_user_from_principal(principal), load=False)
+
+
+async def get_current_user_async(
+    principal: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """`get_current_user` 的异步版本，供 `async def` 路由使用。
+
+    Args:
+        principal (Principal): 已验证的认证主体。
+        db (AsyncSession): 异步数据库会话，与路由共享同一个 Session。
 
     Returns:
         User: 验证通过的用户实体，如失败会抛出 HTTPException。
     """
 
-    repo = UserRepository()
+    return await db.merge(_user_from_principal(principal), load=False)
+
+
+def require_roles(*role_names: str) -> Callable[..., Awaitable[Principal]]:
+    """构造要求当前主体至少拥有其中一个角色的依赖。
+
+    rich claims token 直接按声明中的角色判断，不访问数据库。
+
+    Args:
+        *role_names (str): 允许访问的角色名。
+
+    Returns:
+        Callable[..., Awaitable[Principal]]: FastAPI 依赖，权限不足时抛出 403。
+    """
+
+    async def dependency(principal: Principal = Depends(get_claims_principal_async)) -> Principal:
+        if not principal.has_role(*role_names):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return principal
+
+    return dependency
+
+
+def get_client_ip(request: Request, settings: Settings = Depends(get_settings)) -> str | None:
+    """返回客户端 IP，用于按 IP 限流。
+
+    直连地址属于 `trusted_proxies` 时，从 `X-Forwarded-For` 右侧向左取第一个不可信地址，
+    即最外层可信代理所看到的客户端；否则直接使用连接地址，请求头无法伪造来源。
+
+    Args:
+        request (Request): 当前请求。
+        settings (Settings): 应用配置，提供可信代理列表（IP 或 CIDR）。
+
+    Returns:
+        str | None: 客户端 IP，无法确定时为 None。
+    """
+
+    peer = request.client.host if request.client else None
+    networks = _trusted_networks(tuple(settings.trusted_proxies))
+    if peer is None or not _is_trusted(peer, networks):
+        return peer
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    for address in reversed(forwarded):
+        if not _is_trusted(address, networks):
+            return address
+    return forwarded[0] if forwarded else peer
+
+
+def _ensure_active(principal: Principal | None) -> Principal:
+    """用户不存在或已停用时抛出 401。"""
+
+    if principal is None or not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return principal
+
+
+def _user_from_principal(principal: Principal) -> User:
+    """由认证主体构造 detached 状态的 User，供当前 Session merge。"""
+
+    user = User(
+        id=principal.id,
+        email=principal.email,
+        full_name=principal.full_name,
+        is_active=principal.is_active,
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+def _access_claims(token: str, settings: Settings) -> dict[str, Any]:
+    """校验 Access Token 的签名、类型与用户 ID。
+
+    Args:
+        token (str): Bearer Token 字符串。
+        settings (Settings): 应用配置，提供 JWT 秘钥等信息。
+
+    Returns:
+        dict[str, Any]: token payload，校验失败抛出 401。
+    """
+
     try:
         payload = decode_token(token, settings)
     except Exception as exc:  # noqa: BLE001 捕获 JWT 解码异常
@@ -44,12 +277,20 @@ def get_current_user(
     if token_type != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
-    user_id = payload.get("sub")
-    if user_id is None:
+    if payload.get("sub") is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-    user = repo.get_by_id(db, int(user_id))
-    if not user or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return payload
 
-    return user
+
+@lru_cache(maxsize=8)
+def _trusted_networks(proxies: tuple[str, ...]) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(address: str, networks: tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
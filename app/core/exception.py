@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 
+from app.apps.auth.throttle import LoginThrottledError
+from app.core.hashing import PasswordExecutorSaturatedError
 from app.core.logging import get_trace_id
+from app.core.responses import FastJSONResponse
 
 LOGGER = logging.getLogger("app.exceptions")
 
@@ -19,14 +22,16 @@ def register_exception_handlers(app: FastAPI) -> None:
 
     app.add_exception_handler(HTTPException, _http_exception_handler)
     app.add_exception_handler(RequestValidationError, _validation_exception_handler)
+    app.add_exception_handler(PasswordExecutorSaturatedError, _saturated_exception_handler)
+    app.add_exception_handler(LoginThrottledError, _throttled_exception_handler)
     app.add_exception_handler(Exception, _generic_exception_handler)
 
 
-async def _http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def _http_exception_handler(request: Request, exc: HTTPException) -> FastJSONResponse:
     LOGGER.warning("HTTP exception", extra={"status_code": exc.status_code, "detail": exc.detail})
     return _response_with_trace(
         request,
-        JSONResponse(
+        FastJSONResponse(
             status_code=exc.status_code,
             content=_error_payload(
                 code="http_error",
@@ -40,11 +45,11 @@ async def _http_exception_handler(request: Request, exc: HTTPException) -> JSONR
 
 async def _validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> FastJSONResponse:
     LOGGER.warning("Validation error", extra={"errors": exc.errors()})
     return _response_with_trace(
         request,
-        JSONResponse(
+        FastJSONResponse(
             status_code=422,
             content=_error_payload(
                 code="validation_error",
@@ -56,11 +61,47 @@ async def _validation_exception_handler(
     )
 
 
-async def _generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def _saturated_exception_handler(
+    request: Request, exc: PasswordExecutorSaturatedError
+) -> FastJSONResponse:
+    LOGGER.warning("Password executor saturated")
+    return _response_with_trace(
+        request,
+        FastJSONResponse(
+            status_code=503,
+            content=_error_payload(
+                code="service_busy",
+                message="服务繁忙，请稍后重试",
+                details=None,
+                trace_id=_request_trace_id(request),
+            ),
+            headers={"Retry-After": "1"},
+        ),
+    )
+
+
+async def _throttled_exception_handler(request: Request, exc: LoginThrottledError) -> FastJSONResponse:
+    LOGGER.warning("Login throttled", extra={"detail": exc.scope})
+    return _response_with_trace(
+        request,
+        FastJSONResponse(
+            status_code=429,
+            content=_error_payload(
+                code="too_many_attempts",
+                message="登录失败次数过多，请稍后重试",
+                details=None,
+                trace_id=_request_trace_id(request),
+            ),
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        ),
+    )
+
+
+async def _generic_exception_handler(request: Request, exc: Exception) -> FastJSONResponse:
     LOGGER.exception("Unhandled exception", exc_info=exc)
     return _response_with_trace(
         request,
-        JSONResponse(
+        FastJSONResponse(
             status_code=500,
             content=_error_payload(
                 code="internal_error",
@@ -86,7 +127,7 @@ def _error_payload(code: str, message: str, details: Any | None, trace_id: str |
     return payload
 
 
-def _response_with_trace(request: Request, response: JSONResponse) -> JSONResponse:
+def _response_with_trace(request: Request, response: FastJSONResponse) -> FastJSONResponse:
     """将 trace_id 写入响应头，便于链路追踪。"""
 
     trace_id = getattr(request.state, "trace_id", None) or get_trace_id()
@@ -0,0 +1,192 @@
+"""密码哈希专用执行器。
+
+bcrypt 的 hashpw/checkpw 会释放 GIL，因此使用独立的线程池即可获得真正的并行，
+同时与 AnyIO 默认线程池隔离：登录/注册洪峰只会占满本执行器，不会拖垮 /auth/me、
+/health 等廉价接口。执行器带有界队列，饱和时立即抛出 `PasswordExecutorSaturatedError`，
+由统一异常处理转换为 503。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordExecutorSaturatedError(RuntimeError):
+    """执行器工作线程与等待队列均已占满。"""
+
+
+class PasswordHashExecutor:
+    """有界的 bcrypt 执行器，提供同步与异步两套 API。
+
+    容量为 `max_workers + max_queue`：超过容量的提交会被立即拒绝，而不是排队等待，
+    以便在过载时快速失败。
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        """初始化线程池与统计计数。
+
+        Args:
+            max_workers (int): 并行执行 bcrypt 的线程数。
+            max_queue (int): 允许排队等待的最大任务数。
+        """
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        """提交任务，容量不足时立即拒绝。
+
+        Args:
+            fn (Callable[..., T]): 待执行的 CPU 密集函数。
+            *args (Any): 传给函数的位置参数。
+
+        Returns:
+            Future[T]: 任务结果的 Future。
+        """
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordExecutorSaturatedError("password hashing executor is saturated")
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+        try:
+            future = self._executor.submit(self._run, fn, enqueued_at, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def hash(self, password: str) -> str:
+        """在执行器中生成 bcrypt 哈希并阻塞等待结果。
+
+        Args:
+            password (str): 明文密码。
+
+        Returns:
+            str: bcrypt 哈希字符串。
+        """
+
+        return self.submit(get_password_hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """在执行器中校验密码并阻塞等待结果。
+
+        Args:
+            password (str): 用户输入的明文密码。
+            hashed_password (str): 数据库存储的哈希值。
+
+        Returns:
+            bool: True 表示匹配成功。
+        """
+
+        return self.submit(verify_password, password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        """`hash` 的异步版本，等待期间不占用事件循环。
+
+        Args:
+            password (str): 明文密码。
+
+        Returns:
+            str: bcrypt 哈希字符串。
+        """
+
+        return await asyncio.wrap_future(self.submit(get_password_hash, password))
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        """`verify` 的异步版本，等待期间不占用事件循环。
+
+        Args:
+            password (str): 用户输入的明文密码。
+            hashed_password (str): 数据库存储的哈希值。
+
+        Returns:
+            bool: True 表示匹配成功。
+        """
+
+        return await asyncio.wrap_future(self.submit(verify_password, password, hashed_password))
+
+    def stats(self) -> dict[str, float | int]:
+        """返回队列深度与等待耗时统计。
+
+        Returns:
+            dict[str, float | int]: 包含容量、排队数、拒绝数与等待时间（秒）的快照。
+        """
+
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds_avg": self._wait_total / started if started else 0.0,
+                "wait_seconds_max": self._wait_max,
+            }
+
+    def shutdown(self) -> None:
+        """等待已提交任务完成并关闭线程池。"""
+
+        self._executor.shutdown(wait=True)
+
+    def _run(self, fn: Callable[..., T], enqueued_at: float, *args: Any) -> T:
+        waited = time.perf_counter() - enqueued_at
+        with self._lock:
+            self._running += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+@lru_cache(maxsize=1)
+def get_password_executor() -> PasswordHashExecutor:
+    """返回进程级共享的密码哈希执行器，容量取自 Settings。
+
+    Returns:
+        PasswordHashExecutor: 缓存的执行器实例。
+    """
+
+    settings = get_settings()
+    return PasswordHashExecutor(
+        max_workers=settings.password_hash_workers,
+        max_queue=settings.password_hash_queue_size,
+    )
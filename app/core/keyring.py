@@ -0,0 +1,209 @@
+"""JWT 签名密钥环：EdDSA/ES256 非对称签名、多把验证公钥与 JWKS 导出。
+
+- 配置 `jwt_signing_key`（PEM 内容或文件路径）后，token 以该私钥签名并在头部写入 `kid`，
+  下游服务可从 `/.well-known/jwks.json` 获取公钥本地验签，无需共享秘钥或回调本服务；
+- 轮换时把新私钥设为 `jwt_signing_key`，旧密钥移入 `jwt_verification_keys`，
+  待旧 token 全部过期（refresh token 有效期）后再移除；
+- 未配置私钥时沿用 `secret_key` + HS256；配置私钥后默认拒绝不带 `kid` 的 HS256 token，
+  仅在显式开启 `jwt_accept_hs256`（且 `secret_key` 已替换默认值）时于切换期继续接受，切换完成后应关闭。
+
+`kid` 取公钥的 RFC 7638 指纹，无需额外配置。PEM 只在配置变化时解析一次，
+签名与验签直接使用缓存的密钥对象。
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from app.core.config import Settings
+
+HS256 = "HS256"
+# RFC 7638：计算指纹时按密钥类型只取必需成员
+_THUMBPRINT_MEMBERS = {"OKP": ("crv", "kty", "x"), "EC": ("crv", "kty", "x", "y")}
+
+
+@dataclass(frozen=True, slots=True)
+class JwtKey:
+    """解析后的非对称密钥，私钥仅签名密钥持有。"""
+
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any | None = None
+
+    def jwk(self) -> dict[str, str]:
+        """返回公钥的 JWK 表示。"""
+
+        algorithm = OKPAlgorithm if self.algorithm == "EdDSA" else ECAlgorithm
+        return {**algorithm.to_jwk(self.public_key, as_dict=True), "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+class KeyRing:
+    """签名密钥与全部验证密钥的集合。"""
+
+    def __init__(self, signing_key: JwtKey | None, verification_keys: Sequence[JwtKey], secret: str | None) -> None:
+        """初始化密钥环。
+
+        Args:
+            signing_key (JwtKey | None): 当前签名密钥，None 表示使用 HS256。
+            verification_keys (Sequence[JwtKey]): 仍接受的其他密钥（通常为轮换前的旧密钥）。
+            secret (str | None): HS256 秘钥，None 表示不接受 HS256 token。
+        """
+
+        self.signing_key = signing_key
+        self.secret = secret
+        self._keys = {key.kid: key for key in ([signing_key] if signing_key else []) + list(verification_keys)}
+
+    @property
+    def algorithm(self) -> str:
+        """当前签名算法。"""
+
+        return self.signing_key.algorithm if self.signing_key else HS256
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        """签名 payload。
+
+        Args:
+            payload (dict[str, Any]): JWT 声明。
+
+        Returns:
+            str: 编码后的 JWT，非对称签名时头部带 `kid`。
+        """
+
+        if self.signing_key is None:
+            return jwt.encode(payload, self.secret, algorithm=HS256)
+        return jwt.encode(
+            payload,
+            self.signing_key.private_key,
+            algorithm=self.signing_key.algorithm,
+            headers={"kid": self.signing_key.kid},
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """按头部 `kid` 选择密钥验签并解码，每把密钥只接受其自身算法。
+
+        Args:
+            token (str): 待验证的 JWT。
+
+        Returns:
+            dict[str, Any]: 解码后的 payload。
+
+        Raises:
+            jwt.InvalidTokenError: 签名无效、已过期或 `kid` 未知。
+        """
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.secret is None:
+                raise jwt.InvalidTokenError("Token without kid")
+            return jwt.decode(token, self.secret, algorithms=[HS256])
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown kid")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> dict[str, list[dict[str, str]]]:
+        """返回全部验证公钥的 JWKS，HS256 模式下为空集合。"""
+
+        return {"keys": [key.jwk() for key in self._keys.values()]}
+
+
+def load_key(source: str) -> JwtKey:
+    """从 PEM 内容或文件路径加载 Ed25519 / P-256 私钥或公钥。
+
+    Args:
+        source (str): PEM 文本，或指向 PEM 文件的路径。
+
+    Returns:
+        JwtKey: 解析后的密钥，私钥同时提供公钥。
+
+    Raises:
+        ValueError: 密钥类型不受支持。
+    """
+
+    data = (source if source.lstrip().startswith("-----BEGIN") else Path(source).read_text()).encode("utf-8")
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        algorithm = "EdDSA"
+    elif isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(public_key.curve, ec.SECP256R1):
+        algorithm = "ES256"
+    else:
+        raise ValueError("仅支持 Ed25519（EdDSA）与 P-256（ES256）密钥")
+    return JwtKey(kid=_thumbprint(public_key, algorithm), algorithm=algorithm, public_key=public_key, private_key=private_key)
+
+
+def generate_private_key_pem(algorithm: str = "EdDSA") -> str:
+    """生成新的签名私钥，供密钥轮换使用。
+
+    Args:
+        algorithm (str): `EdDSA` 或 `ES256`。
+
+    Returns:
+        str: PKCS#8 PEM 格式的私钥。
+    """
+
+    if algorithm == "EdDSA":
+        private_key: Any = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(f"不支持的算法: {algorithm}")
+    return private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode("utf-8")
+
+
+def get_keyring(settings: Settings) -> KeyRing:
+    """返回与当前配置对应的密钥环，配置不变时复用已解析的密钥对象。
+
+    Args:
+        settings (Settings): 应用配置。
+
+    Returns:
+        KeyRing: 密钥环。
+    """
+
+    return _build_keyring(
+        settings.secret_key,
+        settings.jwt_signing_key,
+        tuple(settings.jwt_verification_keys),
+        settings.jwt_accept_hs256,
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_keyring(
+    secret_key: str, signing_key: str | None, verification_keys: tuple[str, ...], accept_hs256: bool
+) -> KeyRing:
+    if signing_key is None:
+        return KeyRing(None, [load_key(source) for source in verification_keys], secret_key)
+    return KeyRing(
+        load_key(signing_key),
+        [load_key(source) for source in verification_keys],
+        secret_key if accept_hs256 else None,
+    )
+
+
+def _thumbprint(public_key: Any, algorithm: str) -> str:
+    jwk = (OKPAlgorithm if algorithm == "EdDSA" else ECAlgorithm).to_jwk(public_key, as_dict=True)
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
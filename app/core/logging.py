@@ -2,56 +2,332 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import queue
+import sys
+import threading
+import time
+from collections.abc import Iterable
 from logging.config import dictConfig
-from datetime import datetime, timezone
+from logging.handlers import QueueHandler, RotatingFileHandler
 from contextvars import ContextVar, Token
-from typing import Any
+from typing import Any, TextIO
 
 from app.core.config import Settings
 
+try:  # orjson 为可选依赖，安装后自动启用
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
 TRACE_ID_CTX: ContextVar[str | None] = ContextVar("trace_id", default=None)
 
+# 队列结束标记，listener 读到后刷盘并退出
+_STOP = object()
+# 当前运行中的后台 listener，重复 configure_logging 时先停止旧实例
+_LISTENER: "BatchingLogListener | None" = None
+
 
 class JsonLogFormatter(logging.Formatter):
-    """输出 JSON 结构化日志，自动携带 trace_id。"""
+    """输出 JSON 结构化日志，自动携带 trace_id 与白名单内的 `extra` 字段。
+
+    时间戳取自 `record.created`，并按秒缓存格式化前缀；安装 orjson 时使用其编码。
+    """
+
+    # 允许透传到日志 JSON 的 `extra=` 字段
+    EXTRA_FIELDS: tuple[str, ...] = (
+        "status_code",
+        "detail",
+        "errors",
+        "path",
+        "method",
+        "duration_ms",
+        "user_id",
+        "engine",
+    )
+
+    def __init__(self, extra_fields: Iterable[str] | None = None) -> None:
+        """初始化格式化器。
+
+        Args:
+            extra_fields (Iterable[str] | None): 覆盖默认的 extra 字段白名单。
+        """
+
+        super().__init__()
+        self.extra_fields = tuple(extra_fields) if extra_fields is not None else self.EXTRA_FIELDS
+        # (整秒, 前缀) 作为整体替换，多线程下不会读到错配的组合
+        self._second_prefix: tuple[int, str] = (-1, "")
 
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401 - 简洁描述
         payload: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        trace_id = TRACE_ID_CTX.get()
+        # 队列模式下 trace_id 已在 emit 时写入 record，格式化发生在后台线程
+        trace_id = record.trace_id if hasattr(record, "trace_id") else TRACE_ID_CTX.get()
         if trace_id:
             payload["trace_id"] = trace_id
+        attributes = record.__dict__
+        for name in self.extra_fields:
+            if name in attributes:
+                payload[name] = attributes[name]
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return _dumps(payload)
+
+    def _timestamp(self, created: float) -> str:
+        """将 epoch 秒转换为 UTC ISO8601 字符串，同一秒内复用前缀。"""
+
+        second = int(created)
+        cached_second, prefix = self._second_prefix
+        if cached_second != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_prefix = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}+00:00"
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    """序列化日志 payload，无法直接编码的值回退为 str。"""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=str).decode("utf-8")
+        except TypeError:  # 如超出 64 位的整数，交给标准库处理
+            pass
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TraceQueueHandler(QueueHandler):
+    """请求线程上的轻量 handler：只捕获上下文并入队，不做 JSON 编码与 IO。
+
+    队列有界，满时按策略丢弃（计数）或阻塞等待 listener 消费；阻塞最多 `block_timeout` 秒，
+    超时后同样丢弃并计数，listener 异常停止时不会卡住所有写日志的线程。
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_when_full: bool = False, block_timeout: float = 1.0) -> None:
+        super().__init__(log_queue)
+        self.block_when_full = block_when_full
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """在 emit 时固化消息、异常文本与 trace_id，使记录可跨线程格式化。"""
+
+        prepared = copy.copy(record)
+        prepared.message = record.getMessage()
+        prepared.msg = prepared.message
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared.exc_info = None
+        prepared.trace_id = TRACE_ID_CTX.get()
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.block_when_full:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _StreamSink:
+    """将批量文本写入流（默认 stdout）。"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class _RotatingFileSink:
+    """按大小轮转的文件输出，复用 RotatingFileHandler 的轮转逻辑。
+
+    以批次为单位判断是否轮转，单个批次不会被拆到两个文件。
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        self.max_bytes = max_bytes
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    def write(self, text: str) -> None:
+        stream = self.handler.stream
+        if self.max_bytes > 0 and stream.tell() and stream.tell() + len(text.encode("utf-8")) > self.max_bytes:
+            self.handler.doRollover()
+            stream = self.handler.stream
+        stream.write(text)
+        stream.flush()
+
+    def close(self) -> None:
+        self.handler.close()
+
+
+class BatchingLogListener:
+    """后台线程消费日志队列，批量格式化并写出。
+
+    写出失败（如磁盘已满）的批次计入 `write_errors` 后丢弃，线程继续消费。
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        formatter: logging.Formatter,
+        sink: _StreamSink | _RotatingFileSink,
+        batch_size: int = 100,
+    ) -> None:
+        self.queue = log_queue
+        self.formatter = formatter
+        self.sink = sink
+        self.batch_size = batch_size
+        self.write_errors = 0
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+
+    def start(self) -> None:
+        """启动后台线程。"""
+
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """投递结束标记并等待队列中剩余记录全部写出。
+
+        Args:
+            timeout (float): 等待后台线程退出的最长秒数。
+        """
+
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+        self.sink.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: list[str] = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                try:
+                    lines.append(self.formatter.format(item) + "\n")
+                except Exception:  # noqa: BLE001 单条格式化失败不影响其余记录
+                    continue
+            if not lines:
+                continue
+            try:
+                self.sink.write("".join(lines))
+            except Exception:  # noqa: BLE001 输出异常时丢弃本批，保持线程存活
+                self.write_errors += 1
+
+
+def _create_queue_handler(settings: Settings) -> TraceQueueHandler:
+    """dictConfig 工厂：创建队列 handler 并启动后台 listener。"""
+
+    global _LISTENER
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    if settings.log_file:
+        sink: _StreamSink | _RotatingFileSink = _RotatingFileSink(
+            settings.log_file, settings.log_file_max_bytes, settings.log_file_backup_count
+        )
+    else:
+        sink = _StreamSink(sys.stdout)
+    _LISTENER = BatchingLogListener(log_queue, JsonLogFormatter(), sink, batch_size=settings.log_queue_batch_size)
+    _LISTENER.start()
+    return TraceQueueHandler(
+        log_queue,
+        block_when_full=settings.log_queue_full_policy == "block",
+        block_timeout=settings.log_queue_block_timeout_seconds,
+    )
 
 
 def configure_logging(settings: Settings | None = None) -> None:
-    """配置全局日志格式与级别。"""
+    """配置全局日志格式与级别。
 
+    默认在调用线程同步输出；`log_queue_enabled` 开启后改为队列模式，
+    请求线程只负责入队，由后台 listener 批量格式化写出到 stdout 或轮转文件。
+    """
+
+    shutdown_logging()
     level = (settings.log_level if settings else "INFO").upper()
+    handler: dict[str, Any] = {"class": "logging.StreamHandler", "formatter": "json"}
+    if settings and settings.log_queue_enabled:
+        handler = {"()": _create_queue_handler, "settings": settings}
+    elif settings and settings.log_file:
+        handler = {
+            "class": "logging.handlers.RotatingFileHandler",
+            "formatter": "json",
+            "filename": settings.log_file,
+            "maxBytes": settings.log_file_max_bytes,
+            "backupCount": settings.log_file_backup_count,
+            "encoding": "utf-8",
+        }
     dictConfig(
         {
             "version": 1,
             "disable_existing_loggers": False,
             "formatters": {"json": {"()": JsonLogFormatter}},
-            "handlers": {
-                "default": {
-                    "class": "logging.StreamHandler",
-                    "formatter": "json",
-                }
-            },
+            "handlers": {"default": handler},
             "root": {"level": level, "handlers": ["default"]},
         }
     )
 
 
+def shutdown_logging() -> None:
+    """停止队列模式的后台 listener，确保缓冲中的日志全部写出。
+
+    进程退出（atexit）与应用 shutdown 时都会调用，可重复调用。
+    """
+
+    global _LISTENER
+
+    listener, _LISTENER = _LISTENER, None
+    if listener is None:
+        return
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, TraceQueueHandler):
+            logging.getLogger().removeHandler(handler)
+    listener.stop()
+
+
+def logging_queue_stats() -> dict[str, int]:
+    """返回队列模式的积压、丢弃与写出失败计数，未启用时全部为 0。
+
+    Returns:
+        dict[str, int]: 包含 queued、dropped、write_errors 的统计。
+    """
+
+    write_errors = _LISTENER.write_errors if _LISTENER is not None else 0
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, TraceQueueHandler):
+            return {"queued": handler.queue.qsize(), "dropped": handler.dropped, "write_errors": write_errors}
+    return {"queued": 0, "dropped": 0, "write_errors": 0}
+
+
+atexit.register(shutdown_logging)
+
+
 def set_trace_id(trace_id: str | None) -> Token:
     """设置当前上下文 trace_id，并返回 token 用于恢复。"""
 
@@ -0,0 +1,553 @@
+"""进程内指标注册表与 Prometheus 文本导出。
+
+- `Counter` / `Histogram`：每个指标一把互斥锁，临界区只有一次字典查找与加法，
+  不跨 await，线程与协程中均可安全调用；
+- `CallbackMetric`：抓取时读取连接池、密码哈希执行器等已有统计，热路径零开销；
+- 多进程（多个 uvicorn worker）：配置 `METRICS_MULTIPROC_DIR` 后，各进程定期把快照写入
+  该目录下的 `metrics-<pid>.json`，`/metrics` 抓取时合并全部快照。计数器与直方图按标签求和，
+  仪表盘加 `pid` 标签逐进程输出且忽略已退出进程。目录应在服务启动前清空。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+from app.core.cache import cache_stats
+from app.core.hashing import get_password_executor
+from app.db.pool import pool_stats
+
+LOGGER = logging.getLogger("app.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+
+LabelValues = tuple[str, ...]
+MetricType = Literal["counter", "gauge", "histogram"]
+
+
+class Counter:
+    """单调递增计数器。"""
+
+    type: MetricType = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        """增加计数。
+
+        Args:
+            labels (LabelValues): 与 `labelnames` 一一对应的标签值。
+            amount (float): 增量。
+        """
+
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> list[list[Any]]:
+        """返回 `[标签值列表, 数值]` 样本。"""
+
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def clear(self) -> None:
+        """清空全部样本，供测试使用。"""
+
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """固定分桶直方图，桶计数按非累积方式存储，导出时再累加。"""
+
+    type: MetricType = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 每个标签组合: [桶 0 计数, ..., 桶 n-1 计数, +Inf 桶计数, 总和]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        """记录一次观测值。
+
+        Args:
+            value (float): 观测值，如请求耗时（秒）。
+            labels (LabelValues): 与 `labelnames` 一一对应的标签值。
+        """
+
+        index = bisect_left(self.buckets, value)  # 第一个满足 value <= 上界的桶
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> list[list[Any]]:
+        """返回 `[标签值列表, {"counts": 各桶计数, "sum": 总和}]` 样本。"""
+
+        with self._lock:
+            return [
+                [list(labels), {"counts": series[:-1], "sum": series[-1]}] for labels, series in self._values.items()
+            ]
+
+    def clear(self) -> None:
+        """清空全部样本，供测试使用。"""
+
+        with self._lock:
+            self._values.clear()
+
+
+class CallbackMetric:
+    """抓取时通过回调读取的指标，用于导出已有组件的统计。"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[tuple[LabelValues, float]]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def collect(self) -> list[list[Any]]:
+        """调用回调生成样本，回调异常只记录日志。"""
+
+        try:
+            return [[list(labels), float(value)] for labels, value in self.callback()]
+        except Exception:  # noqa: BLE001 - 指标采集失败不应影响抓取
+            LOGGER.exception("Metric callback failed", extra={"detail": self.name})
+            return []
+
+    def clear(self) -> None:
+        """回调指标没有自身状态。"""
+
+
+Metric = Counter | Histogram | CallbackMetric
+
+
+class MetricsRegistry:
+    """按名称管理指标并生成快照。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """注册（或取回同名）计数器。"""
+
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """注册（或取回同名）直方图。"""
+
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[tuple[LabelValues, float]]],
+    ) -> CallbackMetric:
+        """注册（或取回同名）回调指标。"""
+
+        return self._register(CallbackMetric(name, documentation, type, labelnames, callback))
+
+    def snapshot(self) -> dict[str, Any]:
+        """采集当前进程全部指标。
+
+        Returns:
+            dict[str, Any]: 可 JSON 序列化的快照，含进程号与各指标样本。
+        """
+
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot: dict[str, Any] = {"pid": os.getpid(), "metrics": {}}
+        for metric in metrics:
+            entry: dict[str, Any] = {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "samples": metric.collect(),
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            snapshot["metrics"][metric.name] = entry
+        return snapshot
+
+    def clear(self) -> None:
+        """清空全部指标的样本（保留定义），供测试使用。"""
+
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"metric {metric.name} already registered as {existing.type}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+def merge_snapshots(snapshots: Sequence[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """合并多个进程的快照。
+
+    计数器与直方图按标签求和；多进程时仪表盘追加 `pid` 标签逐进程保留。
+
+    Args:
+        snapshots (Sequence[dict[str, Any]]): `MetricsRegistry.snapshot` 的结果列表。
+
+    Returns:
+        dict[str, dict[str, Any]]: 按指标名组织的合并结果，样本以标签元组为键。
+    """
+
+    merged: dict[str, dict[str, Any]] = {}
+    per_process_gauges = len(snapshots) > 1
+    for snapshot in snapshots:
+        for name, entry in snapshot["metrics"].items():
+            target = merged.get(name)
+            if target is None:
+                labelnames = list(entry["labelnames"])
+                if entry["type"] == "gauge" and per_process_gauges:
+                    labelnames.append("pid")
+                target = merged[name] = {**entry, "labelnames": labelnames, "samples": {}}
+            samples = target["samples"]
+            for labels, value in entry["samples"]:
+                key = tuple(labels)
+                if entry["type"] == "gauge":
+                    samples[key + (str(snapshot["pid"]),) if per_process_gauges else key] = value
+                elif entry["type"] == "histogram":
+                    current = samples.get(key)
+                    if current is None:
+                        samples[key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+                    else:
+                        current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                        current["sum"] += value["sum"]
+                else:
+                    samples[key] = samples.get(key, 0.0) + value
+    return merged
+
+
+def render_text(snapshots: Sequence[dict[str, Any]]) -> str:
+    """合并快照并输出 Prometheus 文本格式（0.0.4）。
+
+    Args:
+        snapshots (Sequence[dict[str, Any]]): 一个或多个进程的快照。
+
+    Returns:
+        str: 指标文本。
+    """
+
+    lines: list[str] = []
+    for name, entry in sorted(merge_snapshots(snapshots).items()):
+        lines.append(f"# HELP {name} {_escape_help(entry['help'])}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        labelnames = entry["labelnames"]
+        for labels, value in sorted(entry["samples"].items()):
+            pairs = list(zip(labelnames, labels))
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*entry["buckets"], "+Inf"], value["counts"]):
+                cumulative += count
+                le = bound if isinstance(bound, str) else _format_value(float(bound))
+                lines.append(f"{name}_bucket{_format_labels([*pairs, ('le', le)])} {_format_value(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_format_labels(pairs)} {_format_value(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(registry: MetricsRegistry, directory: str | Path) -> Path:
+    """把当前进程快照原子写入 `<directory>/metrics-<pid>.json`。
+
+    Args:
+        registry (MetricsRegistry): 指标注册表。
+        directory (str | Path): 多进程共享目录。
+
+    Returns:
+        Path: 快照文件路径。
+    """
+
+    snapshot = registry.snapshot()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"metrics-{snapshot['pid']}.json"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshots(directory: str | Path) -> list[dict[str, Any]]:
+    """读取目录下全部进程快照，已退出进程的仪表盘样本被丢弃。
+
+    Args:
+        directory (str | Path): 多进程共享目录。
+
+    Returns:
+        list[dict[str, Any]]: 快照列表。
+    """
+
+    snapshots = []
+    for path in sorted(Path(directory).glob("metrics-*.json")):
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            LOGGER.warning("Skipping unreadable metrics snapshot", extra={"path": str(path)})
+            continue
+        if not _pid_alive(snapshot["pid"]):
+            # 计数器保留以保证单调；仪表盘反映的是已不存在的进程状态
+            snapshot["metrics"] = {
+                name: entry for name, entry in snapshot["metrics"].items() if entry["type"] != "gauge"
+            }
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def render_latest(registry: MetricsRegistry | None = None, directory: str | Path | None = None) -> str:
+    """生成 `/metrics` 的响应文本。
+
+    未配置共享目录时只导出当前进程；否则先写出当前进程的最新快照，再合并目录下全部快照。
+
+    Args:
+        registry (MetricsRegistry | None): 指标注册表，默认全局 `REGISTRY`。
+        directory (str | Path | None): 多进程共享目录。
+
+    Returns:
+        str: Prometheus 文本。
+    """
+
+    registry = registry or REGISTRY
+    if directory is None:
+        return render_text([registry.snapshot()])
+    write_snapshot(registry, directory)
+    return render_text(read_snapshots(directory))
+
+
+class SnapshotWriter:
+    """后台线程，按固定间隔把当前进程快照写入共享目录。"""
+
+    def __init__(self, registry: MetricsRegistry, directory: str | Path, interval: float) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+
+    def start(self) -> None:
+        """启动写入线程。"""
+
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止线程并写出最后一次快照。"""
+
+        self._stopped.set()
+        self._thread.join()
+        self._write()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_snapshot(self.registry, self.directory)
+        except OSError:
+            LOGGER.exception("Failed to write metrics snapshot", extra={"path": str(self.directory)})
+
+
+_WRITER: SnapshotWriter | None = None
+
+
+def start_snapshot_writer(directory: str | Path | None, interval: float) -> None:
+    """配置了共享目录时启动快照写入线程，重复调用会替换旧线程。
+
+    Args:
+        directory (str | Path | None): 多进程共享目录，None 表示单进程模式。
+        interval (float): 写入间隔（秒）。
+    """
+
+    global _WRITER
+    stop_snapshot_writer()
+    if directory is None:
+        return
+    _WRITER = SnapshotWriter(REGISTRY, directory, interval)
+    _WRITER.start()
+
+
+def stop_snapshot_writer() -> None:
+    """停止快照写入线程（若存在）。"""
+
+    global _WRITER
+    if _WRITER is not None:
+        _WRITER.stop()
+        _WRITER = None
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float) -> None:
+    """记录一次 HTTP 请求，由 `MetricsMiddleware` 调用。
+
+    Args:
+        method (str): HTTP 方法。
+        route (str): 路由模板，如 `/api/v1/users/{user_id}`；未匹配时为 `unmatched`。
+        status_code (int): 响应状态码。
+        seconds (float): 处理耗时（秒）。
+    """
+
+    HTTP_REQUESTS.inc((method, route, str(status_code)))
+    HTTP_REQUEST_DURATION.observe(seconds, (method, route))
+
+
+def _pool_samples(key: str) -> Callable[[], Iterable[tuple[LabelValues, float]]]:
+    def collect() -> Iterable[tuple[LabelValues, float]]:
+        for name, stats in pool_stats().items():
+            if stats.get(key) is not None:
+                yield (name,), stats[key]
+
+    return collect
+
+
+def _executor_samples(key: str) -> Callable[[], Iterable[tuple[LabelValues, float]]]:
+    def collect() -> Iterable[tuple[LabelValues, float]]:
+        if get_password_executor.cache_info().currsize:  # 尚未创建时不为抓取而创建线程池
+            yield (), get_password_executor().stats()[key]
+
+    return collect
+
+
+def _cache_samples(key: str) -> Callable[[], Iterable[tuple[LabelValues, float]]]:
+    def collect() -> Iterable[tuple[LabelValues, float]]:
+        for namespace, stats in cache_stats().items():
+            yield (namespace,), stats[key]
+
+    return collect
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(pairs: Sequence[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+LOGIN_FAILURES = REGISTRY.counter(
+    "login_failures_total", "Failed login attempts that passed the throttle check (unknown email or wrong password)."
+)
+LOGIN_THROTTLE_REJECTIONS = REGISTRY.counter(
+    "login_throttle_rejections_total", "Login attempts rejected by the throttle before any password check.", ("scope",)
+)
+LOGIN_THROTTLE_LOCKOUTS = REGISTRY.counter(
+    "login_throttle_lockouts_total", "Lockouts started after too many failed logins.", ("scope",)
+)
+
+for _key, _type, _doc in (
+    ("in_use", "gauge", "Connections currently checked out."),
+    ("checked_in", "gauge", "Idle connections in the pool."),
+    ("overflow", "gauge", "Overflow connections currently open."),
+    ("size", "gauge", "Configured pool size."),
+    ("wait_seconds_max", "gauge", "Longest checkout wait observed."),
+    ("checkouts", "counter", "Connection checkouts."),
+    ("timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+    ("disconnects", "counter", "Connections dropped by the database."),
+):
+    _name = f"db_pool_{_key}_total" if _type == "counter" else f"db_pool_{_key}"
+    REGISTRY.callback(_name, _doc, _type, ("engine",), _pool_samples(_key))
+
+for _key, _type, _doc in (
+    ("healthy", "gauge", "Whether a read replica is in rotation (1) or ejected (0)."),
+    ("ejections", "counter", "Times a read replica was ejected after a disconnect."),
+):
+    _name = f"db_replica_{_key}_total" if _type == "counter" else f"db_replica_{_key}"
+    REGISTRY.callback(_name, _doc, _type, ("engine",), _pool_samples(_key))
+
+for _key, _type, _doc in (
+    ("running", "gauge", "Password hashing tasks currently running."),
+    ("queued", "gauge", "Password hashing tasks waiting for a worker."),
+    ("wait_seconds_max", "gauge", "Longest queue wait observed by a password hashing task."),
+    ("submitted", "counter", "Password hashing tasks accepted."),
+    ("rejected", "counter", "Password hashing tasks rejected because the executor was saturated."),
+):
+    _name = f"password_executor_{_key}_total" if _type == "counter" else f"password_executor_{_key}"
+    REGISTRY.callback(_name, _doc, _type, (), _executor_samples(_key))
+
+for _key, _doc in (
+    ("hits", "Cache lookups that found a value."),
+    ("misses", "Cache lookups that found nothing."),
+    ("loads", "Loader calls made by cached functions after a miss."),
+):
+    REGISTRY.callback(f"cache_{_key}_total", _doc, "counter", ("namespace",), _cache_samples(_key))
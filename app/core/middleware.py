@@ -3,36 +3,113 @@
 from __future__ import annotations
 
 import logging
+import time
 from uuid import uuid4
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import reset_trace_id, set_trace_id
+from app.core.metrics import UNMATCHED_ROUTE, observe_request
+from app.db.instrumentation import QUERY_STATS_CTX, QueryStats, report_repeated_queries
 
 LOGGER = logging.getLogger("app.middleware")
 
 
-class TraceIdMiddleware(BaseHTTPMiddleware):
-    """为每个请求注入 trace_id，并写入响应头。"""
+class TraceIdMiddleware:
+    """为每个请求注入 trace_id，并写入响应头。
+
+    纯 ASGI 实现：不像 `BaseHTTPMiddleware` 那样为每个请求额外创建任务与内存流，
+    也不会缓冲流式响应，只在 `http.response.start` 消息上追加响应头。
+    """
 
     def __init__(self, app: ASGIApp, header_name: str = "X-Trace-Id") -> None:
-        super().__init__(app)
+        self.app = app
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        trace_id = request.headers.get(self.header_name) or uuid4().hex
-        request.state.trace_id = trace_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = Headers(scope=scope).get(self.header_name) or uuid4().hex
+        scope.setdefault("state", {})["trace_id"] = trace_id  # 供 request.state.trace_id 读取
         token = set_trace_id(trace_id)
 
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = trace_id
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_trace_id)
         except Exception:
-            LOGGER.exception("Unhandled exception", extra={"path": str(request.url.path)})
+            LOGGER.exception("Unhandled exception", extra={"path": scope["path"]})
             raise
         finally:
             reset_trace_id(token)
 
-        response.headers[self.header_name] = trace_id
-        return response
+
+class MetricsMiddleware:
+    """按路由模板记录请求数、状态码与耗时。
+
+    标签取自路由匹配后写入 scope 的 `route.path`（如 `/api/v1/users/{user_id}`），
+    而非原始路径，避免标签基数随路径参数膨胀；未匹配任何路由的请求统一记为 `unmatched`。
+    未捕获异常按 500 记录后继续向外抛出。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            observe_request(scope["method"], route, status_code, time.perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """统计每个请求的 SQL 查询次数与耗时，写入 `Server-Timing` 响应头。
+
+    响应头形如 `db;dur=3.12;desc="4 queries", app;dur=10.48`（毫秒）；
+    请求结束后对重复执行达到阈值的语句形态记录疑似 N+1 警告。
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = QueryStats()
+        token = QUERY_STATS_CTX.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", f"{stats.server_timing()}, app;dur={elapsed_ms:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            QUERY_STATS_CTX.reset(token)
+            report_repeated_queries(stats, self.n_plus_one_threshold, scope["path"])
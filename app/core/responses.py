@@ -0,0 +1,43 @@
+"""高性能 JSON 响应类。
+
+作为应用的 `default_response_class` 使用：
+- 路由直接返回已校验的 Pydantic 模型时，由模型自身的 pydantic-core 序列化器一次性编码，
+  FastAPI 不会再按 `response_model` 重复校验与 `jsonable_encoder` 转换；
+- 其余内容（dict/list 等）安装 orjson 时由其编码，否则回退到 pydantic-core 的 `to_json`。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:  # orjson 为可选依赖，安装后自动启用
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 pydantic-core / orjson 编码的 JSONResponse，输出 UTF-8 且不转义非 ASCII 字符。"""
+
+    def render(self, content: Any) -> bytes:
+        """将响应内容编码为 JSON 字节串。
+
+        Args:
+            content (Any): 已校验的 Pydantic 模型或可 JSON 序列化的 Python 对象。
+
+        Returns:
+            bytes: UTF-8 编码的 JSON。
+        """
+
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if orjson is not None:
+            try:
+                return orjson.dumps(content)
+            except TypeError:  # 如非字符串键、超出 64 位的整数，交给 pydantic-core 处理
+                pass
+        return to_json(content, fallback=str)
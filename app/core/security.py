@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import bcrypt
-import jwt
 
 from app.core.config import Settings, get_settings
+from app.core.keyring import get_keyring
+
+if TYPE_CHECKING:
+    from app.apps.auth.principal import Principal
 
 
 def get_password_hash(password: str) -> str:
@@ -42,44 +46,54 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
-def _create_token(subject: int, minutes: int, token_type: str, settings: Settings) -> str:
+def _create_token(
+    subject: int, minutes: int, token_type: str, settings: Settings, extra_claims: dict[str, Any] | None = None
+) -> str:
     """内部辅助函数，生成特定类型的 JWT。
 
     Args:
         subject (int): JWT `sub` 字段，通常为用户 ID。
         minutes (int): 有效期（分钟）。
         token_type (str): access 或 refresh 类型标识。
-        settings (Settings): 应用配置，提供秘钥与过期策略。
+        settings (Settings): 应用配置，提供签名密钥与过期策略。
+        extra_claims (dict[str, Any] | None): 附加声明，不能覆盖标准字段。
 
     Returns:
-        str: 编码后的 JWT 字符串。
+        str: 编码后的 JWT 字符串，使用非对称密钥时头部带 `kid`。
     """
 
     expire = datetime.now(timezone.utc) + timedelta(minutes=minutes)
     payload: dict[str, Any] = {
+        **(extra_claims or {}),
         "sub": str(subject),
         "type": token_type,
         "iat": int(datetime.now(timezone.utc).timestamp()),
         "exp": expire,
+        "jti": uuid.uuid4().hex,  # 吊销名单以 jti 标识单个 token
     }
-    return jwt.encode(payload, settings.secret_key, algorithm="HS256")
+    return get_keyring(settings).encode(payload)
 
 
-def create_access_token(user_id: int, settings: Settings | None = None) -> str:
+def create_access_token(
+    user_id: int, settings: Settings | None = None, principal: Principal | None = None
+) -> str:
     """生成 Access Token。
 
-    供登录或刷新接口使用，为短期访问受保护 API 的凭证。
+    供登录或刷新接口使用，为短期访问受保护 API 的凭证。传入主体时写入
+    邮箱、姓名、启用状态与角色（rich claims），鉴权依赖可不查库直接构造主体。
 
     Args:
         user_id (int): 目标用户 ID。
         settings (Settings | None): 可选配置，默认取全局设置。
+        principal (Principal | None): 需写入 token 的认证主体，可选。
 
     Returns:
         str: 编码完成的 Access Token。
     """
 
     config = settings or get_settings()
-    return _create_token(user_id, config.access_token_expire_minutes, "access", config)
+    extra_claims = principal.to_claims() if principal is not None else None
+    return _create_token(user_id, config.access_token_expire_minutes, "access", config, extra_claims)
 
 
 def create_refresh_token(user_id: int, settings: Settings | None = None) -> str:
@@ -100,7 +114,7 @@ def create_refresh_token(user_id: int, settings: Settings | None = None) -> str:
 
 
 def decode_token(token: str, settings: Settings | None = None) -> dict[str, Any]:
-    """解析 JWT 并返回 payload。
+    """按头部 `kid` 选择密钥验签并返回 payload。
 
     Args:
         token (str): 待验证的 JWT。
@@ -111,4 +125,4 @@ def decode_token(token: str, settings: Settings | None = None) -> dict[str, Any]
     """
 
     config = settings or get_settings()
-    return jwt.decode(token, config.secret_key, algorithms=["HS256"])
+    return get_keyring(config).decode(token)
@@ -1,5 +1,5 @@
 """数据库访问层公共导出。"""
 
-from .session import SessionLocal, get_db, reset_session_factory
+from .session import AsyncSessionLocal, SessionLocal, get_async_db, get_db, reset_session_factory
 
-__all__ = ["SessionLocal", "get_db", "reset_session_factory"]
+__all__ = ["AsyncSessionLocal", "SessionLocal", "get_async_db", "get_db", "reset_session_factory"]
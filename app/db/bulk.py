@@ -0,0 +1,100 @@
+"""批量写入工具。
+
+`bulk_insert` 以集合方式写入大量行并跳过唯一约束冲突的记录：
+- PostgreSQL + psycopg：COPY 到临时暂存表，再 `INSERT ... SELECT ... ON CONFLICT DO NOTHING`；
+- SQLite：`executemany` 风格的 `INSERT ... ON CONFLICT DO NOTHING`（SQLAlchemy insertmanyvalues 批量展开）；
+- 其他方言：普通 `executemany`，冲突时由数据库报错。
+
+单行写入可用 `insert_ignoring_conflicts` 获得同样的冲突跳过语义。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Column, Connection, Dialect, Insert, Row, Table, column, insert, select, table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def insert_ignoring_conflicts(dialect: Dialect, target: Any) -> Insert:
+    """构造跳过唯一约束冲突行的 INSERT。
+
+    PostgreSQL 与 SQLite 生成不指定冲突目标的 `ON CONFLICT DO NOTHING`，
+    任一唯一约束或唯一索引冲突都会跳过该行；其他方言退化为普通 INSERT。
+
+    Args:
+        dialect (Dialect): 当前连接的方言。
+        target (Any): 目标表或 ORM 实体。
+
+    Returns:
+        Insert: INSERT 语句，可继续 `.values()` / `.returning()`。
+    """
+
+    if dialect.name == "postgresql":
+        return pg_insert(target).on_conflict_do_nothing()
+    if dialect.name == "sqlite":
+        return sqlite_insert(target).on_conflict_do_nothing()
+    return insert(target)
+
+
+def bulk_insert(
+    conn: Connection,
+    target: Table,
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    returning: Sequence[Column] = (),
+) -> list[Row]:
+    """批量插入行，已存在（唯一约束冲突）的行被跳过。
+
+    Args:
+        conn (Connection): 当前事务内的连接，调用方负责提交。
+        target (Table): 目标表。
+        rows (Sequence[Mapping[str, Any]]): 待插入的行，所有行的键需一致。
+        returning (Sequence[Column]): 需返回的列，仅包含实际插入的行。
+
+    Returns:
+        list[Row]: 实际插入行的 `returning` 列；未指定 `returning` 时返回空列表。
+    """
+
+    if not rows:
+        return []
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg":
+        return _copy_insert(conn, target, rows, returning)
+
+    stmt = insert_ignoring_conflicts(conn.dialect, target)
+    if not returning:
+        conn.execute(stmt, list(rows))
+        return []
+    return list(conn.execute(stmt.returning(*returning), list(rows)))
+
+
+def _copy_insert(
+    conn: Connection, target: Table, rows: Sequence[Mapping[str, Any]], returning: Sequence[Column]
+) -> list[Row]:
+    """通过 COPY 写入暂存表，再以单条 INSERT ... SELECT 合并到目标表。"""
+
+    columns = list(rows[0])
+    preparer = conn.dialect.identifier_preparer
+    staging_name = f"_bulk_{target.name}"
+    staging = preparer.quote(staging_name)
+    column_list = ", ".join(preparer.quote(name) for name in columns)
+
+    # 暂存表只含待写入的列、不带约束，事务提交时自动删除
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {staging}")
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {preparer.format_table(target)} WITH NO DATA"
+    )
+    with conn.connection.dbapi_connection.cursor() as cursor:
+        with cursor.copy(f"COPY {staging} ({column_list}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[name] for name in columns])
+
+    source = table(staging_name, *(column(name) for name in columns))
+    stmt = pg_insert(target).from_select(columns, select(*source.c)).on_conflict_do_nothing()
+    if not returning:
+        conn.execute(stmt)
+        return []
+    return list(conn.execute(stmt.returning(*returning)))
@@ -0,0 +1,150 @@
+"""SQL 执行埋点：按请求统计查询次数与耗时、记录慢查询并提示 N+1。
+
+`instrument_engine` 在 Engine 上挂载 `before_cursor_execute` / `after_cursor_execute`：
+- 每条语句的耗时累加到当前上下文的 `QueryStats`（由中间件按请求设置，
+  与 trace_id 同样通过 contextvars 传递到线程池与异步 greenlet 中）；
+- 超过 `db_slow_query_ms` 的语句以 WARNING 记录，日志自动携带 trace_id；
+- 同一请求内同一语句形态重复执行达到 `db_n_plus_one_threshold` 次时，请求结束后提示可能的 N+1。
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+LOGGER = logging.getLogger("app.db.queries")
+
+QUERY_STATS_CTX: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# 展开后的 IN 列表等连续占位符折叠为一个，使不同长度的参数列表归为同一形态
+_PLACEHOLDER_RUN = re.compile(r"(\?|%\(\w+\)s|%s|\$\d+)(\s*,\s*(\?|%\(\w+\)s|%s|\$\d+))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """单个请求（或测试代码块）内的查询统计。"""
+
+    __slots__ = ("count", "seconds", "slow", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = 0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float, slow: bool = False) -> None:
+        """记录一条已执行的语句。
+
+        Args:
+            statement (str): 发送给驱动的 SQL。
+            seconds (float): 执行耗时（秒）。
+            slow (bool): 是否超过慢查询阈值。
+        """
+
+        self.count += 1
+        self.seconds += seconds
+        self.slow += slow
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """返回执行次数达到阈值的语句形态，按次数降序。
+
+        Args:
+            threshold (int): 判定为疑似 N+1 的最少重复次数。
+
+        Returns:
+            list[tuple[str, int]]: (语句形态, 次数)。
+        """
+
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        """生成 `Server-Timing` 响应头中的 db 项。"""
+
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+def statement_shape(statement: str) -> str:
+    """归一化语句：压缩空白并折叠连续占位符。
+
+    Args:
+        statement (str): 发送给驱动的 SQL。
+
+    Returns:
+        str: 用于判断重复执行的语句形态。
+    """
+
+    return _PLACEHOLDER_RUN.sub(r"\1", _WHITESPACE.sub(" ", statement).strip())
+
+
+def instrument_engine(engine: Engine, slow_query_ms: float) -> None:
+    """为 Engine 挂载查询计时事件。
+
+    Args:
+        engine (Engine): 同步 Engine；异步 Engine 传入其 `sync_engine`。
+        slow_query_ms (float): 慢查询阈值（毫秒），小于等于 0 表示不记录慢查询。
+    """
+
+    slow_seconds = slow_query_ms / 1000 if slow_query_ms > 0 else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        slow = slow_seconds is not None and elapsed >= slow_seconds
+        if slow:
+            LOGGER.warning(
+                "Slow query",
+                extra={"duration_ms": round(elapsed * 1000, 2), "detail": _WHITESPACE.sub(" ", statement)},
+            )
+        stats = QUERY_STATS_CTX.get()
+        if stats is not None:
+            stats.record(statement, elapsed, slow)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()  # 执行失败时不会触发 after_cursor_execute
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """在代码块内收集查询统计，供测试断言查询预算。
+
+    Returns:
+        Iterator[QueryStats]: 代码块结束后仍可读取的统计对象。
+    """
+
+    stats = QueryStats()
+    token = QUERY_STATS_CTX.set(stats)
+    try:
+        yield stats
+    finally:
+        QUERY_STATS_CTX.reset(token)
+
+
+def report_repeated_queries(stats: QueryStats, threshold: int, path: str) -> None:
+    """对疑似 N+1 的语句形态逐条记录 WARNING。
+
+    Args:
+        stats (QueryStats): 请求的查询统计。
+        threshold (int): 判定为疑似 N+1 的最少重复次数，小于等于 0 表示关闭。
+        path (str): 请求路径，写入日志。
+    """
+
+    if threshold <= 0:
+        return
+    for shape, count in stats.repeated(threshold):
+        LOGGER.warning("Possible N+1 query", extra={"path": path, "detail": f"{count}x {shape}"})
@@ -0,0 +1,235 @@
+"""数据库连接池配置与运行时统计。
+
+连接池参数统一取自 Settings，默认关闭 `pool_pre_ping`，避免每次 checkout 多一次往返。
+驱动报告断连时由 SQLAlchemy 自行失效该连接及池中更早的连接，配合 `pool_recycle`
+定期替换长连接；本模块的 `handle_error` 监听器只记录断连次数与日志，不做重试，
+遇到断连的那次请求仍会失败。数据库切换等场景下如需避免此类失败，应开启 `DB_POOL_PRE_PING`。
+
+注册到本模块的 Engine 会记录 checkout 等待耗时、在用连接数、溢出连接数与断连次数，
+从库另附健康状态与摘除次数，供 `/internal/db-pool` 与 `/metrics` 按 worker 评估池容量。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from sqlalchemy import Engine, event, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection, QueuePool
+
+from app.core.config import Settings
+
+LOGGER = logging.getLogger("app.db.pool")
+
+# 已注册的 Engine、统计及附加状态来源，键为逻辑名称（如 primary、primary_async）
+_ENGINES: dict[str, tuple[Engine, PoolStats, Callable[[], dict[str, Any]] | None]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class PoolOptions:
+    """连接池参数，可哈希以便作为 Engine 缓存键。"""
+
+    size: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    use_lifo: bool
+    pre_ping: bool
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> PoolOptions:
+        """从配置读取连接池参数。
+
+        Args:
+            settings (Settings): 应用配置。
+
+        Returns:
+            PoolOptions: 连接池参数。
+        """
+
+        return cls(
+            size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            timeout=settings.db_pool_timeout,
+            recycle=settings.db_pool_recycle,
+            use_lifo=settings.db_pool_use_lifo,
+            pre_ping=settings.db_pool_pre_ping,
+        )
+
+
+class PoolStats:
+    """单个连接池的线程安全计数器。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._in_use_peak = 0
+        self._checkouts = 0
+        self._connects = 0
+        self._disconnects = 0
+        self._invalidations = 0
+        self._timeouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """记录一次 checkout 的等待耗时。
+
+        Args:
+            seconds (float): 从请求连接到拿到连接（或超时）的秒数。
+            timed_out (bool): 是否因池耗尽而超时。
+        """
+
+        with self._lock:
+            self._waits += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            if timed_out:
+                self._timeouts += 1
+
+    def on_connect(self, *_: Any) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def on_checkout(self, *_: Any) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._in_use_peak = max(self._in_use_peak, self._in_use)
+
+    def on_checkin(self, *_: Any) -> None:
+        with self._lock:
+            self._in_use -= 1
+
+    def on_invalidate(self, *_: Any) -> None:
+        with self._lock:
+            self._invalidations += 1
+
+    def on_disconnect(self) -> None:
+        with self._lock:
+            self._disconnects += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, float | int | str | None]:
+        """返回计数快照，QueuePool 额外给出容量与溢出连接数。
+
+        Args:
+            pool (Pool): Engine 当前使用的连接池。
+
+        Returns:
+            dict[str, float | int | str | None]: 连接池统计。
+        """
+
+        queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if queue_pool else None,
+                "overflow": max(pool.overflow(), 0) if queue_pool else None,
+                "checked_in": pool.checkedin() if queue_pool else None,
+                "in_use": self._in_use,
+                "in_use_peak": self._in_use_peak,
+                "checkouts": self._checkouts,
+                "connects": self._connects,
+                "disconnects": self._disconnects,
+                "invalidations": self._invalidations,
+                "timeouts": self._timeouts,
+                "wait_seconds_avg": self._wait_total / self._waits if self._waits else 0.0,
+                "wait_seconds_max": self._wait_max,
+            }
+
+
+class _TimedCheckoutMixin:
+    """为连接池的 checkout 计时；`recreate()` 沿用同一子类，统计在 dispose 后保持。"""
+
+    pool_stats: ClassVar[PoolStats]
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def engine_options(database_url: str, options: PoolOptions, stats: PoolStats, is_async: bool = False) -> dict[str, Any]:
+    """生成 `create_engine` / `create_async_engine` 的连接池参数。
+
+    仅当方言默认使用 QueuePool 时才应用容量参数并计时 checkout；
+    SQLite 内存库等单连接池保持默认行为。
+
+    Args:
+        database_url (str): 最终传给 Engine 的连接串。
+        options (PoolOptions): 连接池参数。
+        stats (PoolStats): 接收 checkout 计时的统计对象。
+        is_async (bool): 是否用于 AsyncEngine。
+
+    Returns:
+        dict[str, Any]: Engine 关键字参数。
+    """
+
+    url = make_url(database_url)
+    kwargs: dict[str, Any] = {"pool_pre_ping": options.pre_ping}
+    if not issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        return kwargs
+
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    kwargs.update(
+        poolclass=type(f"Timed{base.__name__}", (_TimedCheckoutMixin, base), {"pool_stats": stats}),
+        pool_size=options.size,
+        max_overflow=options.max_overflow,
+        pool_timeout=options.timeout,
+        pool_recycle=options.recycle,
+        pool_use_lifo=options.use_lifo,
+    )
+    return kwargs
+
+
+def register_engine(
+    name: str,
+    engine: Engine,
+    stats: PoolStats,
+    extra: Callable[[], dict[str, Any]] | None = None,
+) -> None:
+    """为 Engine 挂载连接池与断连事件，并登记到统计注册表。
+
+    Args:
+        name (str): 逻辑名称，同名注册会覆盖旧 Engine。
+        engine (Engine): 同步 Engine；AsyncEngine 传入其 `sync_engine`。
+        stats (PoolStats): 该 Engine 的统计对象。
+        extra (Callable[[], dict[str, Any]] | None): 附加状态来源，如从库的健康状态，合并进统计快照。
+    """
+
+    event.listen(engine, "connect", stats.on_connect)
+    event.listen(engine, "checkout", stats.on_checkout)
+    event.listen(engine, "checkin", stats.on_checkin)
+    event.listen(engine, "invalidate", stats.on_invalidate)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        if context.is_disconnect:
+            stats.on_disconnect()
+            LOGGER.warning("Database connection lost, pool will reconnect", extra={"engine": name})
+
+    _ENGINES[name] = (engine, stats, extra)
+
+
+def pool_stats() -> dict[str, dict[str, float | int | str | None]]:
+    """返回全部已注册 Engine 的连接池统计。
+
+    Returns:
+        dict[str, dict[str, float | int | str | None]]: 按 Engine 名称组织的统计快照。
+    """
+
+    return {
+        name: {**stats.snapshot(engine.pool), **(extra() if extra else {})}
+        for name, (engine, stats, extra) in _ENGINES.items()
+    }
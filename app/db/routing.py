@@ -0,0 +1,150 @@
+"""读写分离：只读查询路由到从库。
+
+仓储的只读方法以 `bind_arguments=READ_REPLICA` 执行语句，`RoutingSession.get_bind`
+据此从 `ReplicaSet` 轮询选择从库；其余语句（写入、懒加载、未标记的查询）始终走主库。
+
+一个 Session 一旦写入（flush 或执行 DML）即固定到主库，保证同一请求内读到自己的写入；
+跨请求的"写后读"（如注册后立即刷新）需调用 `pin_primary` 显式固定。
+从库出现断连错误时会被摘除 `eject_seconds` 秒，全部摘除时回退到主库。
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# 仓储只读方法传给 `execute` 的绑定参数
+READ_REPLICA: dict[str, Any] = {"use_replica": True}
+
+
+class ReplicaSet:
+    """一组从库 Engine，轮询选择并按断连错误临时摘除。"""
+
+    def __init__(self, engines: Sequence[Engine], eject_seconds: float = 30.0) -> None:
+        """登记从库并监听其错误事件。
+
+        Args:
+            engines (Sequence[Engine]): 从库 Engine；AsyncEngine 需传入其 `sync_engine`。
+            eject_seconds (float): 断连后摘除的秒数。
+        """
+
+        self.engines = tuple(engines)
+        self.eject_seconds = eject_seconds
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+        self._ejected_until: dict[int, float] = {}
+        self._ejections = [0] * len(self.engines)
+        for index, engine in enumerate(self.engines):
+            event.listen(engine, "handle_error", self._error_listener(index))
+
+    def choose(self) -> Engine | None:
+        """按轮询顺序返回一个健康的从库。
+
+        Returns:
+            Engine | None: 选中的从库；未配置或全部被摘除时返回 None。
+        """
+
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._cursor) % len(self.engines)
+            if self._ejected_until.get(index, 0.0) <= now:
+                return self.engines[index]
+        return None
+
+    def is_healthy(self, engine: Engine) -> bool:
+        """判断从库当前是否参与轮询。
+
+        Args:
+            engine (Engine): 由 `choose` 返回的从库。
+
+        Returns:
+            bool: 未被摘除或摘除已到期时返回 True。
+        """
+
+        return self._ejected_until.get(self.engines.index(engine), 0.0) <= time.monotonic()
+
+    def eject(self, index: int) -> None:
+        """摘除指定从库，`eject_seconds` 后自动恢复参与轮询。
+
+        Args:
+            index (int): 从库在 `engines` 中的下标。
+        """
+
+        with self._lock:
+            self._ejected_until[index] = time.monotonic() + self.eject_seconds
+            self._ejections[index] += 1
+
+    def stats(self, index: int) -> dict[str, bool | int]:
+        """返回指定从库的健康状态与累计摘除次数，随连接池统计一并暴露。
+
+        Args:
+            index (int): 从库在 `engines` 中的下标。
+
+        Returns:
+            dict[str, bool | int]: 从库状态快照。
+        """
+
+        with self._lock:
+            return {
+                "healthy": self._ejected_until.get(index, 0.0) <= time.monotonic(),
+                "ejections": self._ejections[index],
+            }
+
+    def _error_listener(self, index: int):
+        def on_error(context: Any) -> None:
+            if context.is_disconnect:
+                self.eject(index)
+
+        return on_error
+
+
+class RoutingSession(Session):
+    """按 `use_replica` 绑定参数在主库与从库之间路由的 Session。
+
+    同一 Session 内复用首次选中的从库，避免一个请求打开多个从库连接。
+    """
+
+    def __init__(self, *args: Any, replicas: ReplicaSet | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.primary_pinned = False
+        self._replica: Engine | None = None
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, use_replica: bool = False, **kw: Any) -> Any:
+        if use_replica and self.replicas is not None and not self.primary_pinned:
+            replica = self._replica
+            if replica is None or not self.replicas.is_healthy(replica):
+                replica = self._replica = self.replicas.choose()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session: Session, _flush_context: Any) -> None:
+    session.primary_pinned = True  # type: ignore[attr-defined]
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_on_write(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.primary_pinned = True  # type: ignore[attr-defined]
+
+
+def pin_primary(db: Session | AsyncSession) -> None:
+    """将 Session 固定到主库，之后的只读查询也不再路由到从库。
+
+    Args:
+        db (Session | AsyncSession): 同步或异步数据库会话。
+    """
+
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    if isinstance(session, RoutingSession):
+        session.primary_pinned = True
@@ -2,30 +2,79 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
-from functools import lru_cache
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache, partial
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import Settings, get_settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import PoolOptions, PoolStats, engine_options, register_engine
+from app.db.routing import ReplicaSet, RoutingSession
 
-# 预先创建 sessionmaker，稍后通过 configure 绑定 Engine
-SessionLocal = sessionmaker(autoflush=False, autocommit=False)
+# 预先创建 sessionmaker，稍后通过 configure 绑定主库 Engine 与从库集合；
+# 提交后不过期实体，RETURNING 取回的字段可直接序列化，无需再 SELECT 刷新
+SessionLocal = sessionmaker(class_=RoutingSession, autoflush=False, autocommit=False, expire_on_commit=False)
+
+# 异步 Session 工厂在使用时才绑定 AsyncEngine，避免未安装异步驱动时影响同步脚本与 Alembic
+AsyncSessionLocal = async_sessionmaker(sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False)
+
+# 同步连接串 backend 对应的异步驱动
+_ASYNC_DRIVERS: dict[str, str] = {
+    "postgresql": "psycopg",
+    "sqlite": "aiosqlite",
+}
+
+
+def _connect_args(database_url: str, prepare_threshold: int) -> dict[str, Any]:
+    """生成驱动连接参数。
+
+    psycopg 3 对同一连接上执行次数达到 `prepare_threshold` 的语句使用服务端预处理语句，
+    配合仓储中固定的语句对象，热点查询省去服务端的解析与规划。
+
+    Args:
+        database_url (str): 连接串。
+        prepare_threshold (int): 0 表示首次执行即预处理，负数表示禁用
+            （经 PgBouncer 事务模式连接时需禁用）。
+
+    Returns:
+        dict[str, Any]: 传给 `create_engine(connect_args=...)` 的参数，非 psycopg 驱动为空。
+    """
+
+    if make_url(database_url).get_driver_name() != "psycopg":
+        return {}
+    return {"prepare_threshold": prepare_threshold if prepare_threshold >= 0 else None}
 
 
 @lru_cache(maxsize=1)
-def _engine_by_url(database_url: str) -> Engine:
-    """根据连接字符串构建或复用 Engine。
+def _engine_by_url(
+    database_url: str, pool_options: PoolOptions, slow_query_ms: float, prepare_threshold: int
+) -> Engine:
+    """根据连接字符串与连接池参数构建或复用 Engine。
 
     Args:
         database_url (str): SQLAlchemy 数据库连接串。
+        pool_options (PoolOptions): 连接池参数。
+        slow_query_ms (float): 慢查询日志阈值（毫秒）。
+        prepare_threshold (int): psycopg 服务端预处理语句阈值，见 `_connect_args`。
 
     Returns:
         Engine: 缓存的 Engine 实例。
     """
 
-    return create_engine(database_url, pool_pre_ping=True, future=True)
+    stats = PoolStats()
+    engine = create_engine(
+        database_url,
+        future=True,
+        connect_args=_connect_args(database_url, prepare_threshold),
+        **engine_options(database_url, pool_options, stats),
+    )
+    register_engine("primary", engine, stats)
+    instrument_engine(engine, slow_query_ms)
+    return engine
 
 
 def get_engine(settings: Settings | None = None) -> Engine:
@@ -39,17 +88,209 @@ def get_engine(settings: Settings | None = None) -> Engine:
     """
 
     resolved_settings = settings or get_settings()
-    return _engine_by_url(resolved_settings.database_url)
+    return _engine_by_url(
+        resolved_settings.database_url,
+        PoolOptions.from_settings(resolved_settings),
+        resolved_settings.db_slow_query_ms,
+        resolved_settings.db_prepare_threshold,
+    )
+
+
+def to_async_url(database_url: str) -> str:
+    """将同步连接串转换为对应的异步驱动连接串。
+
+    Args:
+        database_url (str): 配置中的同步连接串，如 ``postgresql+psycopg://...``。
+
+    Returns:
+        str: 使用异步驱动的连接串；未知 backend 原样返回。
+    """
+
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        return database_url
+    return url.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=1)
+def _async_engine_by_url(
+    database_url: str, pool_options: PoolOptions, slow_query_ms: float, prepare_threshold: int
+) -> AsyncEngine:
+    """根据同步连接串与连接池参数构建或复用 AsyncEngine。
+
+    Args:
+        database_url (str): 配置中的同步连接串。
+        pool_options (PoolOptions): 连接池参数，与同步 Engine 各自独立计数。
+        slow_query_ms (float): 慢查询日志阈值（毫秒）。
+        prepare_threshold (int): psycopg 服务端预处理语句阈值，见 `_connect_args`。
+
+    Returns:
+        AsyncEngine: 缓存的异步 Engine 实例。
+    """
+
+    async_url = to_async_url(database_url)
+    stats = PoolStats()
+    engine = create_async_engine(
+        async_url,
+        connect_args=_connect_args(async_url, prepare_threshold),
+        **engine_options(async_url, pool_options, stats, is_async=True),
+    )
+    register_engine("primary_async", engine.sync_engine, stats)
+    instrument_engine(engine.sync_engine, slow_query_ms)
+    return engine
+
+
+def get_async_engine(settings: Settings | None = None) -> AsyncEngine:
+    """读取配置并返回对应 AsyncEngine。
+
+    Args:
+        settings (Settings | None): 可选配置实例，默认全局。
+
+    Returns:
+        AsyncEngine: 与同步 Engine 指向同一数据库的异步 Engine。
+    """
+
+    resolved_settings = settings or get_settings()
+    return _async_engine_by_url(
+        resolved_settings.database_url,
+        PoolOptions.from_settings(resolved_settings),
+        resolved_settings.db_slow_query_ms,
+        resolved_settings.db_prepare_threshold,
+    )
+
+
+@lru_cache(maxsize=1)
+def _replicas_by_urls(
+    read_urls: tuple[str, ...],
+    pool_options: PoolOptions,
+    eject_seconds: float,
+    slow_query_ms: float,
+    prepare_threshold: int,
+) -> ReplicaSet:
+    """根据从库连接串构建或复用同步从库集合。
+
+    Args:
+        read_urls (tuple[str, ...]): 从库连接串。
+        pool_options (PoolOptions): 连接池参数，每个从库独立建池。
+        eject_seconds (float): 断连后摘除的秒数。
+        slow_query_ms (float): 慢查询日志阈值（毫秒）。
+        prepare_threshold (int): psycopg 服务端预处理语句阈值，见 `_connect_args`。
+
+    Returns:
+        ReplicaSet: 从库集合，未配置时为空集合。
+    """
+
+    engines, engine_stats = [], []
+    for url in read_urls:
+        stats = PoolStats()
+        engine = create_engine(
+            url,
+            future=True,
+            connect_args=_connect_args(url, prepare_threshold),
+            **engine_options(url, pool_options, stats),
+        )
+        instrument_engine(engine, slow_query_ms)
+        engines.append(engine)
+        engine_stats.append(stats)
+    replicas = ReplicaSet(engines, eject_seconds)
+    for index, (engine, stats) in enumerate(zip(engines, engine_stats)):
+        register_engine(f"replica_{index}", engine, stats, partial(replicas.stats, index))
+    return replicas
+
+
+@lru_cache(maxsize=1)
+def _async_replicas_by_urls(
+    read_urls: tuple[str, ...],
+    pool_options: PoolOptions,
+    eject_seconds: float,
+    slow_query_ms: float,
+    prepare_threshold: int,
+) -> ReplicaSet:
+    """根据从库连接串构建或复用异步从库集合。
+
+    Args:
+        read_urls (tuple[str, ...]): 配置中的同步从库连接串。
+        pool_options (PoolOptions): 连接池参数，每个从库独立建池。
+        eject_seconds (float): 断连后摘除的秒数。
+        slow_query_ms (float): 慢查询日志阈值（毫秒）。
+        prepare_threshold (int): psycopg 服务端预处理语句阈值，见 `_connect_args`。
+
+    Returns:
+        ReplicaSet: 由各 AsyncEngine 的 `sync_engine` 组成的从库集合。
+    """
+
+    engines, engine_stats = [], []
+    for url in read_urls:
+        async_url = to_async_url(url)
+        stats = PoolStats()
+        engine = create_async_engine(
+            async_url,
+            connect_args=_connect_args(async_url, prepare_threshold),
+            **engine_options(async_url, pool_options, stats, is_async=True),
+        )
+        instrument_engine(engine.sync_engine, slow_query_ms)
+        engines.append(engine.sync_engine)
+        engine_stats.append(stats)
+    replicas = ReplicaSet(engines, eject_seconds)
+    for index, (engine, stats) in enumerate(zip(engines, engine_stats)):
+        register_engine(f"replica_{index}_async", engine, stats, partial(replicas.stats, index))
+    return replicas
+
+
+def get_replicas(settings: Settings | None = None) -> ReplicaSet | None:
+    """返回同步从库集合，未配置 `database_read_urls` 时返回 None。
+
+    Args:
+        settings (Settings | None): 可选配置实例，默认全局。
+
+    Returns:
+        ReplicaSet | None: 从库集合。
+    """
+
+    resolved_settings = settings or get_settings()
+    if not resolved_settings.database_read_urls:
+        return None
+    return _replicas_by_urls(
+        tuple(resolved_settings.database_read_urls),
+        PoolOptions.from_settings(resolved_settings),
+        resolved_settings.db_replica_eject_seconds,
+        resolved_settings.db_slow_query_ms,
+        resolved_settings.db_prepare_threshold,
+    )
+
+
+def get_async_replicas(settings: Settings | None = None) -> ReplicaSet | None:
+    """返回异步从库集合，未配置 `database_read_urls` 时返回 None。
+
+    Args:
+        settings (Settings | None): 可选配置实例，默认全局。
+
+    Returns:
+        ReplicaSet | None: 从库集合。
+    """
+
+    resolved_settings = settings or get_settings()
+    if not resolved_settings.database_read_urls:
+        return None
+    return _async_replicas_by_urls(
+        tuple(resolved_settings.database_read_urls),
+        PoolOptions.from_settings(resolved_settings),
+        resolved_settings.db_replica_eject_seconds,
+        resolved_settings.db_slow_query_ms,
+        resolved_settings.db_prepare_threshold,
+    )
 
 
 def _configure_sessionmaker(settings: Settings | None = None) -> None:
-    """根据配置刷新 SessionLocal 的绑定。
+    """根据配置刷新 SessionLocal 的主库与从库绑定。
 
     Args:
         settings (Settings | None): 可选配置，用于选择 Engine。
     """
 
-    SessionLocal.configure(bind=get_engine(settings))
+    SessionLocal.configure(bind=get_engine(settings), replicas=get_replicas(settings))
 
 
 _configure_sessionmaker()
@@ -69,6 +310,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI 依赖使用的异步数据库 Session 生成器。
+
+    请求期间不占用线程池，适合 `async def` 路由。
+
+    Returns:
+        AsyncGenerator[AsyncSession, None]: 请求结束时自动关闭的 AsyncSession。
+    """
+
+    async with AsyncSessionLocal(bind=get_async_engine(), replicas=get_async_replicas()) as db:
+        yield db
+
+
 def reset_session_factory() -> None:
     """清空缓存并重新配置 Session 工厂。
 
@@ -77,4 +331,7 @@ def reset_session_factory() -> None:
 
     get_settings.cache_clear()
     _engine_by_url.cache_clear()
+    _async_engine_by_url.cache_clear()
+    _replicas_by_urls.cache_clear()
+    _async_replicas_by_urls.cache_clear()
     _configure_sessionmaker()
@@ -6,11 +6,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes.health import router as health_router
+from app.api.routes.internal import router as internal_router
+from app.api.routes.metrics import router as metrics_router
+from app.api.routes.well_known import router as well_known_router
+from app.apps.auth.admin_router import router as admin_router
+from app.apps.auth.bulk_import import reset_import_hasher
+from app.apps.auth.revocation import reset_revocation_list_async, start_revocation_sync
+from app.apps.auth.throttle import reset_login_throttle_async
 from app.apps.auth.router import router as auth_router
+from app.core.cache import reset_cache_async
 from app.core.config import Settings, get_settings
 from app.core.exception import register_exception_handlers
-from app.core.logging import configure_logging
-from app.core.middleware import TraceIdMiddleware
+from app.core.logging import configure_logging, shutdown_logging
+from app.core.metrics import start_snapshot_writer, stop_snapshot_writer
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware, TraceIdMiddleware
+from app.core.responses import FastJSONResponse
 
 
 def create_app() -> FastAPI:
@@ -22,17 +32,39 @@ def create_app() -> FastAPI:
 
     settings = get_settings()
     configure_logging(settings)
-    app = FastAPI(title=settings.app_name, version=settings.api_version)
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.api_version,
+        default_response_class=FastJSONResponse,
+    )
+    app.add_event_handler("shutdown", shutdown_logging)  # 队列模式下确保缓冲日志写出
+    app.add_event_handler(
+        "startup",
+        lambda: start_snapshot_writer(settings.metrics_multiproc_dir, settings.metrics_snapshot_interval_seconds),
+    )
+    app.add_event_handler("shutdown", stop_snapshot_writer)
+    app.add_event_handler("shutdown", reset_cache_async)  # 释放同步与异步 Redis 连接池
+    app.add_event_handler("startup", start_revocation_sync)
+    app.add_event_handler("shutdown", reset_revocation_list_async)
+    app.add_event_handler("shutdown", reset_login_throttle_async)
+    app.add_event_handler("shutdown", reset_import_hasher)
 
-    _register_middlewares(app)
+    _register_middlewares(app, settings)
     register_exception_handlers(app)
     _register_routes(app, settings)
     return app
 
 
-def _register_middlewares(app: FastAPI) -> None:
-    """注册全局中间件，如 CORS 与 trace_id。"""
+def _register_middlewares(app: FastAPI, settings: Settings) -> None:
+    """注册全局中间件，如 CORS、trace_id、请求指标与查询统计。
+
+    Args:
+        app (FastAPI): 应用实例。
+        settings (Settings): 配置，提供 N+1 判定阈值。
+    """
 
+    app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=settings.db_n_plus_one_threshold)
+    app.add_middleware(MetricsMiddleware)
     app.add_middleware(TraceIdMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -53,4 +85,8 @@ def _register_routes(app: FastAPI, settings: Settings) -> None:
 
     api_prefix = f"{settings.api_prefix}/{settings.api_version}"  # 统一 API 版本路径
     app.include_router(health_router, prefix=api_prefix)
+    app.include_router(internal_router, prefix=api_prefix)
     app.include_router(auth_router, prefix=api_prefix)
+    app.include_router(admin_router, prefix=api_prefix)
+    app.include_router(metrics_router)  # 按 Prometheus 惯例挂在根路径
+    app.include_router(well_known_router)  # RFC 8615 约定的根路径
@@ -0,0 +1,39 @@
+"""生成 JWT 签名私钥并打印其 kid。
+
+用法::
+
+    python -m scripts.generate_jwt_key --algorithm EdDSA --output keys/jwt-2026-10.pem
+
+轮换步骤：先把新私钥加入 `JWT_VERIFICATION_KEYS` 并等待超过 `JWKS_MAX_AGE_SECONDS`，
+再将其设为 `JWT_SIGNING_KEY`、旧密钥移入 `JWT_VERIFICATION_KEYS`，
+旧密钥签发的 token 全部过期后再移除。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from app.core.keyring import generate_private_key_pem, load_key
+
+
+def main() -> None:
+    """CLI 入口：写出私钥文件（权限 600）并打印 kid。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithm", choices=["EdDSA", "ES256"], default="EdDSA", help="签名算法")
+    parser.add_argument("--output", required=True, help="私钥 PEM 输出路径")
+    args = parser.parse_args()
+
+    pem = generate_private_key_pem(args.algorithm)
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as fp:
+        fp.write(pem)
+    print(f"kid={load_key(pem).kid} algorithm={args.algorithm} path={path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""批量导入用户脚本。
+
+用法::
+
+    python -m scripts.import_users users.csv --batch-size 2000 --workers 8
+
+CSV 需包含表头 email,password[,full_name,is_active,roles]，`roles` 以分号分隔；
+NDJSON 每行一个同名字段的 JSON 对象。已存在的邮箱会被跳过。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from app.apps.auth.bulk_import import ImportFormat, detect_format, import_users
+from app.core.config import get_settings
+from app.db.init_db import import_model_modules
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    """CLI 入口：导入文件并打印报告。"""
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV 或 NDJSON 文件路径")
+    parser.add_argument("--format", dest="fmt", choices=["csv", "ndjson"], help="输入格式，默认按扩展名推断")
+    parser.add_argument("--batch-size", type=int, default=settings.bulk_import_batch_size, help="每批行数")
+    parser.add_argument("--workers", type=int, default=settings.bulk_import_workers, help="哈希进程数")
+    parser.add_argument("--json", dest="json_path", help="将报告写入 JSON 文件")
+    args = parser.parse_args()
+
+    fmt: ImportFormat = args.fmt or detect_format(args.path)
+    import_model_modules()
+    with SessionLocal() as session, open(args.path, encoding="utf-8-sig", newline="") as lines:
+        report = import_users(session, lines, fmt, batch_size=args.batch_size, workers=args.workers)
+
+    result = report.as_dict()
+    print(
+        f"total={result['total']} created={result['created']} existing={result['existing']} "
+        f"invalid={result['invalid']} role_assignments={result['role_assignments']} "
+        f"seconds={result['seconds']} users/sec={result['users_per_second']}"
+    )
+    if result["unknown_roles"]:
+        print(f"unknown roles: {', '.join(result['unknown_roles'])}")
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['message']}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fp:
+            json.dump(result, fp, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,28 @@
-"""数据库种子数据脚本。"""
+"""数据库种子数据脚本。
+
+用法::
+
+    python -m scripts.seed_data
+    python -m scripts.seed_data --users 1000000 --roles 50 --roles-per-user 2 --inactive-ratio 0.05 --seed 42
+
+不带参数时只写入默认角色与管理员；指定 `--users` 时额外生成确定性的合成压测数据集。
+"""
 
 from __future__ import annotations
 
-from typing import Iterable
+import argparse
+import random
+import time
+from typing import Any, Iterable
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.apps.auth.models import Role, User
+from app.apps.auth.models import Role, User, UserRole
+from app.apps.auth.repository import RoleRepository, UserRepository
 from app.core.security import get_password_hash
+from app.db.bulk import bulk_insert
+from app.db.routing import pin_primary
 from app.db.session import SessionLocal
 from app.db.init_db import import_model_modules
 
@@ -17,6 +31,10 @@ DEFAULT_ROLES: tuple[tuple[str, str], ...] = (
     ("user", "普通用户"),
 )
 
+# 合成数据集的邮箱域名与统一明文密码，压测脚本可直接用其登录
+SYNTHETIC_EMAIL_DOMAIN = "loadtest.example.com"
+SYNTHETIC_PASSWORD = "LoadTest123!"
+
 
 def seed_roles(session: Session, roles: Iterable[tuple[str, str]] = DEFAULT_ROLES) -> None:
     """确保指定角色存在，不存在则创建。
@@ -26,11 +44,8 @@ def seed_roles(session: Session, roles: Iterable[tuple[str, str]] = DEFAULT_ROLE
         roles (Iterable[tuple[str, str]]): (name, description) 列表。
     """
 
-    for name, description in roles:
-        exists = session.execute(select(Role).where(Role.name == name)).scalar_one_or_none()
-        if exists:
-            continue
-        session.add(Role(name=name, description=description))
+    rows = [{"name": name, "description": description} for name, description in roles]
+    bulk_insert(session.connection(), Role.__table__, rows)  # 已存在的角色由冲突处理跳过
     session.commit()
 
 
@@ -52,8 +67,8 @@ def seed_admin_user(
         role_name (str): 需绑定的角色名。
     """
 
-    user = session.execute(select(User).where(User.email == email)).scalar_one_or_none()
-    role = session.execute(select(Role).where(Role.name == role_name)).scalar_one_or_none()
+    user = UserRepository().get_by_email(session, email, load="with_roles")
+    role = RoleRepository().get_by_name(session, role_name)
     if role is None:
         raise ValueError(f"Role '{role_name}' 未找到，请先调用 seed_roles")
 
@@ -95,12 +110,112 @@ def seed_base_data(
     )
 
 
+def generate_synthetic_data(
+    session: Session,
+    *,
+    users: int,
+    roles: int,
+    roles_per_user: float = 2.0,
+    inactive_ratio: float = 0.05,
+    seed: int = 42,
+    batch_size: int = 5000,
+    password: str = SYNTHETIC_PASSWORD,
+) -> dict[str, Any]:
+    """生成确定性的合成用户、角色与关联数据，用于压测。
+
+    相同参数与种子总是生成相同的数据；所有用户共用一次预先计算的密码哈希，
+    写入按批次走 `bulk_insert`，重复执行时已存在的用户与角色会被跳过。
+
+    Args:
+        session (Session): 数据库会话。
+        users (int): 用户数量。
+        roles (int): 合成角色数量。
+        roles_per_user (float): 每个用户平均绑定的角色数。
+        inactive_ratio (float): 停用用户比例。
+        seed (int): 随机数种子。
+        batch_size (int): 每批写入的用户数。
+        password (str): 所有合成用户的明文密码。
+
+    Returns:
+        dict[str, Any]: 新建用户数、角色数、关联数、耗时与吞吐。
+    """
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    role_names = [f"role_{index:04d}" for index in range(roles)]
+    seed_roles(session, [(name, "合成压测角色") for name in role_names])
+    ids_by_name = dict(session.execute(select(Role.name, Role.id).where(Role.name.in_(role_names))).tuples().all())
+    role_ids = [ids_by_name[name] for name in role_names]
+    password_hash = get_password_hash(password)
+
+    created = assignments = 0
+    for start in range(0, users, batch_size):
+        rows: list[dict[str, Any]] = []
+        wanted: dict[str, list[int]] = {}
+        for index in range(start, min(start + batch_size, users)):
+            email = f"user{index:07d}@{SYNTHETIC_EMAIL_DOMAIN}"
+            rows.append(
+                {
+                    "email": email,
+                    "password_hash": password_hash,
+                    "full_name": f"Load Test {index}",
+                    "is_active": rng.random() >= inactive_ratio,
+                }
+            )
+            wanted[email] = _sample_roles(rng, role_ids, roles_per_user)
+
+        conn = session.connection()
+        inserted = bulk_insert(conn, User.__table__, rows, returning=(User.__table__.c.id, User.__table__.c.email))
+        links = [{"user_id": row.id, "role_id": role_id} for row in inserted for role_id in wanted[row.email]]
+        bulk_insert(conn, UserRole.__table__, links)
+        session.commit()
+        created += len(inserted)
+        assignments += len(links)
+
+    seconds = time.perf_counter() - started
+    return {
+        "users": created,
+        "roles": len(role_ids),
+        "role_assignments": assignments,
+        "seconds": round(seconds, 3),
+        "users_per_second": round(created / seconds, 1) if seconds else 0.0,
+    }
+
+
+def _sample_roles(rng: random.Random, role_ids: list[int], roles_per_user: float) -> list[int]:
+    """按平均密度为单个用户抽取角色，小数部分按概率进位。"""
+
+    count = int(roles_per_user) + (1 if rng.random() < roles_per_user - int(roles_per_user) else 0)
+    return rng.sample(role_ids, min(count, len(role_ids)))
+
+
 def main() -> None:
-    """CLI 入口：连接数据库并写入默认数据。"""
+    """CLI 入口：写入默认数据，按参数生成合成压测数据。"""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=0, help="合成用户数，0 表示只写入默认数据")
+    parser.add_argument("--roles", type=int, default=20, help="合成角色数")
+    parser.add_argument("--roles-per-user", type=float, default=2.0, help="每个用户平均绑定的角色数")
+    parser.add_argument("--inactive-ratio", type=float, default=0.05, help="停用用户比例")
+    parser.add_argument("--seed", type=int, default=42, help="随机数种子")
+    parser.add_argument("--batch-size", type=int, default=5000, help="每批写入的用户数")
+    args = parser.parse_args()
 
     import_model_modules()
     with SessionLocal() as session:
+        pin_primary(session)  # 种子数据需读到刚写入的角色与用户
         seed_base_data(session)
+        if args.users > 0:
+            stats = generate_synthetic_data(
+                session,
+                users=args.users,
+                roles=args.roles,
+                roles_per_user=args.roles_per_user,
+                inactive_ratio=args.inactive_ratio,
+                seed=args.seed,
+                batch_size=args.batch_size,
+            )
+            print(" ".join(f"{key}={value}" for key, value in stats.items()))
 
 
 if __name__ == "__main__":
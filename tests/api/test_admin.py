@@ -0,0 +1,168 @@
+"""后台用户管理 API 的集成测试。"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.apps.auth.bulk_import import reset_import_hasher
+from app.apps.auth.repository import RoleRepository, UserRepository
+from app.core.cache import reset_cache
+from app.db.init_db import drop_db, init_db
+from app.db.session import SessionLocal, reset_session_factory
+from app.main import create_app
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Generator[TestClient, None, None]:
+    """构造携带独立数据库的 TestClient，并预置 admin/user 角色。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): 环境变量注入工具。
+        tmp_path (Path): pytest 提供的临时目录。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'admin.sqlite'}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    monkeypatch.setenv("BULK_IMPORT_WORKERS", "1")
+    reset_session_factory()
+    reset_cache()
+    init_db()
+    with SessionLocal() as db:
+        RoleRepository().create(db, name="admin")
+        RoleRepository().create(db, name="user")
+
+    test_client = TestClient(create_app())
+    try:
+        yield test_client
+    finally:
+        test_client.close()
+        drop_db()
+        reset_import_hasher()
+
+
+def _login(client: TestClient, email: str, *, admin: bool) -> dict[str, str]:
+    """注册并登录用户，按需授予 admin 角色，返回鉴权头。"""
+
+    password = "StrongPass123"
+    response = client.post("/api/v1/auth/register", json={"email": email, "password": password})
+    assert response.status_code == 201
+    if admin:
+        with SessionLocal() as db:
+            user = UserRepository().get_by_email(db, email)
+            admin_role = RoleRepository().get_by_name(db, "admin")
+            UserRepository().set_roles(db, user=user, role_ids=[admin_role.id])
+    token = client.post("/api/v1/auth/login", json={"email": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_import_requires_admin_role(client: TestClient) -> None:
+    """非管理员调用导入接口应返回 403。"""
+
+    headers = _login(client, "user@example.com", admin=False)
+    files = {"file": ("users.csv", b"email,password\nx@example.com,Password1\n", "text/csv")}
+
+    response = client.post("/api/v1/admin/users/import", files=files, headers=headers)
+
+    assert response.status_code == 403
+
+
+def test_admin_imports_users_from_csv(client: TestClient) -> None:
+    """管理员上传 CSV 后应返回导入报告，新用户可直接登录。"""
+
+    headers = _login(client, "admin@example.com", admin=True)
+    csv_body = "email,password,roles\nnew@example.com,Password1,user\nadmin@example.com,Password2,\n"
+    files = {"file": ("users.csv", csv_body.encode(), "text/csv")}
+
+    response = client.post("/api/v1/admin/users/import", files=files, headers=headers)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 1
+    assert report["existing"] == 1
+    assert report["role_assignments"] == 1
+    login = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "Password1"})
+    assert login.status_code == 200
+
+
+def test_import_rejects_unknown_format(client: TestClient) -> None:
+    """无法推断格式的文件应返回 400。"""
+
+    headers = _login(client, "admin@example.com", admin=True)
+    files = {"file": ("users.txt", b"", "text/plain")}
+
+    response = client.post("/api/v1/admin/users/import", files=files, headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_import_rejects_non_utf8_file_before_writing(client: TestClient) -> None:
+    """非 UTF-8 文件应在写库前返回 400，即使前面的行可以正常解析。"""
+
+    headers = _login(client, "admin@example.com", admin=True)
+    body = b"email,password\nfirst@example.com,Password1\n" + b"second@example.com,P\xe4ssword1\n"
+    files = {"file": ("users.csv", body, "text/csv")}
+
+    response = client.post("/api/v1/admin/users/import", files=files, headers=headers)
+
+    assert response.status_code == 400
+    login = client.post("/api/v1/auth/login", json={"email": "first@example.com", "password": "Password1"})
+    assert login.status_code == 401
+
+
+@pytest.mark.parametrize(("name", "value"), [("BULK_IMPORT_MAX_BYTES", "32"), ("BULK_IMPORT_MAX_ROWS", "1")])
+def test_import_rejects_files_over_limits(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, name: str, value: str
+) -> None:
+    """超过字节数或行数上限的上传应返回 413。"""
+
+    from app.core.config import get_settings
+
+    headers = _login(client, "admin@example.com", admin=True)
+    monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    csv_body = b"email,password\na@example.com,Password1\nb@example.com,Password1\n"
+    files = {"file": ("users.csv", csv_body, "text/csv")}
+
+    response = client.post("/api/v1/admin/users/import", files=files, headers=headers)
+
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize(
+    "path", ["password-executor", "principal-cache", "token-revocation", "cache", "logging", "db-pool"]
+)
+def test_internal_routes_require_admin_role(client: TestClient, path: str) -> None:
+    """内部运维接口对匿名请求返回 401，对非管理员返回 403，仅管理员可读取。"""
+
+    url = f"/api/v1/internal/{path}"
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers=_login(client, "user@example.com", admin=False)).status_code == 403
+    assert client.get(url, headers=_login(client, "admin@example.com", admin=True)).status_code == 200
+
+
+def test_role_guard_uses_token_roles_in_rich_claims_mode(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """rich claims 模式下角色守卫按 token 中的角色判断，授予的角色在刷新 token 后生效。"""
+
+    from app.core.config import get_settings
+
+    monkeypatch.setenv("ACCESS_TOKEN_RICH_CLAIMS", "true")
+    get_settings.cache_clear()
+    password = "StrongPass123"
+    client.post("/api/v1/auth/register", json={"email": "late@example.com", "password": password})
+    tokens = client.post("/api/v1/auth/login", json={"email": "late@example.com", "password": password}).json()
+    files = {"file": ("users.csv", b"email,password\nx@example.com,Password1\n", "text/csv")}
+
+    with SessionLocal() as db:
+        user = UserRepository().get_by_email(db, "late@example.com")
+        admin_role = RoleRepository().get_by_name(db, "admin")
+        UserRepository().set_roles(db, user=user, role_ids=[admin_role.id])
+
+    stale = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.post("/api/v1/admin/users/import", files=files, headers=stale).status_code == 403
+
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+    fresh = {"Authorization": f"Bearer {refreshed['access_token']}"}
+    assert client.post("/api/v1/admin/users/import", files=files, headers=fresh).status_code == 200
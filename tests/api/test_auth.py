@@ -7,6 +7,9 @@ from collections.abc import Generator
 import pytest
 from fastapi.testclient import TestClient
 
+from app.apps.auth.cache import get_principal_cache
+from app.apps.auth.throttle import reset_login_throttle
+from app.core.cache import reset_cache
 from app.main import create_app
 from app.db.init_db import drop_db, init_db
 from app.db.session import reset_session_factory
@@ -25,6 +28,8 @@ def client_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Generator[TestC
     monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_file}")
     monkeypatch.setenv("SECRET_KEY", "test-secret")
     reset_session_factory()
+    reset_cache()  # 每个用例使用新库，避免复用上一用例的缓存主体
+    reset_login_throttle()
     init_db()
 
     app = create_app()
@@ -66,16 +71,21 @@ def test_register_user_returns_basic_profile(client: TestClient) -> None:
 
 
 def test_register_duplicate_email_returns_400(client: TestClient) -> None:
-    """重复邮箱注册应提示 400。
+    """重复邮箱（含仅大小写不同）注册应提示 400，注册只发送一条 INSERT。
 
     Args:
         client (TestClient): 测试客户端。
     """
 
-    _register_user(client, email="bob@example.com")
     payload = {"email": "bob@example.com", "password": "Aa123456", "full_name": "Bob"}
-    response = client.post("/api/v1/auth/register", json=payload)
+    first = client.post("/api/v1/auth/register", json=payload)
+    assert first.status_code == 201
+    assert _query_count(first) == 1
+
+    response = client.post("/api/v1/auth/register", json={**payload, "email": "Bob@Example.com"})
     assert response.status_code == 400
+    assert response.json()["message"] == "Email already exists"
+    assert _query_count(response) == 1
 
 
 def test_login_returns_tokens(client: TestClient) -> None:
@@ -141,3 +151,156 @@ def test_refresh_returns_new_tokens(client: TestClient) -> None:
     body = refresh_resp.json()
     assert body["access_token"]
     assert body["refresh_token"]
+
+
+def test_login_returns_503_when_password_executor_saturated(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """密码哈希执行器饱和时登录应快速返回 503。
+
+    Args:
+        client (TestClient): 测试客户端。
+        monkeypatch (pytest.MonkeyPatch): 用于替换执行器。
+    """
+
+    from app.core.hashing import PasswordExecutorSaturatedError
+
+    _register_user(client)
+
+    class _SaturatedExecutor:
+        async def verify_async(self, password: str, hashed_password: str) -> bool:
+            raise PasswordExecutorSaturatedError("saturated")
+
+    monkeypatch.setattr("app.apps.auth.service.get_password_executor", _SaturatedExecutor)
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "user@example.com", "password": "StrongPass123"},
+    )
+    assert response.status_code == 503
+    assert response.json()["code"] == "service_busy"
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_me_endpoint_served_from_principal_cache(client: TestClient) -> None:
+    """第二次访问 /me 应命中主体缓存，停用后立即失效。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    from app.apps.auth.repository import UserRepository
+    from app.db.session import SessionLocal
+
+    _register_user(client)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": "user@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    cached_resp = client.get("/api/v1/auth/me", headers=headers)
+    assert cached_resp.status_code == 200
+    assert cached_resp.json()["full_name"] == "Tester"
+    assert get_principal_cache().stats()["hits"] == 1
+
+    with SessionLocal() as db:
+        repo = UserRepository()
+        user = repo.get_by_email(db, "user@example.com")
+        assert user is not None
+        repo.deactivate(db, user=user)
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def _query_count(response) -> int:  # noqa: ANN001 - httpx.Response
+    """从 Server-Timing 响应头解析请求内执行的 SQL 条数。"""
+
+    import re
+
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["Server-Timing"])
+    assert match is not None
+    return int(match.group(1))
+
+
+def test_me_query_budget(client: TestClient) -> None:
+    """/auth/me 首次请求最多 2 条查询（用户 + 角色），命中主体缓存后不再访问数据库。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    _register_user(client)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": "user@example.com", "password": "StrongPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    assert _query_count(client.get("/api/v1/auth/me", headers=headers)) <= 2
+    assert _query_count(client.get("/api/v1/auth/me", headers=headers)) == 0
+
+
+def test_login_locked_out_after_repeated_failures(client: TestClient) -> None:
+    """同一邮箱连续失败达到上限后返回 429 与 Retry-After，锁定期内正确密码同样被拒绝。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    _register_user(client)
+    wrong = {"email": "user@example.com", "password": "WrongPass123"}
+    for _ in range(5):
+        assert client.post("/api/v1/auth/login", json=wrong).status_code == 401
+
+    response = client.post("/api/v1/auth/login", json={"email": "USER@example.com", "password": "StrongPass123"})
+    assert response.status_code == 429
+    assert response.json()["code"] == "too_many_attempts"
+    assert int(response.headers["Retry-After"]) == 60
+    assert _query_count(response) == 0  # 锁定期内不查库也不校验密码
+
+
+def test_rich_claims_token_serves_me_without_database(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """启用 rich claims 后 /auth/me 不访问数据库；刷新时重新加载主体，停用用户无法刷新。
+
+    Args:
+        client (TestClient): 测试客户端。
+        monkeypatch (pytest.MonkeyPatch): 环境变量注入工具。
+    """
+
+    import jwt
+
+    from app.apps.auth.repository import UserRepository
+    from app.core.config import get_settings
+    from app.db.session import SessionLocal
+
+    monkeypatch.setenv("ACCESS_TOKEN_RICH_CLAIMS", "true")
+    get_settings.cache_clear()
+    _register_user(client)
+    tokens = client.post(
+        "/api/v1/auth/login",
+        json={"email": "user@example.com", "password": "StrongPass123"},
+    ).json()
+
+    claims = jwt.decode(tokens["access_token"], options={"verify_signature": False})
+    assert (claims["email"], claims["name"], claims["active"], claims["roles"]) == (
+        "user@example.com",
+        "Tester",
+        True,
+        [],
+    )
+
+    me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert me.status_code == 200
+    assert me.json()["full_name"] == "Tester"
+    assert _query_count(me) == 0
+
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert jwt.decode(refreshed.json()["access_token"], options={"verify_signature": False})["email"]
+
+    with SessionLocal() as db:
+        repo = UserRepository()
+        repo.deactivate(db, user=repo.get_by_email(db, "user@example.com"))
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": refreshed.json()["refresh_token"]})
+    assert response.status_code == 401
@@ -0,0 +1,109 @@
+"""Token 吊销：注销与 refresh 轮换的集成测试。"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.apps.auth.revocation import get_revocation_list, reset_revocation_list
+from app.apps.auth.throttle import reset_login_throttle
+from app.core.cache import reset_cache
+from app.db.init_db import drop_db, init_db
+from app.db.session import reset_session_factory
+from app.main import create_app
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Generator[TestClient, None, None]:
+    """构造携带独立数据库、空吊销名单与空登录限流计数的 TestClient。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): 环境变量注入工具。
+        tmp_path (Path): pytest 提供的临时目录。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'revocation.sqlite'}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    reset_session_factory()
+    reset_revocation_list()
+    reset_login_throttle()
+    reset_cache()
+    init_db()
+
+    test_client = TestClient(create_app())
+    try:
+        yield test_client
+    finally:
+        test_client.close()
+        drop_db()
+        reset_revocation_list()
+
+
+def _login(client: TestClient) -> dict[str, str]:
+    """注册并登录测试用户，返回 token 对。"""
+
+    payload = {"email": "user@example.com", "password": "StrongPass123", "full_name": "Tester"}
+    assert client.post("/api/v1/auth/register", json=payload).status_code == 201
+    response = client.post("/api/v1/auth/login", json={"email": payload["email"], "password": payload["password"]})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_logout_revokes_access_and_refresh_tokens(client: TestClient) -> None:
+    """注销后旧 access token 与随请求提交的 refresh token 均失效，重复注销被拒绝。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 204
+
+    me = client.get("/api/v1/auth/me", headers=headers)
+    assert me.status_code == 401
+    assert me.json()["message"] == "Token revoked"
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 401
+
+
+def test_refresh_rotation_rejects_reused_token(client: TestClient) -> None:
+    """refresh token 只能使用一次，新签发的 token 对仍然有效。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    tokens = _login(client)
+    first = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert first.status_code == 200
+
+    replay = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+
+    rotated = first.json()
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 200
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+
+def test_unrevoked_tokens_are_answered_by_local_filter(client: TestClient) -> None:
+    """未吊销 token 的检查由本地过滤器直接放行，不访问吊销存储。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    for _ in range(3):
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    stats = get_revocation_list().stats()
+    assert stats["filter_negatives"] == 3
+    assert stats["store_lookups"] == 0
@@ -0,0 +1,47 @@
+"""`/.well-known/jwks.json` 的测试用例。"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.keyring import generate_private_key_pem
+from app.core.security import create_access_token
+from app.db.session import reset_session_factory
+from app.main import create_app
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    """配置 EdDSA 签名私钥的 TestClient。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): 环境变量注入工具。
+    """
+
+    monkeypatch.setenv("JWT_SIGNING_KEY", generate_private_key_pem("EdDSA"))
+    reset_session_factory()  # 同时清空 Settings 缓存
+    with TestClient(create_app()) as test_client:
+        yield test_client
+    monkeypatch.delenv("JWT_SIGNING_KEY")
+    reset_session_factory()
+
+
+def test_jwks_verifies_issued_tokens_and_is_cacheable(client: TestClient) -> None:
+    """JWKS 可被缓存，且其中的公钥能验证本服务签发的 token。
+
+    Args:
+        client (TestClient): 测试客户端。
+    """
+
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+
+    token = create_access_token(5)
+    kid = jwt.get_unverified_header(token)["kid"]
+    jwk = next(key for key in response.json()["keys"] if key["kid"] == kid)
+    assert jwt.decode(token, jwt.PyJWK(jwk).key, algorithms=["EdDSA"])["sub"] == "5"
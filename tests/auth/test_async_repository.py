@@ -0,0 +1,88 @@
+"""异步用户与角色仓储的行为测试。"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import reset_cache
+from app.db.init_db import drop_db, init_db
+from app.db.session import AsyncSessionLocal, get_async_engine, reset_session_factory
+
+
+@pytest_asyncio.fixture(name="db")
+async def async_db_session(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> AsyncGenerator[AsyncSession, None]:
+    """构造基于临时 SQLite 文件的 AsyncSession。
+
+    建表仍走同步 `init_db`，验证同步与异步 Engine 指向同一数据库。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): pytest 提供的环境修改工具。
+        tmp_path (Path): pytest 提供的临时目录。
+
+    Returns:
+        AsyncGenerator[AsyncSession, None]: 可用于异步数据库操作的会话。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'async.sqlite'}")
+    reset_session_factory()
+    reset_cache()
+    init_db()
+    engine = get_async_engine()
+    session = AsyncSessionLocal(bind=engine)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await engine.dispose()
+        drop_db()
+
+
+@pytest.mark.asyncio
+async def test_async_create_user_and_query_by_email(db: AsyncSession) -> None:
+    """验证异步仓储创建用户后可通过邮箱与 ID 查询。
+
+    Args:
+        db (AsyncSession): 预置的异步数据库会话。
+    """
+
+    from app.apps.auth.repository import AsyncUserRepository
+
+    user_repo = AsyncUserRepository()
+    created = await user_repo.create(db, email="alice@example.com", password_hash="hashed", full_name="Alice")
+
+    by_email = await user_repo.get_by_email(db, "alice@example.com")
+    by_id = await user_repo.get_by_id(db, created.id)
+    assert by_email is not None and by_email.id == created.id
+    assert by_id is not None and by_id.full_name == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_async_assign_roles_to_user(db: AsyncSession) -> None:
+    """验证异步仓储的角色绑定，含聚合分隔符的角色名被拒绝。
+
+    Args:
+        db (AsyncSession): 预置的异步数据库会话。
+    """
+
+    from app.apps.auth.repository import AsyncRoleRepository, AsyncUserRepository
+
+    role_repo = AsyncRoleRepository()
+    user_repo = AsyncUserRepository()
+
+    admin_role = await role_repo.create(db, name="admin")
+    editor_role = await role_repo.create(db, name="editor")
+    user = await user_repo.create(db, email="bob@example.com", password_hash="hashed")
+
+    await user_repo.set_roles(db, user=user, role_ids=[admin_role.id, editor_role.id])
+
+    roles = await user_repo.list_roles(db, user.id)
+    assert {role.name for role in roles} == {"admin", "editor"}
+    with pytest.raises(ValueError):
+        await role_repo.create(db, name="admin,ops")
@@ -0,0 +1,110 @@
+"""批量导入用户的测试。"""
+
+from __future__ import annotations
+
+import io
+import json
+from collections.abc import Generator, Sequence
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.apps.auth.bulk_import import BulkUserImporter, ProcessPoolHasher, iter_rows
+from app.apps.auth.models import User
+from app.apps.auth.repository import RoleRepository, UserRepository
+from app.core.security import verify_password
+from app.db.init_db import drop_db, init_db
+from app.db.session import SessionLocal, reset_session_factory
+
+
+@pytest.fixture(name="db")
+def db_session(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Generator[Session, None, None]:
+    """构造预置 admin/user 角色的 SQLite 文件库会话。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): pytest 提供的环境修改工具。
+        tmp_path (Path): pytest 提供的临时目录。
+
+    Returns:
+        Generator[Session, None, None]: 可用于数据库操作的会话。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'bulk.sqlite'}")
+    reset_session_factory()
+    init_db()
+    session = SessionLocal()
+    RoleRepository().create(session, name="admin")
+    RoleRepository().create(session, name="user")
+    try:
+        yield session
+    finally:
+        session.close()
+        drop_db()
+
+
+def _fake_hasher(passwords: Sequence[str]) -> list[str]:
+    """跳过 bcrypt 的哈希函数，便于断言与加速。"""
+
+    return [f"hashed:{password}" for password in passwords]
+
+
+def test_csv_import_creates_users_and_assigns_roles(db: Session) -> None:
+    """CSV 导入应批量创建用户、分配角色，并报告无效行与未知角色。"""
+
+    UserRepository().create(db, email="old@example.com", password_hash="x")
+    csv_text = (
+        "email,password,full_name,is_active,roles\n"
+        "a@example.com,Password1,Alice,,admin;user\n"
+        "b@example.com,Password2,,false,user\n"
+        "old@example.com,Password3,,,user\n"
+        "not-an-email,Password4,,,\n"
+        "c@example.com,Password5,,,ghost\n"
+        "a@example.com,Password6,,,\n"
+    )
+
+    report = BulkUserImporter(db, hasher=_fake_hasher, batch_size=2).run(iter_rows(io.StringIO(csv_text), "csv"))
+
+    assert report.total == 6
+    assert report.created == 3
+    assert report.existing == 2
+    assert report.invalid == 1
+    assert report.errors[0]["line"] == 5
+    assert report.role_assignments == 3
+    assert report.unknown_roles == {"ghost"}
+
+    alice = UserRepository().get_by_email(db, "a@example.com", load="with_roles")
+    assert alice is not None and alice.password_hash == "hashed:Password1"
+    assert {role.name for role in alice.roles} == {"admin", "user"}
+    bob = db.execute(select(User).where(User.email == "b@example.com")).scalar_one()
+    assert bob.is_active is False and bob.full_name is None
+
+
+def test_ndjson_import_is_idempotent(db: Session) -> None:
+    """NDJSON 导入重复执行时不应重复创建用户或角色关联。"""
+
+    lines = [
+        json.dumps({"email": "a@example.com", "password": "Password1", "roles": ["user"]}),
+        "",
+        "{broken",
+        json.dumps({"email": "b@example.com", "password": "Password2"}),
+    ]
+
+    first = BulkUserImporter(db, hasher=_fake_hasher).run(iter_rows(lines, "ndjson"))
+    second = BulkUserImporter(db, hasher=_fake_hasher).run(iter_rows(lines, "ndjson"))
+
+    assert (first.created, first.invalid, first.role_assignments) == (2, 1, 1)
+    assert (second.created, second.existing, second.role_assignments) == (0, 2, 0)
+    alice = UserRepository().get_by_email(db, "a@example.com")
+    assert alice is not None
+    assert [role.name for role in UserRepository().list_roles(db, alice.id)] == ["user"]
+
+
+def test_process_pool_hasher_produces_bcrypt_hashes() -> None:
+    """进程池哈希的结果应能被 verify_password 校验。"""
+
+    with ProcessPoolHasher(workers=2) as hasher:
+        hashes = hasher(["Password1", "Password2"])
+
+    assert verify_password("Password1", hashes[0])
+    assert verify_password("Password2", hashes[1])
@@ -0,0 +1,135 @@
+"""关系加载策略的回归测试：角色查询不得连带加载全部用户。"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.apps.auth.models import Role, User, UserRole
+from app.db.init_db import drop_db, init_db
+from app.db.session import SessionLocal, get_engine, reset_session_factory
+
+USER_COUNT = 5000
+
+
+@pytest.fixture(name="db")
+def seeded_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Session, None, None]:
+    """构造所有用户都绑定 `user` 角色的大数据集。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): pytest 提供的环境修改工具。
+        tmp_path (Path): pytest 提供的临时目录。
+
+    Returns:
+        Generator[Session, None, None]: 已写入数据集的会话。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'loading.sqlite'}")
+    reset_session_factory()
+    init_db()
+    with get_engine().begin() as conn:
+        conn.execute(insert(Role), [{"id": 1, "name": "user"}])
+        conn.execute(
+            insert(User),
+            [
+                {"id": i, "email": f"user{i}@example.com", "password_hash": "hashed", "is_active": True}
+                for i in range(1, USER_COUNT + 1)
+            ],
+        )
+        conn.execute(insert(UserRole), [{"user_id": i, "role_id": 1} for i in range(1, USER_COUNT + 1)])
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        drop_db()
+
+
+@pytest.fixture(name="statements")
+def statement_recorder(db: Session) -> Generator[list[str], None, None]:
+    """记录测试期间发往数据库的 SQL 语句。
+
+    Args:
+        db (Session): 已写入数据集的会话。
+
+    Returns:
+        Generator[list[str], None, None]: 按执行顺序记录的语句列表。
+    """
+
+    recorded: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        recorded.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield recorded
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_role_lookup_does_not_load_role_users(db: Session, statements: list[str]) -> None:
+    """按名称加载角色只执行一条查询，且不水合任何用户。
+
+    Args:
+        db (Session): 已写入数据集的会话。
+        statements (list[str]): 语句记录。
+    """
+
+    from app.apps.auth.repository import RoleRepository
+
+    role = RoleRepository().get_by_name(db, "user")
+
+    assert role is not None
+    assert len(statements) == 1
+    assert "users" in inspect(role).unloaded
+    assert len(db.identity_map) == 1
+
+
+def test_role_lookup_with_users_profile_is_explicit(db: Session, statements: list[str]) -> None:
+    """显式选择 "with_users" 时才加载角色下的全部用户。
+
+    Args:
+        db (Session): 已写入数据集的会话。
+        statements (list[str]): 语句记录。
+    """
+
+    from app.apps.auth.repository import RoleRepository
+
+    role = RoleRepository().get_by_name(db, "user", load="with_users")
+
+    assert role is not None
+    assert len(statements) == 2
+    assert len(role.users) == USER_COUNT
+
+
+def test_user_lookup_profiles(db: Session, statements: list[str]) -> None:
+    """用户默认不加载角色，"with_roles" 额外一条 selectin 查询。
+
+    Args:
+        db (Session): 已写入数据集的会话。
+        statements (list[str]): 语句记录。
+    """
+
+    from app.apps.auth.repository import UserRepository
+
+    repo = UserRepository()
+    bare = repo.get_by_id(db, 1)
+    assert bare is not None
+    assert "roles" in inspect(bare).unloaded
+    assert len(statements) == 1
+
+    db.expunge_all()
+    statements.clear()
+    with_roles = repo.get_by_id(db, 2, load="with_roles")
+    assert with_roles is not None
+    assert len(statements) == 2
+    assert [role.name for role in with_roles.roles] == ["user"]
+    assert "users" in inspect(with_roles.roles[0]).unloaded
+    assert len(db.identity_map) == 2
@@ -0,0 +1,100 @@
+"""主体缓存（通用缓存 `principal` 命名空间）的加载、TTL 与失效测试。"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from pathlib import Path
+
+import fakeredis
+import pytest
+from sqlalchemy.orm import Session
+
+from app.apps.auth.cache import PRINCIPAL_NAMESPACE, get_principal_cache, principal_key
+from app.apps.auth.repository import AsyncUserRepository, UserRepository
+from app.core.cache import MISSING, MemoryBackend, RedisBackend, reset_cache
+from app.core.config import get_settings
+from app.db.init_db import drop_db, init_db
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_engine, reset_session_factory
+
+
+def _redis_backend(server: fakeredis.FakeServer) -> RedisBackend:
+    return RedisBackend(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+
+
+@pytest.fixture(name="db")
+def db_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Session, None, None]:
+    """构造基于临时 SQLite 文件的会话，异步用例共用同一数据库。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): pytest 提供的环境修改工具。
+        tmp_path (Path): pytest 提供的临时目录。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'principal.sqlite'}")
+    reset_session_factory()
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        reset_cache()
+        drop_db()
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "redis"])
+def test_get_principal_loads_once_with_configured_ttl(db: Session, backend_name: str) -> None:
+    """重复读取只查询一次数据库，条目使用 `principal_cache_ttl_seconds`。"""
+
+    backend = MemoryBackend(max_size=100) if backend_name == "memory" else _redis_backend(fakeredis.FakeServer())
+    reset_cache(backend)
+    repo = UserRepository()
+    user = repo.create(db, email="dora@example.com", password_hash="hashed")
+
+    assert repo.get_principal(db, user.id) == repo.get_principal(db, user.id)
+
+    stats = get_principal_cache().stats()
+    assert (stats["loads"], stats["hits"]) == (1, 1)
+    assert get_principal_cache().ttl == get_settings().principal_cache_ttl_seconds
+    if isinstance(backend, RedisBackend):
+        ttl_ms = backend.client.pttl(f"{PRINCIPAL_NAMESPACE}:{principal_key(user.id)}")
+        assert 0 < ttl_ms <= get_settings().principal_cache_ttl_seconds * 1000
+
+
+def test_deactivation_invalidates_principal_for_other_workers(db: Session) -> None:
+    """Redis 后端下，一个 worker 停用用户后其他 worker 立即读到最新主体。"""
+
+    server = fakeredis.FakeServer()
+    repo = UserRepository()
+    user = repo.create(db, email="erin@example.com", password_hash="hashed")
+
+    reset_cache(_redis_backend(server))  # worker A 缓存活跃主体
+    assert repo.get_principal(db, user.id).is_active
+
+    reset_cache(_redis_backend(server))  # worker B 停用用户
+    repo.deactivate(db, user=user)
+
+    reset_cache(_redis_backend(server))  # worker A 再次鉴权
+    assert get_principal_cache().get(principal_key(user.id), MISSING) is MISSING
+    assert not repo.get_principal(db, user.id).is_active
+
+
+@pytest.mark.asyncio
+async def test_async_get_principal_is_cached_and_invalidated(db: Session) -> None:
+    """异步仓储共用同一命名空间，写操作提交后失效。"""
+
+    reset_cache(_redis_backend(fakeredis.FakeServer()))
+    user = UserRepository().create(db, email="fay@example.com", password_hash="hashed")
+    engine = get_async_engine()
+    repo = AsyncUserRepository()
+    try:
+        async with AsyncSessionLocal(bind=engine) as session:
+            assert (await repo.get_principal(session, user.id)).full_name is None
+            assert get_principal_cache().stats()["loads"] == 1
+
+            async_user = await repo.get_by_id(session, user.id)
+            await repo.update(session, user=async_user, full_name="Fay")
+            assert (await repo.get_principal(session, user.id)).full_name == "Fay"
+            assert get_principal_cache().stats()["loads"] == 2
+    finally:
+        await engine.dispose()
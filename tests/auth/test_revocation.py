@@ -0,0 +1,106 @@
+"""吊销存储、布隆过滤器与名单同步的测试。"""
+
+from __future__ import annotations
+
+import time
+
+import fakeredis
+import pytest
+
+from app.apps.auth.revocation import (
+    BloomFilter,
+    MemoryRevocationStore,
+    RedisRevocationStore,
+    RevocationList,
+    RevocationStore,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request: pytest.FixtureRequest) -> RevocationStore:
+    """分别以进程内存储与 fakeredis 支撑的 Redis 存储运行用例。"""
+
+    if request.param == "memory":
+        return MemoryRevocationStore()
+    server = fakeredis.FakeServer()
+    return RedisRevocationStore(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives() -> None:
+    """已加入的元素必然命中，未加入元素的误报率接近目标值。"""
+
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    members = [f"member-{i}" for i in range(1000)]
+    for member in members:
+        bloom.add(member)
+
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_store_revokes_once_until_expiry(store: RevocationStore) -> None:
+    """同一 jti 只有首次吊销返回 True，记录随 token 过期失效。"""
+
+    now = time.time()
+    assert store.revoke("a", now + 60) is True
+    assert store.revoke("a", now + 60) is False
+    assert store.is_revoked("a") is True
+    assert store.is_revoked("b") is False
+
+    store.revoke("short", now + 0.05)
+    time.sleep(0.1)
+    assert store.is_revoked("short") is False
+    assert store.active() == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_async_api_shares_records_with_sync_api(store: RevocationStore) -> None:
+    """异步接口与同步接口读写同一份记录。"""
+
+    assert await store.revoke_async("a", time.time() + 60) is True
+    assert store.is_revoked("a") is True
+    assert await store.is_revoked_async("a") is True
+    assert store.revoke("a", time.time() + 60) is False
+
+
+def test_revocation_list_picks_up_other_workers_on_sync(store: RevocationStore) -> None:
+    """其他 worker 写入的吊销在同步后生效，未吊销 token 不访问存储。"""
+
+    local = RevocationList(store, capacity=100, error_rate=0.001)
+    other_worker = RevocationList(store, capacity=100, error_rate=0.001)
+    expires_at = time.time() + 60
+
+    assert local.revoke("mine", expires_at) is True
+    assert local.is_revoked("mine") is True
+    assert local.is_revoked(None) is False
+
+    other_worker.revoke("theirs", expires_at)
+    assert local.is_revoked("theirs") is False  # 同步前过滤器尚未包含
+    local.sync()
+    assert local.is_revoked("theirs") is True
+    assert local.is_revoked("mine") is True
+
+    assert local.is_revoked("never-revoked") is False
+    stats = local.stats()
+    assert stats["store_lookups"] == 3
+    assert stats["filter_negatives"] == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_store_close_async_closes_both_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """异步关闭应同时断开同步与异步连接池。"""
+
+    server = fakeredis.FakeServer()
+    store = RedisRevocationStore(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    closed: list[str] = []
+    monkeypatch.setattr(store.client, "close", lambda: closed.append("sync"))
+
+    async def aclose() -> None:
+        closed.append("async")
+
+    monkeypatch.setattr(store.async_client, "aclose", aclose)
+
+    await store.close_async()
+
+    assert closed == ["sync", "async"]
@@ -0,0 +1,164 @@
+"""登录限流后端与锁定递增策略的测试。"""
+
+from __future__ import annotations
+
+import time
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+
+from app.apps.auth.throttle import (
+    LockoutPolicy,
+    LoginThrottle,
+    LoginThrottledError,
+    MemoryThrottleBackend,
+    RedisThrottleBackend,
+    ThrottleBackend,
+    ThrottleRule,
+    get_login_throttle,
+    reset_login_throttle,
+)
+from app.core.config import Settings, get_settings
+from app.core.dependencies import get_client_ip
+from app.core.metrics import LOGIN_THROTTLE_REJECTIONS
+
+POLICY = LockoutPolicy(base_seconds=10, max_seconds=25, reset_seconds=3600)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request: pytest.FixtureRequest) -> ThrottleBackend:
+    """分别以进程内计数与 fakeredis（Lua 脚本）支撑的 Redis 后端运行用例。"""
+
+    if request.param == "memory":
+        return MemoryThrottleBackend()
+    server = fakeredis.FakeServer()
+    return RedisThrottleBackend(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+
+
+def _throttle(backend: ThrottleBackend) -> LoginThrottle:
+    return LoginThrottle(
+        backend,
+        rules=(ThrottleRule("email", 3, 60), ThrottleRule("ip", 5, 60)),
+        policy=POLICY,
+    )
+
+
+def test_lockout_escalates_and_is_capped(backend: ThrottleBackend) -> None:
+    """窗口内失败达到上限即锁定，再次触发时锁定时长翻倍且不超过上限。"""
+
+    rule = ThrottleRule("email", 2, 60)
+    assert backend.record_failure("k", rule, POLICY) == 0
+    assert backend.record_failure("k", rule, POLICY) == pytest.approx(10)
+    assert 9 < backend.retry_after(["k", "other"])[0] <= 10
+    assert backend.retry_after(["k", "other"])[1] == 0
+
+    backend.record_failure("k", rule, POLICY)
+    assert backend.record_failure("k", rule, POLICY) == pytest.approx(20)
+    backend.record_failure("k", rule, POLICY)
+    assert backend.record_failure("k", rule, POLICY) == pytest.approx(25)
+
+
+def test_failures_outside_window_do_not_count(backend: ThrottleBackend) -> None:
+    """滑动窗口之外的失败不计入上限。"""
+
+    rule = ThrottleRule("email", 2, 0.05)
+    backend.record_failure("k", rule, POLICY)
+    time.sleep(0.1)
+    assert backend.record_failure("k", rule, POLICY) == 0
+
+
+def test_throttle_rejects_locked_email_and_ip(backend: ThrottleBackend) -> None:
+    """邮箱忽略大小写计数；成功登录清空邮箱记录；同一 IP 下不同邮箱的失败累计到 IP 上限。"""
+
+    throttle = _throttle(backend)
+    throttle.record_failure("a@example.com", "10.0.0.1")
+    throttle.record_failure("A@Example.com", "10.0.0.1")
+    throttle.record_success("a@example.com")
+    throttle.record_failure("a@example.com", "10.0.0.1")
+    throttle.check("a@example.com", "10.0.0.1")  # 成功登录后重新计数，尚未锁定
+
+    for index in range(2):
+        throttle.record_failure(f"user{index}@example.com", "10.0.0.1")
+
+    LOGIN_THROTTLE_REJECTIONS.clear()
+    with pytest.raises(LoginThrottledError) as exc_info:
+        throttle.check("fresh@example.com", "10.0.0.1")
+    assert exc_info.value.scope == "ip"
+    assert exc_info.value.retry_after > 0
+    assert LOGIN_THROTTLE_REJECTIONS.collect() == [[["ip"], 1.0]]
+
+    throttle.check("fresh@example.com", "10.0.0.2")
+    throttle.check("fresh@example.com", None)
+
+
+@pytest.mark.asyncio
+async def test_async_api_shares_counts_with_sync_api(backend: ThrottleBackend) -> None:
+    """异步接口与同步接口读写同一份计数。"""
+
+    throttle = _throttle(backend)
+    for _ in range(3):
+        await throttle.record_failure_async("b@example.com", None)
+
+    with pytest.raises(LoginThrottledError):
+        throttle.check("b@example.com", None)
+    with pytest.raises(LoginThrottledError):
+        await throttle.check_async("b@example.com", "10.0.0.3")
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_close_async_closes_both_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """异步关闭应同时断开同步与异步连接池。"""
+
+    server = fakeredis.FakeServer()
+    backend = RedisThrottleBackend(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    closed: list[str] = []
+    monkeypatch.setattr(backend.client, "close", lambda: closed.append("sync"))
+
+    async def aclose() -> None:
+        closed.append("async")
+
+    monkeypatch.setattr(backend.async_client, "aclose", aclose)
+
+    await backend.close_async()
+
+    assert closed == ["sync", "async"]
+
+
+@pytest.mark.parametrize(
+    ("peer", "forwarded", "trusted", "expected"),
+    [
+        ("203.0.113.9", None, [], "203.0.113.9"),
+        ("203.0.113.9", "198.51.100.1", [], "203.0.113.9"),  # 未配置可信代理时忽略请求头
+        ("10.0.0.2", "198.51.100.1", ["10.0.0.0/8"], "198.51.100.1"),
+        ("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.5", ["10.0.0.0/8"], "198.51.100.1"),  # 左侧可被客户端伪造
+        ("10.0.0.2", None, ["10.0.0.0/8"], "10.0.0.2"),
+    ],
+)
+def test_client_ip_uses_forwarded_for_only_behind_trusted_proxies(
+    peer: str, forwarded: str | None, trusted: list[str], expected: str
+) -> None:
+    """仅当直连地址为可信代理时才采用 X-Forwarded-For 中最右侧的不可信地址。"""
+
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    request = Request({"type": "http", "headers": headers, "client": (peer, 40000)})
+
+    assert get_client_ip(request, Settings(_env_file=None, trusted_proxies=trusted)) == expected
+
+
+def test_ip_rule_is_disabled_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """未配置 IP 上限时只按邮箱限流，共享代理地址的客户端不会被一起锁定。"""
+
+    monkeypatch.delenv("LOGIN_MAX_FAILURES_PER_IP", raising=False)
+    get_settings.cache_clear()
+    reset_login_throttle()
+    try:
+        assert list(get_login_throttle().rules) == ["email"]
+        monkeypatch.setenv("LOGIN_MAX_FAILURES_PER_IP", "50")
+        get_settings.cache_clear()
+        reset_login_throttle()
+        assert list(get_login_throttle().rules) == ["email", "ip"]
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+        reset_login_throttle()
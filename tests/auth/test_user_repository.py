@@ -7,6 +7,7 @@ from collections.abc import Generator
 import pytest
 from sqlalchemy.orm import Session
 
+from app.core.cache import reset_cache
 from app.db.session import SessionLocal, reset_session_factory
 from app.db.init_db import init_db, drop_db
 
@@ -27,6 +28,7 @@ def db_session(monkeypatch: pytest.MonkeyPatch) -> Generator[Session, None, None
 
     monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
     reset_session_factory()
+    reset_cache()  # 每个用例使用新库，主键会复用，避免读到上一用例的缓存主体
     init_db()
     session = SessionLocal()
     try:
@@ -84,3 +86,178 @@ def test_assign_roles_to_user(db: Session) -> None:
     roles = user_repo.list_roles(db=db, user_id=user.id)
     names = {role.name for role in roles}
     assert names == {"admin", "editor"}
+
+
+def test_role_and_profile_changes_invalidate_principal_cache(db: Session) -> None:
+    """角色绑定与资料修改后应失效主体缓存。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from app.apps.auth.repository import RoleRepository, UserRepository
+
+    user_repo = UserRepository()
+    role = RoleRepository().create(db, name="admin")
+    user = user_repo.create(db=db, email="carol@example.com", password_hash="hashed")
+
+    assert user_repo.get_principal(db, user.id).roles == frozenset()
+    user_repo.set_roles(db=db, user=user, role_ids=[role.id])
+    assert user_repo.get_principal(db, user.id).roles == {"admin"}
+
+    updated = user_repo.update(db, user=user, full_name="Carol")
+    assert updated.full_name == "Carol"
+    assert user_repo.get_principal(db, user.id).full_name == "Carol"
+
+    with pytest.raises(ValueError):
+        user_repo.update(db, user=user, is_active=False)
+
+
+def test_get_principal_projects_roles_in_single_query(db: Session) -> None:
+    """投影查询应返回不可变主体并聚合角色名。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    import dataclasses
+
+    from app.apps.auth.repository import RoleRepository, UserRepository
+
+    user_repo = UserRepository()
+    admin = RoleRepository().create(db, name="admin")
+    editor = RoleRepository().create(db, name="editor")
+    user = user_repo.create(db=db, email="dave@example.com", password_hash="hashed", full_name="Dave")
+    plain = user_repo.create(db=db, email="erin@example.com", password_hash="hashed")
+    user_repo.set_roles(db=db, user=user, role_ids=[admin.id, editor.id])
+
+    principal = user_repo.get_principal(db, user.id)
+    assert principal is not None
+    assert (principal.id, principal.email, principal.full_name) == (user.id, "dave@example.com", "Dave")
+    assert principal.roles == frozenset({"admin", "editor"})
+    assert principal.has_role("admin", "auditor")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        principal.email = "other@example.com"  # type: ignore[misc]
+
+    no_roles = user_repo.get_principal(db, plain.id)
+    assert no_roles is not None and no_roles.roles == frozenset()
+    assert user_repo.get_principal(db, 9999) is None
+
+
+def test_get_current_user_merges_principal_without_query(db: Session) -> None:
+    """由主体构造的 User 应挂到当前 Session，并可懒加载其余属性。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from app.apps.auth.principal import Principal
+    from app.apps.auth.repository import UserRepository
+    from app.core.dependencies import get_current_user
+
+    created = UserRepository().create(db=db, email="frank@example.com", password_hash="hashed")
+    db.expunge_all()
+
+    principal = Principal(id=created.id, email="frank@example.com", full_name=None, is_active=True)
+    user = get_current_user(principal=principal, db=db)
+    assert user in db
+    assert user.password_hash == "hashed"
+    assert user.roles == []
+
+
+def test_email_lookup_and_uniqueness_ignore_case(db: Session) -> None:
+    """按邮箱检索忽略大小写，仅大小写不同的邮箱无法重复写入，冲突时返回 None。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from app.apps.auth.repository import UserRepository
+
+    user_repo = UserRepository()
+    created = user_repo.create(db=db, email="Carol@Example.com", password_hash="hashed")
+
+    fetched = user_repo.get_by_email(db, "carol@EXAMPLE.COM")
+    assert fetched is not None
+    assert fetched.id == created.id
+
+    assert user_repo.create(db=db, email="carol@example.com", password_hash="hashed") is None
+    assert user_repo.create(db=db, email="Carol@Example.com", password_hash="hashed") is None
+
+    # 非 ASCII 字符的大小写规则以数据库 lower() 为准，检索与唯一索引保持一致
+    accented = user_repo.create(db=db, email="Élise@example.com", password_hash="hashed")
+    assert user_repo.get_by_email(db, "Élise@EXAMPLE.com").id == accented.id
+
+
+def test_create_is_single_insert_returning(db: Session) -> None:
+    """用户与角色创建各只发送一条 INSERT ... RETURNING，名称冲突返回 None。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from app.apps.auth.repository import RoleRepository, UserRepository
+    from app.db.instrumentation import capture_queries
+
+    with capture_queries() as stats:
+        user = UserRepository().create(db=db, email="frank@example.com", password_hash="hashed", full_name="Frank")
+    assert stats.count == 1
+    assert user is not None
+    assert (user.full_name, user.is_active) == ("Frank", True)
+    assert user.created_at is not None  # 服务端默认值同样经 RETURNING 取回
+
+    role_repo = RoleRepository()
+    with capture_queries() as stats:
+        role = role_repo.create(db=db, name="auditor", description="只读审计")
+    assert stats.count == 1
+    assert role is not None and role.description == "只读审计"
+    assert role_repo.create(db=db, name="auditor") is None
+
+
+def test_role_names_cannot_contain_aggregation_separator(db: Session) -> None:
+    """含分隔符的角色名会在聚合后被拆成多个角色，创建时应拒绝。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from app.apps.auth.repository import RoleRepository
+
+    with pytest.raises(ValueError):
+        RoleRepository().create(db=db, name="admin,ops")
+    assert RoleRepository().get_by_name(db, "admin,ops") is None
+
+
+def test_hot_lookups_reuse_compiled_statements(db: Session) -> None:
+    """热点查询使用固定语句对象，重复调用应命中编译缓存并发送相同的 SQL。
+
+    Args:
+        db (Session): 预置的内存数据库会话。
+    """
+
+    from sqlalchemy import event
+    from sqlalchemy.engine.default import CACHE_HIT
+
+    from app.apps.auth.repository import UserRepository
+
+    user_repo = UserRepository()
+    first = user_repo.create(db=db, email="erin@example.com", password_hash="hashed")
+    second = user_repo.create(db=db, email="frank@example.com", password_hash="hashed")
+    user_repo.get_by_id(db, first.id)  # 预热编译缓存
+    user_repo.get_by_email(db, "erin@example.com")
+
+    executed: list[tuple[str, object]] = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        executed.append((statement, context.cache_hit))
+
+    try:
+        assert user_repo.get_by_id(db, second.id).email == "frank@example.com"
+        assert user_repo.get_by_email(db, "ERIN@example.com").id == first.id
+        assert user_repo.get_by_email(db, "frank@example.com").id == second.id
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", _record)
+
+    assert [hit for _, hit in executed] == [CACHE_HIT] * 3
+    assert executed[1][0] == executed[2][0]
@@ -0,0 +1,30 @@
+"""压测结果比较逻辑的测试。"""
+
+from __future__ import annotations
+
+from app.bench.load import compare
+
+
+def _result(rps: float, p95: float, p99: float) -> dict:
+    """构造只含单个场景与路由的结果。"""
+
+    route = {"count": 100, "errors": 0, "rps": rps, "p50_ms": 1.0, "p95_ms": p95, "p99_ms": p99}
+    return {"scenarios": {"me": {"routes": {"GET /api/v1/auth/me": route}}}}
+
+
+def test_compare_flags_throughput_and_tail_latency_regressions() -> None:
+    """RPS 下降或尾延迟上升超过阈值时应报告退化，阈值内的波动忽略。"""
+
+    baseline = _result(rps=1000, p95=10, p99=20)
+
+    assert compare(_result(rps=900, p95=11, p99=22), baseline, threshold=0.2) == []
+    regressions = compare(_result(rps=700, p95=10, p99=30), baseline, threshold=0.2)
+    assert len(regressions) == 2
+    assert any("rps" in line for line in regressions)
+    assert any("p99_ms" in line for line in regressions)
+
+
+def test_compare_ignores_routes_missing_from_baseline() -> None:
+    """基线中不存在的场景或路由不参与比较。"""
+
+    assert compare(_result(rps=1, p95=100, p99=100), {"scenarios": {}}, threshold=0.1) == []
@@ -0,0 +1,24 @@
+"""微基准计时与比较逻辑的测试。"""
+
+from __future__ import annotations
+
+from app.bench.micro import compare, measure
+
+
+def test_measure_reports_per_call_statistics() -> None:
+    """measure 应返回单次调用的耗时分布与自动确定的调用次数。"""
+
+    stats = measure(lambda: sum(range(10)), repeat=2)
+
+    assert stats["number"] >= 1
+    assert 0 < stats["min_us"] <= stats["median_us"]
+    assert stats["ops_per_sec"] > 0
+
+
+def test_compare_flags_slower_medians() -> None:
+    """中位数耗时超过基线阈值时报告退化，缺失的基准忽略。"""
+
+    baseline = {"benchmarks": {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}}}
+    current = {"benchmarks": {"a": {"median_us": 10.5}, "b": {"median_us": 12.0}, "c": {"median_us": 99.0}}}
+
+    assert compare(current, baseline, threshold=0.1) == ["b: 10.00us -> 12.00us"]
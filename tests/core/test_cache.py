@@ -0,0 +1,166 @@
+"""通用缓存后端、命名空间统计与 `cached` 装饰器的测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Generator
+
+import fakeredis
+import pytest
+
+from app.core.cache import (
+    MemoryBackend,
+    RedisBackend,
+    cache_stats,
+    cached,
+    get_cache,
+    reset_cache,
+    reset_cache_async,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request: pytest.FixtureRequest) -> Generator[MemoryBackend | RedisBackend, None, None]:
+    """分别以进程内 LRU 与 fakeredis 支撑的 Redis 后端运行用例。"""
+
+    if request.param == "memory":
+        instance: MemoryBackend | RedisBackend = MemoryBackend(max_size=100)
+    else:
+        server = fakeredis.FakeServer()
+        instance = RedisBackend(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    reset_cache(instance)
+    yield instance
+    reset_cache()
+
+
+def test_namespaces_isolate_keys_and_track_hit_ratio(backend: MemoryBackend | RedisBackend) -> None:
+    """不同命名空间互不影响，get_many 只返回命中项并计入统计。"""
+
+    users = get_cache("users", ttl=60)
+    roles = get_cache("roles", ttl=60)
+    users.set("1", {"email": "a@example.com"})
+    users.set("2", None)  # None 也是可缓存的值
+    roles.set("1", "admin")
+
+    assert users.get("1") == {"email": "a@example.com"}
+    assert users.get("2", "default") is None
+    assert users.get("3", "default") == "default"
+    assert users.get_many(["1", "3"]) == {"1": {"email": "a@example.com"}}
+    assert roles.get("1") == "admin"
+
+    users.delete("1")
+    assert users.get("1") is None
+
+    stats = cache_stats()
+    assert stats["users"]["hits"] == 3
+    assert stats["users"]["misses"] == 3
+    assert stats["users"]["hit_ratio"] == 0.5
+    assert stats["roles"]["hits"] == 1
+
+
+def test_entries_expire_after_ttl(backend: MemoryBackend | RedisBackend) -> None:
+    """条目在 TTL 后失效，ttl=None 的条目不过期。"""
+
+    cache = get_cache("short", ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=None)
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_async_api_shares_entries_with_sync_api(backend: MemoryBackend | RedisBackend) -> None:
+    """异步接口与同步接口读写同一份数据。"""
+
+    cache = get_cache("mixed", ttl=60)
+    await cache.set_async("k", [1, 2])
+
+    assert cache.get("k") == [1, 2]
+    assert await cache.get_many_async(["k", "missing"]) == {"k": [1, 2]}
+    await cache.delete_async("k")
+    assert await cache.get_async("k", "gone") == "gone"
+
+
+def test_memory_backend_evicts_least_recently_used() -> None:
+    """超过容量时淘汰最久未使用的条目。"""
+
+    backend = MemoryBackend(max_size=2)
+    backend.set("a", 1, None)
+    backend.set("b", 2, None)
+    backend.get("a")
+    backend.set("c", 3, None)
+
+    assert backend.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_cached_coalesces_concurrent_misses(backend: MemoryBackend | RedisBackend) -> None:
+    """并发未命中只调用一次加载函数，失效后重新加载。"""
+
+    calls: list[int] = []
+
+    @cached("lookups", key=lambda user_id: str(user_id), ttl=60)
+    def load(user_id: int) -> dict[str, int]:
+        calls.append(user_id)
+        time.sleep(0.05)
+        return {"id": user_id}
+
+    results: list[dict[str, int]] = []
+    threads = [threading.Thread(target=lambda: results.append(load(7))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"id": 7}] * 8
+    assert calls == [7]
+    assert cache_stats()["lookups"]["loads"] == 1
+
+    load.invalidate(7)
+    assert load(7) == {"id": 7}
+    assert calls == [7, 7]
+
+
+@pytest.mark.asyncio
+async def test_cached_async_coalesces_concurrent_misses(backend: MemoryBackend | RedisBackend) -> None:
+    """异步函数的并发未命中同样只加载一次。"""
+
+    calls: list[int] = []
+
+    @cached("async_lookups", key=lambda user_id: str(user_id), ttl=60)
+    async def load(user_id: int) -> int:
+        calls.append(user_id)
+        await asyncio.sleep(0.02)
+        return user_id * 2
+
+    assert await asyncio.gather(*(load(3) for _ in range(5))) == [6] * 5
+    assert calls == [3]
+
+    await load.invalidate_async(3)
+    assert await load(3) == 6
+    assert calls == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_async_reset_closes_both_redis_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """异步重置应同时断开同步与异步连接池，并清空命名空间。"""
+
+    server = fakeredis.FakeServer()
+    instance = RedisBackend(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    closed: list[str] = []
+    monkeypatch.setattr(instance.client, "close", lambda: closed.append("sync"))
+
+    async def aclose() -> None:
+        closed.append("async")
+
+    monkeypatch.setattr(instance.async_client, "aclose", aclose)
+    reset_cache(instance)
+    get_cache("users").set("1", "a")
+
+    await reset_cache_async()
+
+    assert closed == ["sync", "async"]
+    assert cache_stats() == {}
@@ -0,0 +1,63 @@
+"""密码哈希执行器的测试。"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.core.hashing import PasswordExecutorSaturatedError, PasswordHashExecutor
+
+
+def test_executor_hashes_and_verifies_passwords() -> None:
+    """同步 API 应返回可校验的 bcrypt 哈希，并累计统计。"""
+
+    executor = PasswordHashExecutor(max_workers=2, max_queue=2)
+    try:
+        hashed = executor.hash("StrongPass123")
+        assert executor.verify("StrongPass123", hashed)
+        assert not executor.verify("wrong-password", hashed)
+
+        stats = executor.stats()
+        assert stats["submitted"] == 3
+        assert stats["completed"] == 3
+        assert stats["queued"] == 0
+        assert stats["rejected"] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_async_api() -> None:
+    """异步 API 与同步 API 结果一致。"""
+
+    executor = PasswordHashExecutor(max_workers=1, max_queue=1)
+    try:
+        hashed = await executor.hash_async("StrongPass123")
+        assert await executor.verify_async("StrongPass123", hashed)
+    finally:
+        executor.shutdown()
+
+
+def test_executor_rejects_when_saturated() -> None:
+    """工作线程与队列都被占满时应立即拒绝，而不是阻塞等待。"""
+
+    executor = PasswordHashExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait)
+        queued = executor.submit(release.wait)
+        with pytest.raises(PasswordExecutorSaturatedError):
+            executor.submit(release.wait)
+
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["running"] + stats["queued"] == 2
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        executor.submit(lambda: None).result(timeout=5)  # 容量释放后可再次提交
+    finally:
+        release.set()
+        executor.shutdown()
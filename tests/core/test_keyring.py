@@ -0,0 +1,94 @@
+"""JWT 密钥环：非对称签名、轮换与 HS256 兼容的测试。"""
+
+from __future__ import annotations
+
+import jwt
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import DEFAULT_SECRET_KEY, Settings
+from app.core.keyring import generate_private_key_pem, get_keyring, load_key
+from app.core.security import create_access_token, decode_token
+
+
+def _settings(**overrides: object) -> Settings:
+    return Settings(_env_file=None, secret_key="test-secret", **overrides)
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+def test_tokens_verify_with_published_jwks(algorithm: str) -> None:
+    """签发的 token 头部带 kid，下游仅凭 JWKS 中的公钥即可验签。"""
+
+    settings = _settings(jwt_signing_key=generate_private_key_pem(algorithm))
+    token = create_access_token(7, settings)
+
+    header = jwt.get_unverified_header(token)
+    assert header["alg"] == algorithm
+    jwks = get_keyring(settings).jwks()
+    assert [key["kid"] for key in jwks["keys"]] == [header["kid"]]
+    assert "d" not in jwks["keys"][0]  # 不泄露私钥成员
+
+    public = jwt.PyJWK(jwks["keys"][0])
+    assert jwt.decode(token, public.key, algorithms=[algorithm])["sub"] == "7"
+    assert decode_token(token, settings)["sub"] == "7"
+
+
+def test_rotation_keeps_old_keys_verifiable_until_removed() -> None:
+    """轮换后旧密钥签发的 token 仍可验证，移出验证集合后被拒绝。"""
+
+    old_pem = generate_private_key_pem("EdDSA")
+    new_pem = generate_private_key_pem("ES256")
+    old_token = create_access_token(1, _settings(jwt_signing_key=old_pem))
+
+    rotated = _settings(jwt_signing_key=new_pem, jwt_verification_keys=[old_pem])
+    assert decode_token(old_token, rotated)["sub"] == "1"
+    assert {key["kid"] for key in get_keyring(rotated).jwks()["keys"]} == {load_key(old_pem).kid, load_key(new_pem).kid}
+
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_token(old_token, _settings(jwt_signing_key=new_pem))
+
+
+def test_hs256_remains_available_and_is_opt_in_with_signing_key() -> None:
+    """未配置私钥时使用 HS256；非对称模式下仅在显式开启时接受旧的 HS256 token。"""
+
+    hs_settings = _settings()
+    hs_token = create_access_token(3, hs_settings)
+    assert "kid" not in jwt.get_unverified_header(hs_token)
+    assert get_keyring(hs_settings).jwks() == {"keys": []}
+
+    pem = generate_private_key_pem("EdDSA")
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_token(hs_token, _settings(jwt_signing_key=pem))
+    assert decode_token(hs_token, _settings(jwt_signing_key=pem, jwt_accept_hs256=True))["sub"] == "3"
+
+
+def test_kid_less_token_signed_with_default_secret_is_rejected() -> None:
+    """默认配置下，以默认秘钥伪造的无 kid HS256 token 不被接受；默认秘钥不能与 HS256 兼容同时开启。"""
+
+    pem = generate_private_key_pem("EdDSA")
+    settings = Settings(_env_file=None, secret_key=DEFAULT_SECRET_KEY, jwt_signing_key=pem)
+    forged = jwt.encode({"sub": "1", "type": "access"}, DEFAULT_SECRET_KEY, algorithm="HS256")
+
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_token(forged, settings)
+    with pytest.raises(ValidationError):
+        Settings(_env_file=None, secret_key=DEFAULT_SECRET_KEY, jwt_signing_key=pem, jwt_accept_hs256=True)
+
+
+def test_rejects_hs256_token_forged_with_public_key_kid() -> None:
+    """每把密钥只接受其自身算法，不能用公钥作为 HMAC 秘钥伪造 token。"""
+
+    pem = generate_private_key_pem("EdDSA")
+    settings = _settings(jwt_signing_key=pem)
+    key = load_key(pem)
+    forged = jwt.encode({"sub": "1", "type": "access"}, "forged", algorithm="HS256", headers={"kid": key.kid})
+
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_token(forged, settings)
+
+
+def test_keyring_is_parsed_once_per_configuration() -> None:
+    """配置不变时复用已解析的密钥环。"""
+
+    pem = generate_private_key_pem("EdDSA")
+    assert get_keyring(_settings(jwt_signing_key=pem)) is get_keyring(_settings(jwt_signing_key=pem))
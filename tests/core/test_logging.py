@@ -0,0 +1,169 @@
+"""日志配置与队列模式的测试。"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from app.core.config import Settings
+from app.core.logging import (
+    BatchingLogListener,
+    JsonLogFormatter,
+    TraceQueueHandler,
+    configure_logging,
+    reset_trace_id,
+    set_trace_id,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_logging() -> Generator[None, None, None]:
+    """用例结束后停止后台 listener 并恢复默认日志配置。
+
+    Returns:
+        Generator[None, None, None]: fixture 生命周期管理器。
+    """
+
+    yield
+    shutdown_logging()
+    configure_logging()
+
+
+def test_queue_handler_captures_trace_id_at_emit_time() -> None:
+    """trace_id 应在入队时固化，即使格式化时上下文已重置。"""
+
+    handler = TraceQueueHandler(queue.Queue(maxsize=10))
+    token = set_trace_id("emit-trace")
+    try:
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+        handler.emit(record)
+    finally:
+        reset_trace_id(token)
+
+    queued = handler.queue.get_nowait()
+    payload = json.loads(JsonLogFormatter().format(queued))
+    assert payload["trace_id"] == "emit-trace"
+    assert payload["message"] == "hello world"
+
+
+def test_queue_handler_drops_when_full() -> None:
+    """drop 策略下队列满时丢弃并计数，不阻塞调用方。"""
+
+    handler = TraceQueueHandler(queue.Queue(maxsize=1))
+    for _ in range(3):
+        handler.emit(logging.LogRecord("app.test", logging.INFO, __file__, 1, "msg", None, None))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_block_policy_falls_back_to_drop_after_timeout() -> None:
+    """block 策略下 listener 长时间不消费时，入队在超时后丢弃计数而不是永久阻塞。"""
+
+    handler = TraceQueueHandler(queue.Queue(maxsize=1), block_when_full=True, block_timeout=0.01)
+    for _ in range(2):
+        handler.emit(logging.LogRecord("app.test", logging.INFO, __file__, 1, "msg", None, None))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_listener_survives_sink_errors() -> None:
+    """输出失败的批次计数后丢弃，listener 继续写出后续记录。"""
+
+    class FlakySink:
+        def __init__(self) -> None:
+            self.calls = 0
+            self.written: list[str] = []
+
+        def write(self, text: str) -> None:
+            self.calls += 1
+            if self.calls == 1:
+                raise OSError("disk full")
+            self.written.append(text)
+
+        def close(self) -> None:
+            pass
+
+    log_queue: queue.Queue = queue.Queue()
+    sink = FlakySink()
+    listener = BatchingLogListener(log_queue, JsonLogFormatter(), sink, batch_size=1)  # type: ignore[arg-type]
+    listener.start()
+    for message in ("lost", "kept"):
+        log_queue.put(logging.LogRecord("app.test", logging.INFO, __file__, 1, message, None, None))
+    listener.stop()
+
+    assert listener.write_errors == 1
+    assert [json.loads(text)["message"] for text in sink.written] == ["kept"]
+
+
+def test_queue_mode_flushes_to_file_on_shutdown(tmp_path: Path) -> None:
+    """队列模式写入轮转文件，shutdown 时保证全部刷盘。
+
+    Args:
+        tmp_path (Path): pytest 提供的临时目录。
+    """
+
+    log_file = tmp_path / "app.log"
+    configure_logging(Settings(log_queue_enabled=True, log_file=str(log_file), log_queue_batch_size=7))
+    logger = logging.getLogger("app.test.queue")
+    token = set_trace_id("file-trace")
+    try:
+        for index in range(50):
+            logger.info("record %d", index)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        reset_trace_id(token)
+
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [line["message"] for line in lines[:50]] == [f"record {index}" for index in range(50)]
+    assert all(line["trace_id"] == "file-trace" for line in lines)
+    assert "ValueError: boom" in lines[-1]["exc_info"]
+
+
+def test_formatter_uses_record_created_timestamp() -> None:
+    """时间戳应取自 record.created，并保留微秒精度。"""
+
+    formatter = JsonLogFormatter()
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello", None, None)
+    record.created = 1_700_000_000.123456
+
+    payload = json.loads(formatter.format(record))
+    assert payload["timestamp"] == "2023-11-14T22:13:20.123456+00:00"
+
+    record.created = 1_700_000_001.5
+    assert json.loads(formatter.format(record))["timestamp"] == "2023-11-14T22:13:21.500000+00:00"
+
+
+def test_formatter_serializes_whitelisted_extra_fields() -> None:
+    """白名单内的 extra 字段应输出，其余属性忽略，无法编码的值转为字符串。"""
+
+    logger = logging.getLogger("tests.extra")
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append  # type: ignore[method-assign]
+    logger.addHandler(handler)
+    try:
+        logger.warning("HTTP exception", extra={"status_code": 404, "detail": Path("missing"), "secret": "x"})
+    finally:
+        logger.removeHandler(handler)
+
+    payload = json.loads(JsonLogFormatter().format(records[0]))
+    assert payload["status_code"] == 404
+    assert payload["detail"] == "missing"
+    assert "secret" not in payload
+
+    custom = json.loads(JsonLogFormatter(extra_fields=["secret"]).format(records[0]))
+    assert custom["secret"] == "x"
+    assert "status_code" not in custom
@@ -0,0 +1,104 @@
+"""指标注册表、多进程合并与 /metrics 路由的测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    REGISTRY,
+    MetricsRegistry,
+    read_snapshots,
+    render_latest,
+    render_text,
+    write_snapshot,
+)
+from app.main import create_app
+
+
+def test_counter_and_histogram_render_prometheus_text() -> None:
+    """计数器按标签累加，直方图输出累积桶、总和与次数。"""
+
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    requests.inc(("/a",))
+    requests.inc(("/a",))
+    requests.inc(('/b"x',))
+    for value in (0.05, 0.5, 3.0):
+        latency.observe(value, ("/a",))
+
+    text = render_text([registry.snapshot()])
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 2' in text
+    assert 'requests_total{route="/b\\"x"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 3.55' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert registry.counter("requests_total", "Requests.", ("route",)) is requests
+
+
+def test_snapshots_from_multiple_processes_are_merged(tmp_path: Path) -> None:
+    """计数器与直方图跨进程求和，仪表盘按 pid 区分且忽略已退出进程。"""
+
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc(amount=3)
+    registry.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(0.5)
+    registry.callback("in_use", "In use.", "gauge", (), lambda: [((), 2)])
+    own = write_snapshot(registry, tmp_path)
+
+    other = json.loads(own.read_text(encoding="utf-8"))
+    other["pid"] = 2**22 + 12345  # 超出 pid_max 默认值，视为已退出进程
+    (tmp_path / f"metrics-{other['pid']}.json").write_text(json.dumps(other), encoding="utf-8")
+
+    snapshots = read_snapshots(tmp_path)
+    assert len(snapshots) == 2
+    text = render_text(snapshots)
+    assert "requests_total 6" in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert text.count("in_use{") == 1
+    assert f'in_use{{pid="{json.loads(own.read_text())["pid"]}"}} 2' in text
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    REGISTRY.clear()
+    return TestClient(create_app())
+
+
+def test_metrics_endpoint_reports_requests_by_route_template(client: TestClient) -> None:
+    """中间件应以路由模板为标签，未匹配路径归入 unmatched，并导出执行器与连接池指标。"""
+
+    client.get("/api/v1/health")
+    client.get("/api/v1/health")
+    client.get("/api/v1/no-such-route/123")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/health",status="200"} 2' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/health"} 2' in text
+    assert "# TYPE db_pool_in_use gauge" in text
+    assert "# TYPE password_executor_rejected_total counter" in text
+
+
+def test_render_latest_writes_own_snapshot(tmp_path: Path) -> None:
+    """配置共享目录时抓取会先写出本进程快照。"""
+
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs.").inc()
+
+    text = render_latest(registry, tmp_path)
+
+    assert "jobs_total 1" in text
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 1
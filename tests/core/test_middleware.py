@@ -69,3 +69,48 @@ def test_validation_error_response_contains_details() -> None:
     assert data["code"] == "validation_error"
     assert data["details"]
     assert data["trace_id"]
+
+
+def test_trace_id_middleware_reuses_incoming_header_on_streaming_response() -> None:
+    """请求自带 trace_id 时应沿用，且流式响应同样写入响应头。"""
+
+    from fastapi.responses import StreamingResponse
+
+    from app.core.logging import get_trace_id
+
+    app = _build_app()
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        trace_id = get_trace_id() or ""
+
+        async def chunks():  # noqa: ANN202 - 测试内部生成器
+            yield b"trace="
+            yield trace_id.encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    client = TestClient(app)
+    response = client.get("/stream", headers={"X-Trace-Id": "abc123"})
+    assert response.status_code == 200
+    assert response.headers["X-Trace-Id"] == "abc123"
+    assert response.text == "trace=abc123"
+
+
+def test_metrics_middleware_records_unhandled_exception_as_500() -> None:
+    """未捕获异常应按路由模板记为 500。"""
+
+    from app.core.metrics import HTTP_REQUESTS
+    from app.core.middleware import MetricsMiddleware
+
+    app = _build_app()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/orders/{order_id}")
+    async def fail(order_id: int) -> None:
+        raise ValueError("boom")  # noqa: TRY003 - 测试故意抛错
+
+    HTTP_REQUESTS.clear()
+    client = TestClient(app, raise_server_exceptions=False)
+    assert client.get("/orders/7").status_code == 500
+    assert [["GET", "/orders/{order_id}", "500"], 1.0] in HTTP_REQUESTS.collect()
@@ -0,0 +1,31 @@
+"""FastJSONResponse 编码行为的测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from app.apps.auth.schemas import UserRead
+from app.core.responses import FastJSONResponse
+
+
+def test_renders_validated_model_without_reencoding() -> None:
+    """已校验模型应直接由其序列化器编码，非 ASCII 字符不转义。"""
+
+    user = UserRead(id=1, email="user@example.com", full_name="张三", is_active=True)
+
+    response = FastJSONResponse(user, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert "张三".encode() in response.body
+    assert json.loads(response.body) == user.model_dump()
+
+
+def test_renders_plain_content_with_fallbacks() -> None:
+    """普通 dict 正常编码；非字符串键与未知类型回退到 pydantic-core。"""
+
+    assert json.loads(FastJSONResponse({"code": "ok", "details": [1, 2]}).body) == {"code": "ok", "details": [1, 2]}
+
+    payload = json.loads(FastJSONResponse({1: Path("a"), "error": ValueError("bad")}).body)
+    assert payload == {"1": "a", "error": "bad"}
@@ -0,0 +1,46 @@
+"""SQL 查询埋点的测试。"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import capture_queries, instrument_engine, report_repeated_queries, statement_shape
+
+
+def test_statement_shape_collapses_whitespace_and_placeholder_lists() -> None:
+    """不同长度的 IN 列表与换行差异应归为同一形态。"""
+
+    assert statement_shape("SELECT *\n  FROM users WHERE id IN (?, ?, ?)") == "SELECT * FROM users WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM users WHERE id IN (%(id_1)s, %(id_2)s)") == (
+        "SELECT * FROM users WHERE id IN (%(id_1)s)"
+    )
+
+
+def test_capture_queries_counts_logs_slow_and_flags_repeats(caplog: pytest.LogCaptureFixture) -> None:
+    """应统计条数与耗时，记录慢查询，并对重复形态提示 N+1。"""
+
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, slow_query_ms=0.000001)
+    caplog.set_level(logging.WARNING, logger="app.db.queries")
+
+    with capture_queries() as stats, engine.connect() as conn:
+        for user_id in range(3):
+            conn.execute(text("SELECT :id"), {"id": user_id})
+        with pytest.raises(Exception):  # noqa: B017 - 失败语句不应打乱计时栈
+            conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+
+    assert stats.count == 4
+    assert stats.seconds > 0
+    assert stats.slow == 4
+    assert stats.repeated(3) == [("SELECT ?", 3)]
+    assert stats.server_timing().endswith('desc="4 queries"')
+    assert sum(record.getMessage() == "Slow query" for record in caplog.records) == 4
+
+    report_repeated_queries(stats, 3, "/users")
+    n_plus_one = [record for record in caplog.records if record.getMessage() == "Possible N+1 query"]
+    assert len(n_plus_one) == 1
+    assert n_plus_one[0].detail == "3x SELECT ?"
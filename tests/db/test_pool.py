@@ -0,0 +1,91 @@
+"""连接池参数与统计的测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.db.pool import PoolOptions, PoolStats, engine_options, pool_stats, register_engine
+
+OPTIONS = PoolOptions(size=1, max_overflow=0, timeout=0.05, recycle=600, use_lifo=True, pre_ping=False)
+
+
+def _engine(tmp_path: Path, name: str):
+    """创建注册到统计表的 SQLite 文件库 Engine（默认使用 QueuePool）。"""
+
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    stats = PoolStats()
+    engine = create_engine(url, **engine_options(url, OPTIONS, stats))
+    register_engine(name, engine, stats)
+    return engine
+
+
+def test_engine_options_apply_only_to_queue_pools() -> None:
+    """QueuePool 方言应用容量参数并替换为计时子类，单连接池只设置 pre-ping。"""
+
+    stats = PoolStats()
+    kwargs = engine_options("postgresql+psycopg://u:p@localhost/db", OPTIONS, stats)
+    assert issubclass(kwargs["poolclass"], QueuePool)
+    assert kwargs["poolclass"].pool_stats is stats
+    assert kwargs["pool_size"] == 1
+    assert kwargs["pool_recycle"] == 600
+    assert kwargs["pool_use_lifo"] is True
+    assert kwargs["pool_pre_ping"] is False
+
+    async_kwargs = engine_options("postgresql+psycopg://u:p@localhost/db", OPTIONS, stats, is_async=True)
+    assert issubclass(async_kwargs["poolclass"], AsyncAdaptedQueuePool)
+
+    assert engine_options("sqlite:///:memory:", OPTIONS, stats) == {"pool_pre_ping": False}
+
+
+def test_pool_stats_track_checkout_and_timeouts(tmp_path: Path) -> None:
+    """应记录在用连接、峰值、等待耗时以及池耗尽导致的超时。"""
+
+    engine = _engine(tmp_path, "test_pool")
+    try:
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+            busy = pool_stats()["test_pool"]
+            assert busy["in_use"] == 1
+            assert busy["size"] == 1
+
+        stats = pool_stats()["test_pool"]
+        assert stats["pool_class"] == "TimedQueuePool"
+        assert stats["in_use"] == 0
+        assert stats["in_use_peak"] == 1
+        assert stats["checkouts"] == 1
+        assert stats["connects"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+    finally:
+        engine.dispose()
+
+
+def test_disconnect_errors_are_counted_and_invalidate(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    """断连错误应计数、按 Engine 名称记录日志并失效连接，下次 checkout 重新建连。"""
+
+    engine = _engine(tmp_path, "test_disconnect")
+    monkeypatch.setattr(engine.dialect, "is_disconnect", lambda *args: True)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        monkeypatch.undo()
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        stats = pool_stats()["test_disconnect"]
+        assert stats["disconnects"] == 1
+        assert stats["invalidations"] >= 1
+        assert stats["connects"] == 2
+        assert [record.engine for record in caplog.records if record.name == "app.db.pool"] == ["test_disconnect"]
+    finally:
+        engine.dispose()
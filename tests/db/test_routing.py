@@ -0,0 +1,159 @@
+"""读写分离路由的测试。"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.apps.auth.models import User
+from app.apps.auth.repository import UserRepository
+from app.apps.auth.throttle import reset_login_throttle
+from app.core.cache import reset_cache
+from app.core.metrics import render_latest
+from app.db.base import Base
+from app.db.init_db import import_model_modules
+from app.db.pool import pool_stats
+from app.db.routing import READ_REPLICA, ReplicaSet, pin_primary
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_engine, get_async_replicas, reset_session_factory
+from app.main import create_app
+
+
+def _seed(url: str, email: str) -> None:
+    """在指定数据库建表并写入一个用户，用邮箱区分主库与从库。"""
+
+    import_model_modules()
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (email, password_hash, is_active) VALUES (:email, 'hashed', 1)"),
+            {"email": email},
+        )
+    engine.dispose()
+
+
+@pytest.fixture(name="urls")
+def replica_urls(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[dict[str, str], None, None]:
+    """准备一个主库与两个从库，并通过环境变量启用读写分离。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): pytest 提供的环境修改工具。
+        tmp_path (Path): pytest 提供的临时目录。
+
+    Returns:
+        Generator[dict[str, str], None, None]: 名称到连接串的映射。
+    """
+
+    urls = {name: f"sqlite:///{tmp_path / f'{name}.db'}" for name in ("primary", "replica_a", "replica_b")}
+    for name, url in urls.items():
+        _seed(url, f"{name}@example.com")
+    monkeypatch.setenv("DATABASE_URL", urls["primary"])
+    monkeypatch.setenv("DATABASE_READ_URLS", json.dumps([urls["replica_a"], urls["replica_b"]]))
+    reset_session_factory()
+    yield urls
+    monkeypatch.delenv("DATABASE_READ_URLS")
+    reset_session_factory()
+
+
+def _source(db: Session) -> str:
+    """通过标记为只读的查询判断当前查询落在哪个库，各库的首个用户邮箱即库名。"""
+
+    email = db.execute(select(User.email).order_by(User.id).limit(1), bind_arguments=READ_REPLICA).scalar_one()
+    return email.split("@")[0]
+
+
+def test_reads_round_robin_across_replicas(urls: dict[str, str]) -> None:
+    """不同 Session 的只读查询应轮询从库，同一 Session 内复用同一从库。"""
+
+    sources = []
+    for _ in range(4):
+        with SessionLocal() as db:
+            first = _source(db)
+            assert _source(db) == first
+            sources.append(first)
+
+    assert set(sources) == {"replica_a", "replica_b"}
+
+
+def test_writes_pin_session_to_primary(urls: dict[str, str]) -> None:
+    """写入后与显式 pin_primary 后的只读查询都应走主库。"""
+
+    repo = UserRepository()
+    with SessionLocal() as db:
+        created = repo.create(db, email="new@example.com", password_hash="hashed")
+        assert repo.get_by_id(db, created.id) is not None
+        assert _source(db) == "primary"
+
+    with SessionLocal() as db:
+        pin_primary(db)
+        assert _source(db) == "primary"
+
+
+def test_disconnected_replica_is_ejected(urls: dict[str, str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """断连的从库应被摘除，全部摘除后回退到主库。"""
+
+    replicas: ReplicaSet = SessionLocal.kw["replicas"]
+    for engine in replicas.engines:
+        monkeypatch.setattr(engine.dialect, "is_disconnect", lambda *args: True)
+        with engine.connect() as conn, pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+    stats = pool_stats()
+    assert [(stats[name]["healthy"], stats[name]["ejections"]) for name in ("replica_0", "replica_1")] == [
+        (False, 1),
+        (False, 1),
+    ]
+    assert 'db_replica_healthy{engine="replica_0"} 0' in render_latest()
+    with SessionLocal() as db:
+        assert _source(db) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_async_reads_use_replicas(urls: dict[str, str]) -> None:
+    """异步 Session 的只读查询同样路由到从库，pin 后走主库。"""
+
+    query = select(User.email).order_by(User.id).limit(1)
+    async with AsyncSessionLocal(bind=get_async_engine(), replicas=get_async_replicas()) as db:
+        assert (await db.execute(query, bind_arguments=READ_REPLICA)).scalar_one() != "primary@example.com"
+        pin_primary(db)
+        assert (await db.execute(query, bind_arguments=READ_REPLICA)).scalar_one() == "primary@example.com"
+    await get_async_engine().dispose()
+
+
+def test_auth_reads_ignore_lagging_replicas(urls: dict[str, str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """注册后立即登录、停用后访问 /me 均以主库为准，滞后的从库不会让停用的用户重新通过鉴权。"""
+
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    reset_session_factory()
+    reset_login_throttle()
+    reset_cache()
+    client = TestClient(create_app())
+    credentials = {"email": "fresh@example.com", "password": "StrongPass123"}
+
+    assert client.post("/api/v1/auth/register", json=credentials).status_code == 201
+    login = client.post("/api/v1/auth/login", json=credentials)  # 从库尚未包含该用户
+    assert login.status_code == 200
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    with SessionLocal() as db:
+        user = UserRepository().get_by_email(db, credentials["email"])
+        for name in ("replica_a", "replica_b"):  # 从库复制到启用状态后停止追赶
+            engine = create_engine(urls[name])
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO users (id, email, password_hash, is_active) VALUES (:id, :email, 'hashed', 1)"),
+                    {"id": user.id, "email": user.email},
+                )
+            engine.dispose()
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+        UserRepository().deactivate(db, user=user)
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+    reset_cache()
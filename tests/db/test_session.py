@@ -72,3 +72,71 @@ def test_get_db_yields_and_closes_session(monkeypatch: pytest.MonkeyPatch) -> No
             next(generator)
 
         close_mock.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("sync_url", "async_url"),
+    [
+        ("postgresql+psycopg://u:p@localhost:5432/db", "postgresql+psycopg://u:p@localhost:5432/db"),
+        ("postgresql://u:p@localhost/db", "postgresql+psycopg://u:p@localhost/db"),
+        ("sqlite:///./pytest.db", "sqlite+aiosqlite:///./pytest.db"),
+    ],
+)
+def test_to_async_url_switches_driver(sync_url: str, async_url: str) -> None:
+    """同步连接串应映射到对应的异步驱动，且保留密码等信息。
+
+    Args:
+        sync_url (str): 配置中的同步连接串。
+        async_url (str): 预期的异步连接串。
+    """
+
+    from app.db.session import to_async_url
+
+    assert to_async_url(sync_url) == async_url
+
+
+@pytest.mark.asyncio
+async def test_get_async_db_yields_and_closes_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """确保 get_async_db 绑定异步 Engine 并在结束后关闭 Session。
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): 注入环境变量。
+    """
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+    session = _reload_session_module()
+
+    generator = session.get_async_db()
+    db = await generator.__anext__()
+    assert str(db.get_bind().url) == "sqlite+aiosqlite:///:memory:"
+
+    from unittest.mock import patch
+
+    with patch.object(db, "close", wraps=db.close) as close_mock:
+        with pytest.raises(StopAsyncIteration):
+            await generator.__anext__()
+
+        close_mock.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("url", "threshold", "expected"),
+    [
+        ("postgresql+psycopg://u:p@localhost/db", 5, {"prepare_threshold": 5}),
+        ("postgresql+psycopg://u:p@localhost/db", 0, {"prepare_threshold": 0}),
+        ("postgresql+psycopg://u:p@localhost/db", -1, {"prepare_threshold": None}),
+        ("sqlite:///./pytest.db", 5, {}),
+    ],
+)
+def test_connect_args_pass_prepare_threshold_to_psycopg(url: str, threshold: int, expected: dict) -> None:
+    """仅 psycopg 驱动接收预处理阈值，负数表示禁用。
+
+    Args:
+        url (str): 连接串。
+        threshold (int): 配置的阈值。
+        expected (dict): 预期的驱动连接参数。
+    """
+
+    from app.db.session import _connect_args
+
+    assert _connect_args(url, threshold) == expected
@@ -8,7 +8,8 @@ from pathlib import Path
 import pytest
 from alembic import command
 from alembic.config import Config
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -70,6 +71,29 @@ def test_upgrade_creates_auth_tables(alembic_cfg: Config) -> None:
     assert junction_unique, "user_roles 需具备联合唯一约束"
 
 
+def test_upgrade_adds_email_lower_and_role_indexes(alembic_cfg: Config) -> None:
+    """验证 lower(email) 唯一索引拒绝仅大小写不同的邮箱，且 user_roles 具备 role_id 索引。
+
+    Args:
+        alembic_cfg (Config): 临时数据库对应的 Alembic 配置。
+    """
+
+    command.upgrade(alembic_cfg, "head")
+    engine = create_engine(alembic_cfg.get_main_option("sqlalchemy.url"))
+    role_indexes = {index["name"]: index for index in inspect(engine).get_indexes("user_roles")}
+    assert role_indexes["ix_user_roles_role_id"]["column_names"] == ["role_id"]
+
+    insert_user = text("INSERT INTO users (email, password_hash, is_active) VALUES (:email, 'x', 1)")
+    with engine.begin() as conn:
+        conn.execute(insert_user, {"email": "Dave@example.com"})
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(insert_user, {"email": "dave@example.com"})
+
+    command.downgrade(alembic_cfg, "20251114_01")
+    with engine.begin() as conn:
+        conn.execute(insert_user, {"email": "dave@example.com"})
+
+
 def test_downgrade_drops_tables(alembic_cfg: Config) -> None:
     """验证 downgrade base 会删除用户/角色相关表。
 
@@ -69,3 +69,28 @@ def test_seed_base_data_is_idempotent(db: Session) -> None:
 
     admin = db.execute(select(User).where(User.email == "admin@example.com")).scalar_one()
     assert {role.name for role in admin.roles} == {"admin"}
+
+
+def test_generate_synthetic_data_is_deterministic_and_idempotent(db: Session) -> None:
+    """相同种子应生成相同的数据集，重复执行不新增数据。"""
+
+    from sqlalchemy import func
+
+    from app.apps.auth.models import UserRole
+    from scripts.seed_data import generate_synthetic_data
+
+    stats = generate_synthetic_data(db, users=250, roles=5, roles_per_user=1.5, inactive_ratio=0.2, batch_size=100)
+
+    assert stats["users"] == 250
+    assert stats["roles"] == 5
+    assert db.execute(select(func.count()).select_from(UserRole)).scalar_one() == stats["role_assignments"]
+    assert 250 <= stats["role_assignments"] <= 500
+    inactive = db.execute(select(func.count()).select_from(User).where(User.is_active.is_(False))).scalar_one()
+    assert 25 <= inactive <= 75
+    hashes = set(db.execute(select(User.password_hash)).scalars())
+    assert len(hashes) == 1
+
+    snapshot = db.execute(select(User.email, User.is_active).order_by(User.email)).all()
+    rerun = generate_synthetic_data(db, users=250, roles=5, roles_per_user=1.5, inactive_ratio=0.2, batch_size=100)
+    assert rerun["users"] == 0
+    assert db.execute(select(User.email, User.is_active).order_by(User.email)).all() == snapshot